@@ -0,0 +1,553 @@
+import os
+import re
+import csv
+import sys
+import json
+import glob
+import fnmatch
+import argparse
+
+import numpy as np
+
+# Offline evaluator for the ChaiScript criterion expressions of
+# scenarioLifecycleCtrls (criterionExpr / criterionSummaryExpr).
+#
+# A script is parsed once and compiled into closures over NumPy arrays, so
+# one call evaluates it for every record row at once. Supported subset:
+#   statements   x = expr;  var x = expr;  if (c) {...} else {...}  print(expr);  {...}
+#   expressions  c ? a : b  ||  &&  == != < <= > >=  + - * / %  ! -  (..)
+#                numbers, "strings", true/false, to_string, abs, min, max, sqrt, floor, ceil, pow
+# if/else runs both branches under row masks, so assignments only land on
+# the rows whose condition holds. print output is only collected when tracing.
+#
+# Records are the CSV files of download_record_data in long format (one row
+# per agent and time step). Each criterion is evaluated on the rows of the
+# agents matching criterionAgentFileters/criterionAgentId/criterionAgentLabel
+# and reduced per time step with max, i.e. it holds when any matching agent
+# satisfies it. The summary expression then runs over those per-step values.
+#
+#   python criterion_eval.py contents/ExperimentConfig.json ./data/<recordSig>
+#   python criterion_eval.py contents/ExperimentConfig.json --check
+
+TIME_COLUMNS = ["simtime", "simTime", "sim_time", "time", "timestamp", "step"]
+AGENT_COLUMNS = ["agentLabel", "agentId", "agentName", "agent", "entityId"]
+TRACE_LIMIT = 200
+
+_TOKEN_RE = re.compile(r'''
+    (?P<skip>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<num>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<str>"(?:[^"\\]|\\.)*")
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<op>==|!=|<=|>=|&&|\|\||[-+*/%<>=!?:;(){},])
+''', re.X | re.S)
+
+_BINARY_PRECEDENCE = [
+    ("||",),
+    ("&&",),
+    ("==", "!="),
+    ("<", "<=", ">", ">="),
+    ("+", "-"),
+    ("*", "/", "%"),
+]
+
+
+class ChaiSyntaxError(ValueError):
+    pass
+
+
+def tokenize(source):
+    tokens = []
+    pos = 0
+    while pos < len(source):
+        m = _TOKEN_RE.match(source, pos)
+        if not m:
+            raise ChaiSyntaxError(f"unexpected character {source[pos]!r} at offset {pos}")
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "skip":
+            continue
+        text = m.group()
+        if kind == "num":
+            value = float(text) if any(c in text for c in ".eE") else int(text)
+            tokens.append(("num", value))
+        elif kind == "str":
+            tokens.append(("str", bytes(text[1:-1], "utf-8").decode("unicode_escape")))
+        else:
+            tokens.append((kind, text))
+    tokens.append(("end", None))
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# Parser: tokens -> tuples
+#   ("num", v) ("str", s) ("var", name) ("call", name, [args]) ("unary", op, e)
+#   ("binary", op, a, b) ("ternary", c, a, b)
+#   ("assign", name, e) ("expr", e) ("if", c, then, else) ("block", [stmts])
+# ---------------------------------------------------------------------------
+
+class _Parser:
+    def __init__(self, source):
+        self.tokens = tokenize(source)
+        self.pos = 0
+
+    def peek(self, text=None):
+        kind, value = self.tokens[self.pos]
+        if text is None:
+            return kind, value
+        return kind in ("op", "name") and value == text
+
+    def take(self, text=None):
+        kind, value = self.tokens[self.pos]
+        if text is not None and not (kind in ("op", "name") and value == text):
+            raise ChaiSyntaxError(f"expected {text!r}, got {value!r}")
+        self.pos += 1
+        return kind, value
+
+    def program(self):
+        statements = []
+        while self.peek()[0] != "end":
+            statements.append(self.statement())
+        return ("block", statements)
+
+    def statement(self):
+        if self.peek("{"):
+            self.take("{")
+            statements = []
+            while not self.peek("}"):
+                if self.peek()[0] == "end":
+                    raise ChaiSyntaxError("missing '}'")
+                statements.append(self.statement())
+            self.take("}")
+            return ("block", statements)
+        if self.peek(";"):
+            self.take(";")
+            return ("block", [])
+        if self.peek("if"):
+            self.take("if")
+            self.take("(")
+            cond = self.expression()
+            self.take(")")
+            then = self.statement()
+            other = None
+            if self.peek("else"):
+                self.take("else")
+                other = self.statement()
+            return ("if", cond, then, other)
+        if self.peek("while") or self.peek("for") or self.peek("def"):
+            raise ChaiSyntaxError(f"'{self.peek()[1]}' is not supported offline")
+
+        if self.peek("var") or self.peek("auto"):
+            self.take()
+        kind, value = self.peek()
+        if kind == "name" and self.tokens[self.pos + 1] == ("op", "="):
+            self.pos += 2
+            node = ("assign", value, self.expression())
+        else:
+            node = ("expr", self.expression())
+        if not self.peek("}"):
+            self.take(";")
+        return node
+
+    def expression(self):
+        cond = self.binary(0)
+        if self.peek("?"):
+            self.take("?")
+            a = self.expression()
+            self.take(":")
+            b = self.expression()
+            return ("ternary", cond, a, b)
+        return cond
+
+    def binary(self, level):
+        if level == len(_BINARY_PRECEDENCE):
+            return self.unary()
+        node = self.binary(level + 1)
+        while self.peek()[0] == "op" and self.peek()[1] in _BINARY_PRECEDENCE[level]:
+            op = self.take()[1]
+            node = ("binary", op, node, self.binary(level + 1))
+        return node
+
+    def unary(self):
+        if self.peek("!") or self.peek("-") or self.peek("+"):
+            op = self.take()[1]
+            return ("unary", op, self.unary())
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.take()
+        if kind in ("num", "str"):
+            return (kind, value)
+        if kind == "op" and value == "(":
+            node = self.expression()
+            self.take(")")
+            return node
+        if kind == "name":
+            if value in ("true", "false"):
+                return ("num", value == "true")
+            if self.peek("("):
+                self.take("(")
+                args = []
+                while not self.peek(")"):
+                    args.append(self.expression())
+                    if not self.peek(")"):
+                        self.take(",")
+                self.take(")")
+                return ("call", value, args)
+            return ("var", value)
+        raise ChaiSyntaxError(f"unexpected {value!r}")
+
+
+def parse(source):
+    return _Parser(source).program()
+
+
+# ---------------------------------------------------------------------------
+# Compiler: tuples -> closures over an env of NumPy arrays
+# ---------------------------------------------------------------------------
+
+def _is_text(value):
+    return isinstance(value, str) or (isinstance(value, np.ndarray) and value.dtype.kind in "US")
+
+
+def _to_string(value):
+    if _is_text(value):
+        return value
+    if isinstance(value, np.ndarray):
+        return np.char.mod("%g", value.astype(np.float64))
+    return "%g" % value
+
+
+def _add(a, b):
+    if _is_text(a) or _is_text(b):
+        return np.char.add(np.asarray(_to_string(a), dtype=str), np.asarray(_to_string(b), dtype=str))
+    return a + b
+
+
+def _divide(a, b):
+    if isinstance(a, int) and isinstance(b, int) and not isinstance(a, bool):
+        return int(a / b)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.true_divide(a, b)
+
+
+_BINARY = {
+    "||": np.logical_or, "&&": np.logical_and,
+    "==": np.equal, "!=": np.not_equal, "<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+    "+": _add, "-": np.subtract, "*": np.multiply, "/": _divide, "%": np.fmod,
+}
+
+FUNCTIONS = {
+    "to_string": _to_string,
+    "abs": np.abs, "sqrt": np.sqrt, "floor": np.floor, "ceil": np.ceil,
+    "min": np.minimum, "max": np.maximum, "pow": np.power,
+}
+
+
+def _compile_expr(node, names):
+    kind = node[0]
+    if kind in ("num", "str"):
+        value = node[1]
+        return lambda env: value
+    if kind == "var":
+        name = node[1]
+        names.add(name)
+
+        def load(env):
+            try:
+                return env[name]
+            except KeyError:
+                raise NameError(f"undefined variable: {name}")
+        return load
+    if kind == "unary":
+        op, operand = node[1], _compile_expr(node[2], names)
+        if op == "!":
+            return lambda env: np.logical_not(operand(env))
+        if op == "-":
+            return lambda env: np.negative(operand(env))
+        return operand
+    if kind == "binary":
+        fn, a, b = _BINARY[node[1]], _compile_expr(node[2], names), _compile_expr(node[3], names)
+        return lambda env: fn(a(env), b(env))
+    if kind == "ternary":
+        c, a, b = (_compile_expr(n, names) for n in node[1:])
+        return lambda env: np.where(c(env), a(env), b(env))
+    if kind == "call":
+        name = node[1]
+        if name == "print":
+            raise ChaiSyntaxError("print() has no value")
+        if name not in FUNCTIONS:
+            raise ChaiSyntaxError(f"unsupported function: {name}")
+        fn, args = FUNCTIONS[name], [_compile_expr(n, names) for n in node[2]]
+        return lambda env: fn(*(arg(env) for arg in args))
+    raise ChaiSyntaxError(f"unexpected node: {kind}")
+
+
+def _combine(mask, cond):
+    cond = np.asarray(cond, dtype=bool)
+    return cond if mask is None else np.logical_and(mask, cond)
+
+
+def _compile_stmt(node, names, assigned):
+    """Statement closures take (env, mask, trace); mask None means every row"""
+    kind = node[0]
+    if kind == "block":
+        body = [_compile_stmt(n, names, assigned) for n in node[1]]
+
+        def run_block(env, mask, trace):
+            for stmt in body:
+                stmt(env, mask, trace)
+        return run_block
+    if kind == "assign":
+        target, value = node[1], _compile_expr(node[2], names)
+        if target not in assigned:
+            assigned.append(target)
+
+        def run_assign(env, mask, trace):
+            new = value(env)
+            if mask is None:
+                env[target] = new
+            else:
+                env[target] = np.where(mask, new, env.get(target, np.nan))
+        return run_assign
+    if kind == "if":
+        cond = _compile_expr(node[1], names)
+        then = _compile_stmt(node[2], names, assigned)
+        other = _compile_stmt(node[3], names, assigned) if node[3] is not None else None
+
+        def run_if(env, mask, trace):
+            c = np.asarray(cond(env), dtype=bool)
+            then_mask = _combine(mask, c)
+            if then_mask.any():
+                then(env, then_mask, trace)
+            if other is not None:
+                else_mask = _combine(mask, ~c)
+                if else_mask.any():
+                    other(env, else_mask, trace)
+        return run_if
+    if kind == "expr":
+        expr = node[1]
+        if expr[0] == "call" and expr[1] == "print":
+            message = _compile_expr(expr[2][0], names) if expr[2] else (lambda env: "")
+
+            def run_print(env, mask, trace):
+                if trace is None or len(trace) >= TRACE_LIMIT:
+                    return
+                text = np.atleast_1d(_to_string(message(env)))
+                rows = np.flatnonzero(mask) if mask is not None else np.arange(len(text))
+                for row in rows[:TRACE_LIMIT - len(trace)]:
+                    trace.append((int(row), str(text[row if len(text) > 1 else 0])))
+            return run_print
+        value = _compile_expr(expr, names)
+        return lambda env, mask, trace: value(env)
+    raise ChaiSyntaxError(f"unexpected statement: {kind}")
+
+
+class CompiledScript:
+    """A parsed and compiled criterion script"""
+    def __init__(self, source):
+        self.source = source
+        names = set()
+        self.assigned = []
+        self._run = _compile_stmt(parse(source), names, self.assigned)
+        # Variables read before the script assigns them must come from the data
+        self.inputs = sorted(names - set(self.assigned))
+
+    def run(self, env, trace=None):
+        """Execute over env (name -> scalar or 1-D array) in place and return it"""
+        self._run(env, None, trace)
+        return env
+
+
+def compile_script(source):
+    return CompiledScript(source)
+
+
+# ---------------------------------------------------------------------------
+# Records
+# ---------------------------------------------------------------------------
+
+def _column_array(values):
+    try:
+        return np.array([float(v) if v not in ("", None) else np.nan for v in values])
+    except ValueError:
+        return np.array(values, dtype=str)
+
+
+def load_records(path):
+    """Concatenate the CSV files under path (or one file) into {column: array}"""
+    files = [path] if os.path.isfile(path) else sorted(glob.glob(os.path.join(path, "**", "*.csv"), recursive=True))
+    if not files:
+        raise ValueError(f"no CSV files under {path}")
+    raw = {}
+    total = 0
+    for file_path in files:
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+        for key in {k for row in rows for k in row if k is not None}:
+            raw.setdefault(key, [""] * total).extend(row.get(key, "") for row in rows)
+        total += len(rows)
+        for values in raw.values():
+            values.extend([""] * (total - len(values)))
+    return {key: _column_array(values) for key, values in raw.items()}
+
+
+def _pick_column(table, explicit, candidates, what):
+    if explicit:
+        if explicit not in table:
+            raise ValueError(f"{what} column '{explicit}' not in records")
+        return explicit
+    return next((c for c in candidates if c in table), None)
+
+
+def _agent_mask(agents, criterion):
+    """Rows of the agents a criterion applies to"""
+    if agents is None:
+        return None
+    mask = np.ones(len(agents), dtype=bool)
+    for key in ("criterionAgentId", "criterionAgentLabel"):
+        if criterion.get(key):
+            mask &= agents == str(criterion[key])
+    pattern = criterion.get("criterionAgentFileters")
+    if pattern:
+        names = np.unique(agents)
+        matched = [n for n in names if any(fnmatch.fnmatchcase(n, p.strip()) for p in str(pattern).split(","))]
+        mask &= np.isin(agents, matched)
+    return mask
+
+
+def evaluate_group(criterions, summary_expr, table, time_col, agent_col=None, trace=None):
+    """Evaluate one criterion group over the records.
+
+    print() output is appended to trace as (criterion, time, message).
+    Returns {"times", "criteria": {keyword: per-step values}, "summary", "first_time"}.
+    """
+    times_all = table[time_col]
+    times, step_index = np.unique(times_all, return_inverse=True)
+    agents = table[agent_col].astype(str) if agent_col else None
+
+    per_step = {}
+    for criterion in criterions:
+        keyword = criterion["criterionKeyword"]
+        script = compile_script(criterion.get("criterionExpr") or "")
+        missing = [v for v in script.inputs if v not in table]
+        if missing:
+            raise ValueError(f"criterion {keyword}: variables not in records: {', '.join(missing)}")
+
+        mask = _agent_mask(agents, criterion)
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(len(times_all))
+        env = {name: table[name][rows] for name in script.inputs}
+        local = [] if trace is not None else None
+        script.run(env, local)
+        if local:
+            trace.extend((keyword, times_all[rows[row]].item(), message) for row, message in local)
+        value = np.broadcast_to(np.asarray(env.get(keyword, np.nan), dtype=np.float64), rows.shape)
+
+        # Any matching agent satisfying the criterion at a step counts
+        step_values = np.full(len(times), np.nan)
+        np.fmax.at(step_values, step_index[rows], value)
+        per_step[keyword] = np.nan_to_num(step_values, nan=0.0)
+
+    result = {"times": times, "criteria": per_step, "summary": None, "first_time": None}
+    if summary_expr:
+        summary = compile_script(summary_expr)
+        missing = [v for v in summary.inputs if v not in per_step]
+        if missing:
+            raise ValueError(f"summary uses unknown criteria: {', '.join(missing)}")
+        local = [] if trace is not None else None
+        env = summary.run(dict(per_step), local)
+        if local:
+            trace.extend(("summary", times[row].item(), message) for row, message in local)
+        if summary.assigned:
+            status = np.broadcast_to(np.asarray(env[summary.assigned[0]], dtype=np.float64), times.shape)
+            result["summary"] = status
+            hits = np.flatnonzero(np.nan_to_num(status) != 0)
+            if hits.size:
+                result["first_time"] = times[hits[0]].item()
+    return result
+
+
+def evaluate_lifecycle(ctrls, table, time_col=None, agent_col=None, trace=None):
+    """Evaluate entering and exiting criterions of scenarioLifecycleCtrls against records"""
+    time_col = _pick_column(table, time_col, TIME_COLUMNS, "time")
+    if time_col is None:
+        raise ValueError(f"no time column found (tried {', '.join(TIME_COLUMNS)}), pass one explicitly")
+    agent_col = _pick_column(table, agent_col, AGENT_COLUMNS, "agent")
+
+    criterions = ctrls.get("criterions", ctrls)
+    results = {}
+    for group in ("entering", "exiting"):
+        items = criterions.get(f"{group}Criterions") or []
+        summary = (criterions.get(f"{group}CriterionsSummary") or {}).get("criterionSummaryExpr")
+        if items or summary:
+            results[group] = evaluate_group(items, summary, table, time_col, agent_col, trace)
+    return results
+
+
+def check_scripts(ctrls):
+    """Parse every criterion script. Returns [(label, error or None, inputs)]"""
+    criterions = ctrls.get("criterions", ctrls)
+    checks = []
+    for group in ("entering", "exiting"):
+        scripts = [(c.get("criterionKeyword"), c.get("criterionExpr")) for c in criterions.get(f"{group}Criterions") or []]
+        scripts.append((f"{group} summary",
+                        (criterions.get(f"{group}CriterionsSummary") or {}).get("criterionSummaryExpr")))
+        for label, source in scripts:
+            if not source:
+                continue
+            try:
+                checks.append((label, None, compile_script(source).inputs))
+            except (ChaiSyntaxError, NameError) as e:
+                checks.append((label, str(e), []))
+    return checks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate scenarioLifecycleCtrls criteria against downloaded record data.")
+    parser.add_argument("config", help="ExperimentConfig (or any JSON with scenarioLifecycleCtrls)")
+    parser.add_argument("records", nargs="?", default=None, help="Record CSV file or directory")
+    parser.add_argument("--time-col", default=None, help="Time column (default: auto)")
+    parser.add_argument("--agent-col", default=None, help="Agent column (default: auto)")
+    parser.add_argument("--set", action="append", default=[], metavar="KEYWORD=EXPR",
+                        help="Replace a criterion's criterionExpr to test a change")
+    parser.add_argument("--check", action="store_true", help="Only parse the scripts")
+    parser.add_argument("--trace", action="store_true", help="Show print() output")
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    ctrls = config.get("scenarioLifecycleCtrls", config)
+    for override in args.set:
+        keyword, expr = override.split("=", 1)
+        for group in ("enteringCriterions", "exitingCriterions"):
+            for c in ctrls["criterions"].get(group) or []:
+                if c.get("criterionKeyword") == keyword:
+                    c["criterionExpr"] = expr
+
+    if args.check or not args.records:
+        failed = 0
+        for label, error, inputs in check_scripts(ctrls):
+            if error:
+                failed += 1
+                print(f"[ERROR] {label}: {error}")
+            else:
+                print(f"[OK] {label} (inputs: {', '.join(inputs) or '-'})")
+        sys.exit(1 if failed else 0)
+
+    table = load_records(args.records)
+    trace = [] if args.trace else None
+    results = evaluate_lifecycle(ctrls, table, args.time_col, args.agent_col, trace)
+
+    for group, result in results.items():
+        print(f"{group}: {len(result['times'])} time steps")
+        for keyword, values in result["criteria"].items():
+            hits = np.flatnonzero(values != 0)
+            first = result["times"][hits[0]].item() if hits.size else None
+            print(f"  {keyword}: first non-zero at {first}")
+        if result["first_time"] is not None:
+            print(f"  summary fires at {result['first_time']}")
+        else:
+            print("  summary never fires")
+    if trace:
+        print("print() output:")
+        for label, t, message in trace:
+            print(f"  [{label} @ {t}] {message}")
@@ -0,0 +1,301 @@
+import os
+import sys
+import json
+import math
+import argparse
+from itertools import product
+from statistics import NormalDist
+
+import numpy as np
+
+# DoE sample-plan generator for ExperimentConfig.
+#
+# Builds the design on the unit hypercube, maps it onto the active
+# inputVarSelections (samplingBottom..samplingTop, samplingDist) and writes
+# doeInstance.varSamples:
+#   [{"sampleIndex": 0, "vars": [{"agentId", "paramName", "paramPath", "varSelectionSig", "value"}, ...]}, ...]
+#
+# Designs:
+#   orthogonal   Taguchi orthogonal array (Rao-Hamming, prime number of levels: L4, L8, L9, L16, L25, L27 ...)
+#   uniform      uniform design, good lattice points with the lowest centered L2 discrepancy
+#   lhs          Latin hypercube, best maximin of several random draws
+#   factorial    full factorial
+# Every plan comes with space-filling metrics and the number of waves the
+# engine needs at runningInstanceNumMax concurrent instances.
+#
+#   python doe_plan.py contents/ExperimentConfig.json --factors factors.json --method uniform --runs 12 --write
+
+METHOD_ALIASES = {
+    "orthogonal": "orthogonal", "taguchi": "orthogonal", "田口方法": "orthogonal", "正交设计": "orthogonal",
+    "uniform": "uniform", "均匀设计": "uniform",
+    "lhs": "lhs", "latin": "lhs", "拉丁超立方": "lhs", "拉丁超立方采样": "lhs",
+    "factorial": "factorial", "full_factorial": "factorial", "全因子设计": "factorial", "全析因设计": "factorial",
+}
+INTEGER_VAR_TYPES = {"int", "integer", "long", "INT", "Integer", "Long"}
+NORMAL_DISTS = {"normal", "gaussian", "正态", "正态分布"}
+LHS_CANDIDATES = 32
+PAIR_BLOCK = 256  # rows per block for the O(n^2) pairwise terms
+
+
+# ---------------------------------------------------------------------------
+# Designs on [0, 1]^s
+# ---------------------------------------------------------------------------
+
+def _is_prime(n):
+    return n >= 2 and all(n % d for d in range(2, int(math.isqrt(n)) + 1))
+
+
+def orthogonal_array(factors, levels=2):
+    """Rao-Hamming OA(p^m, (p^m-1)/(p-1), p, 2) with the fewest runs that fit. Returns level indices (runs, factors)"""
+    if not _is_prime(levels):
+        raise ValueError(f"orthogonal arrays need a prime number of levels, got {levels}")
+    m = 2
+    while (levels ** m - 1) // (levels - 1) < factors:
+        m += 1
+    # Rows: every vector of GF(p)^m; columns: one vector per direction (first non-zero entry is 1)
+    rows = np.array(list(product(range(levels), repeat=m)), dtype=np.int64)
+    nonzero = rows[(rows != 0).any(axis=1)]
+    lead = nonzero[np.arange(len(nonzero)), np.argmax(nonzero != 0, axis=1)]
+    cols = nonzero[lead == 1]
+    return (rows @ cols[:factors].T) % levels
+
+
+def full_factorial(factors, levels=2):
+    """Every level combination. levels is an int or one per factor. Returns level indices"""
+    levels = [levels] * factors if np.isscalar(levels) else list(levels)
+    grids = np.indices(levels).reshape(factors, -1).T
+    return grids
+
+
+def centered_l2_discrepancy(x):
+    """Centered L2 discrepancy of points in [0, 1]^s (lower is more uniform)"""
+    x = np.asarray(x, dtype=np.float64)
+    n, s = x.shape
+    d = np.abs(x - 0.5)
+    term1 = (13.0 / 12.0) ** s
+    term2 = np.prod(1 + 0.5 * d - 0.5 * d ** 2, axis=1).sum() * 2.0 / n
+    term3 = 0.0
+    for start in range(0, n, PAIR_BLOCK):
+        block = slice(start, start + PAIR_BLOCK)
+        pair = 1 + 0.5 * d[block, None, :] + 0.5 * d[None, :, :] - 0.5 * np.abs(x[block, None, :] - x[None, :, :])
+        term3 += np.prod(pair, axis=2).sum()
+    return math.sqrt(max(term1 - term2 + term3 / n ** 2, 0.0))
+
+
+def _min_distance(x):
+    """Smallest pairwise Euclidean distance, through the Gram matrix (n x n, not n x n x s)"""
+    sq = (x ** 2).sum(axis=1)
+    dist2 = sq[:, None] + sq[None, :] - 2.0 * (x @ x.T)
+    np.fill_diagonal(dist2, np.inf)
+    return math.sqrt(max(float(dist2.min()), 0.0))
+
+
+def _power_generators(modulus, factors):
+    """Generators (1, a, a^2, ...) mod modulus whose columns are distinct"""
+    gens = []
+    for a in range(1, modulus):
+        if math.gcd(a, modulus) != 1:
+            continue
+        gen = [pow(a, k, modulus) for k in range(factors)]
+        if len(set(gen)) == factors:
+            gens.append(gen)
+    return gens
+
+
+def uniform_design(factors, runs):
+    """Good lattice point uniform design U_n(n^s) with power generators (1, a, a^2, ...).
+
+    Lattices mod n and mod n+1 (last row dropped, Fang's modification for n
+    with few units) are all scored; the lowest discrepancy wins.
+    Returns level indices (runs, factors) in 0..runs-1.
+    """
+    if factors == 1:
+        return np.arange(runs)[:, None]
+    i = np.arange(1, runs + 1)[None, :, None]
+    lattices = []
+    for modulus, offset in ((runs, 0), (runs + 1, 1)):
+        gens = _power_generators(modulus, factors)
+        if gens:
+            lattices.append((i * np.array(gens, dtype=np.int64)[:, None, :]) % modulus - offset)
+    if not lattices:
+        raise ValueError(f"no uniform design with {runs} runs for {factors} factors, try more runs")
+
+    lattices = np.concatenate(lattices)  # (k, n, s), every column a permutation of 0..n-1
+    best = int(np.argmin([centered_l2_discrepancy((lattice + 0.5) / runs) for lattice in lattices]))
+    return lattices[best]
+
+
+def latin_hypercube(factors, runs, rng, candidates=LHS_CANDIDATES):
+    """Latin hypercube on [0, 1]; the draw with the largest minimum pairwise distance wins"""
+    perms = np.argsort(rng.random((candidates, runs, factors)), axis=1)
+    designs = (perms + rng.random((candidates, runs, factors))) / runs
+    if runs < 2:
+        return designs[0]
+    return designs[int(np.argmax([_min_distance(design) for design in designs]))]
+
+
+def design_unit(method, factors, runs=None, levels=3, seed=None):
+    """Design points in [0, 1]^factors for a method name or alias"""
+    method = METHOD_ALIASES.get(method, method)
+    if method == "orthogonal":
+        idx = orthogonal_array(factors, levels)
+        return idx / (levels - 1.0)
+    if method == "factorial":
+        levels_list = [levels] * factors if np.isscalar(levels) else list(levels)
+        idx = full_factorial(factors, levels_list)
+        return idx / np.maximum(np.array(levels_list) - 1.0, 1.0)
+    if method == "uniform":
+        return (uniform_design(factors, runs) + 0.5) / runs
+    if method == "lhs":
+        return latin_hypercube(factors, runs, np.random.default_rng(seed))
+    raise ValueError(f"Unknown design method: {method}")
+
+
+def design_metrics(x):
+    """Space-filling quality of a unit-cube design"""
+    x = np.asarray(x, dtype=np.float64)
+    n, s = x.shape
+    metrics = {"runs": n, "factors": s, "cd2": round(centered_l2_discrepancy(x), 6)}
+    if n > 1:
+        metrics["min_distance"] = round(_min_distance(x), 6)
+        if s > 1:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                corr = np.corrcoef(x, rowvar=False)
+            off = np.abs(corr[~np.eye(s, dtype=bool)])
+            metrics["max_abs_correlation"] = round(float(np.nanmax(off)) if off.size else 0.0, 6)
+    return metrics
+
+
+# ---------------------------------------------------------------------------
+# ExperimentConfig mapping
+# ---------------------------------------------------------------------------
+
+def active_factors(var_selections):
+    """Flatten varSelections into the active input variables"""
+    factors = []
+    for selection in var_selections or []:
+        for var in selection.get("inputVarSelections") or []:
+            if var.get("active", True) is False:
+                continue
+            bottom, top = var.get("samplingBottom"), var.get("samplingTop")
+            if bottom is None or top is None:
+                raise ValueError(f"{var.get('paramName')}: samplingBottom/samplingTop missing")
+            factors.append({
+                "agentId": selection.get("agentId"),
+                "paramName": var.get("paramName"),
+                "paramPath": var.get("paramPath"),
+                "varSelectionSig": var.get("varSelectionSig"),
+                "bottom": float(bottom),
+                "top": float(top),
+                "dist": var.get("samplingDist") or "uniform",
+                "integer": var.get("agentVarType") in INTEGER_VAR_TYPES
+            })
+    return factors
+
+
+def scale_design(unit, factors):
+    """Map unit-cube columns onto each factor's range; normal factors use mean mid-range, 3 sigma at the bounds"""
+    unit = np.asarray(unit, dtype=np.float64)
+    bottom = np.array([f["bottom"] for f in factors])
+    top = np.array([f["top"] for f in factors])
+    values = bottom + unit * (top - bottom)
+
+    inv_cdf = np.vectorize(NormalDist().inv_cdf)
+    for col, f in enumerate(factors):
+        if f["dist"] in NORMAL_DISTS:
+            z = inv_cdf(np.clip(unit[:, col], 0.00135, 0.99865))
+            values[:, col] = (bottom[col] + top[col]) / 2 + z * (top[col] - bottom[col]) / 6
+        if f["integer"]:
+            values[:, col] = np.round(values[:, col])
+    return values
+
+
+def build_var_samples(values, factors):
+    samples = []
+    for idx, row in enumerate(values.tolist()):
+        samples.append({
+            "sampleIndex": idx,
+            "vars": [{
+                "agentId": f["agentId"],
+                "paramName": f["paramName"],
+                "paramPath": f["paramPath"],
+                "varSelectionSig": f["varSelectionSig"],
+                "value": int(v) if f["integer"] else v
+            } for f, v in zip(factors, row)]
+        })
+    return samples
+
+
+def resolve_method(config, method=None):
+    """Explicit method, else factorDesign, else samplingMethod"""
+    for name in (method, config.get("factorDesign"), config.get("samplingMethod")):
+        if name and name in METHOD_ALIASES:
+            return METHOD_ALIASES[name]
+    raise ValueError("no known design method in factorDesign/samplingMethod, pass one explicitly")
+
+
+def plan_experiment(config, method=None, runs=None, levels=3, seed=None, var_selections=None):
+    """Plan an ExperimentConfig. Returns (varSamples, report)"""
+    factors = active_factors(var_selections if var_selections is not None else config.get("varSelections"))
+    if not factors:
+        raise ValueError("no active inputVarSelections to sample")
+    method = resolve_method(config, method)
+    capacity = config.get("runningInstanceNumMax") or config.get("maxSample") or 1
+    runs = runs or capacity
+
+    unit = design_unit(method, len(factors), runs, levels, seed)
+    values = scale_design(unit, factors)
+    report = design_metrics(unit)
+    report.update({
+        "method": method,
+        "capacity": capacity,
+        "waves": int(math.ceil(len(values) / float(capacity))),
+        "factors_detail": [f"{f['paramName']} [{f['bottom']}, {f['top']}] {f['dist']}" for f in factors]
+    })
+    return build_var_samples(values, factors), report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate doeInstance.varSamples for an ExperimentConfig.")
+    parser.add_argument("config", help="ExperimentConfig JSON")
+    parser.add_argument("--factors", default=None, help="JSON file with varSelections to use instead of the config's")
+    parser.add_argument("--method", default=None, help="orthogonal | uniform | lhs | factorial (default: from the config)")
+    parser.add_argument("--runs", type=int, default=None, help="Runs for uniform/lhs (default: runningInstanceNumMax)")
+    parser.add_argument("--levels", type=int, default=3, help="Levels per factor for orthogonal/factorial")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for lhs")
+    parser.add_argument("--write", action="store_true", help="Write varSamples back into the config")
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    selections = None
+    if args.factors:
+        with open(args.factors, 'r', encoding='utf-8') as f:
+            selections = json.load(f)
+
+    try:
+        samples, report = plan_experiment(config, args.method, args.runs, args.levels, args.seed, selections)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"Method: {report['method']}, {report['runs']} runs x {report['factors']} factors")
+    for line in report["factors_detail"]:
+        print(f"  {line}")
+    print(f"CD2: {report['cd2']}, min distance: {report.get('min_distance')}, "
+          f"max |corr|: {report.get('max_abs_correlation')}")
+    print(f"Engine capacity {report['capacity']} -> {report['waves']} waves")
+    for s in samples[:20]:
+        print(f"  #{s['sampleIndex']}: " + ", ".join(f"{v['paramName']}={v['value']:.6g}" for v in s["vars"]))
+    if len(samples) > 20:
+        print(f"  ... {len(samples) - 20} more")
+
+    if args.write:
+        if selections is not None:
+            config["varSelections"] = selections
+        config.setdefault("doeInstance", {})["varSamples"] = samples
+        tmp_path = args.config + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, args.config)
+        print(f"Wrote {len(samples)} samples to {args.config}")
@@ -1,37 +1,23 @@
-import subprocess
-import urllib.parse
+import os
+import sys
 import json
-import time
 
-import http_send
+from load_scenario import load_scenario
 
 ip='127.0.0.1'
 #ip='192.168.2.107'
-agentdata_url='http://'+ip+':18087/AgentData'
-patterndata_url='http://'+ip+':18087/RuntimeData'
-doe_url='http://'+ip+':18087/ExperimentConfig'
-doc_url='http://'+ip+':18087/DoctrinesConfig'
-cmd_url='http://'+ip+':18087/PoiCmd'
-
-formations_url='http://'+ip+':18087/FormationsData'
-
-def exe_cmd_post(url, filepath):
-    file_contents = http_send.loaddata_json(filepath)    
-    #print(file_contents)
-    return http_send.exe_request_post(url,file_contents)
-
-#http_send.exe_request_get('http://127.0.0.1:18087/getRunningSpeed')
-exe_cmd_post(agentdata_url,'./contents/agentdata_df.json')
-exe_cmd_post(agentdata_url,'./contents/agentdata_sm3.json')
-exe_cmd_post(agentdata_url,'./contents/agentdata_yjj.json')
-exe_cmd_post(patterndata_url,'./contents/patterndata_df.json')
-exe_cmd_post(patterndata_url,'./contents/patterndata_qzj.json')
-exe_cmd_post(patterndata_url,'./contents/patterndata_yjj.json')
-exe_cmd_post(doc_url,'./contents/doc.json')
-exe_cmd_post(doe_url,'./contents/ExperimentConfig.json')
-
-# print("暂停5秒后继续执行...")
-
-# time.sleep(5)  # 暂停5秒
-
-
+base_url='http://'+ip+':18087'
+
+# Uploads the files listed in scenario.json: agent data, patterns (RuntimeData),
+# doctrines, then the DoE config, each tier concurrently. A failed run resumes
+# from the failure next time (see load_scenario.py).
+here=os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(here,'scenario.json'),'r',encoding='utf-8') as f:
+    manifest=json.load(f)
+
+reports, warnings = load_scenario(manifest, here, base_url, state_path=os.path.join(here,'scenario.state.json'))
+for w in warnings:
+    print('Warning:', w)
+for r in reports:
+    print('OK   ' if r['ok'] else 'FAIL ', os.path.basename(r['file']), '->', r['endpoint'], r['error'] or '')
+sys.exit(0 if all(r['ok'] for r in reports) else 1)
@@ -0,0 +1,258 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from script_index import pattern_agent_ids
+
+# Scenario content loader for the simulation engine (port 18087).
+#
+# Reads a manifest, works out which endpoint every file belongs to from its
+# content and uploads in dependency tiers: agent data, then patterns
+# (RuntimeData), then doctrines, then the DoE config. Files of one tier are
+# posted concurrently over a single pooled session; a tier only starts when
+# the previous one fully succeeded. Each file is read and parsed once and
+# posted as-is.
+#
+# A failed run leaves a state file next to the manifest with the files that
+# were accepted; the next run skips them (unless their content changed) and
+# resumes from the failure. The state file is removed after a full success.
+#
+# Manifest:
+#   {
+#     "base_url": "http://127.0.0.1:18087",
+#     "files": [
+#       "contents/agentdata_df.json",
+#       {"file": "contents/doc.json", "endpoint": "DoctrinesConfig"}
+#     ]
+#   }
+
+DEFAULT_BASE_URL = "http://127.0.0.1:18087"
+
+# Upload order; each endpoint is recognized by a top-level key of its content
+TIERS = [
+    ("AgentData", "agents"),
+    ("RuntimeData", "patternSig"),
+    ("DoctrinesConfig", "doctrines"),
+    ("ExperimentConfig", "doeConfigSig"),
+]
+TIER_INDEX = {endpoint: idx for idx, (endpoint, _) in enumerate(TIERS)}
+
+STATE_SUFFIX = ".state.json"
+
+
+def detect_endpoint(data):
+    if isinstance(data, dict):
+        for endpoint, key in TIERS:
+            if key in data:
+                return endpoint
+    return None
+
+
+def read_manifest(manifest, base_dir):
+    """Read every manifest file once. Returns [{path, endpoint, body, data, sha256}]"""
+    entries = []
+    for item in manifest.get("files", []):
+        if isinstance(item, str):
+            item = {"file": item}
+        path = item["file"]
+        if not os.path.isabs(path):
+            path = os.path.normpath(os.path.join(base_dir, path))
+        with open(path, 'rb') as f:
+            body = f.read()
+        try:
+            data = json.loads(body.decode('utf-8-sig'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"{path}: invalid JSON ({e})")
+
+        endpoint = (item.get("endpoint") or detect_endpoint(data) or "").strip("/")
+        if endpoint not in TIER_INDEX:
+            raise ValueError(f"{path}: cannot tell which endpoint it belongs to, set \"endpoint\" in the manifest")
+        entries.append({"path": path, "endpoint": endpoint, "body": body, "data": data,
+                        "sha256": hashlib.sha256(body).hexdigest()})
+    return entries
+
+
+def check_references(entries):
+    """Pattern agentKeys not defined by earlier tiers of this bundle, as warnings, and the
+    doctrine owners not defined anywhere in it. Owners are often created on the engine
+    (sub-agents of an assembly), so those are only counted. Returns (warnings, owners)"""
+    agent_keys = set()
+    agent_ids = set()
+    for e in entries:
+        if e["endpoint"] == "AgentData":
+            agent_keys.update(a.get("agentKey") for a in e["data"].get("agents", []))
+        elif e["endpoint"] == "RuntimeData":
+            agent_ids |= pattern_agent_ids(e["data"].get("patternAgents", []))
+
+    warnings = []
+    owners = set()
+    for e in entries:
+        if e["endpoint"] == "RuntimeData":
+            missing = sorted({a.get("agentKey") for a in e["data"].get("patternAgents", [])} - agent_keys)
+            if missing:
+                examples = ", ".join(str(m) for m in missing[:3])
+                warnings.append(f"{os.path.basename(e['path'])}: {len(missing)} agentKey not defined in this bundle "
+                                f"(e.g. {examples}), assumed to exist on the engine")
+        elif e["endpoint"] == "DoctrinesConfig":
+            owners |= {d.get("doctOwnerAgentId") for d in e["data"].get("doctrines", [])} - agent_ids - {"", None}
+    return warnings, owners
+
+
+def make_session(workers, retries=2):
+    """One keep-alive session whose pool fits a whole tier; only failed connects are retried.
+    A POST that reached the engine may already have created its records, so read errors and 5xx are not"""
+    session = requests.Session()
+    retry = Retry(total=retries, connect=retries, read=0, status=0, backoff_factor=0.5)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, workers), max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json; charset=utf-8"})
+    return session
+
+
+def check_response(response):
+    """Returns None if the engine accepted the upload, else an error message"""
+    if not 200 <= response.status_code < 300:
+        return f"HTTP {response.status_code}: {response.text[:200]}"
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    if isinstance(body, dict) and "code" in body and str(body["code"]) not in ("0", "200"):
+        return f"code {body['code']}: {body.get('msg') or body.get('message') or ''}".strip()
+    return None
+
+
+def post_file(session, base_url, entry, timeout):
+    report = {"file": entry["path"], "endpoint": entry["endpoint"], "ok": False, "error": None}
+    start = time.perf_counter()
+    try:
+        response = session.post(f"{base_url}/{entry['endpoint']}", data=entry["body"], timeout=timeout)
+        report["status_code"] = response.status_code
+        report["error"] = check_response(response)
+        report["ok"] = report["error"] is None
+    except requests.exceptions.RequestException as e:
+        report["error"] = str(e)
+    report["seconds"] = round(time.perf_counter() - start, 3)
+    return report
+
+
+def _load_state(state_path):
+    if state_path and os.path.exists(state_path):
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {"done": {}}
+
+
+def _save_state(state_path, state):
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+def load_scenario(manifest, base_dir, base_url=None, workers=4, state_path=None, timeout=60, retries=2,
+                  dry_run=False):
+    """Upload a manifest tier by tier. Returns (reports, warnings); reports include skipped files"""
+    base_url = (base_url or manifest.get("base_url") or DEFAULT_BASE_URL).rstrip("/")
+    entries = read_manifest(manifest, base_dir)
+    warnings, owners = check_references(entries)
+    if owners:
+        print(f"{len(owners)} doctrine owners are not in this bundle, assumed to exist on the engine")
+
+    state = _load_state(state_path)
+    reports = []
+    pending = []
+    for e in entries:
+        if state["done"].get(e["path"]) == e["sha256"]:
+            reports.append({"file": e["path"], "endpoint": e["endpoint"], "ok": True, "skipped": True, "error": None})
+        else:
+            pending.append(e)
+
+    tiers = [[e for e in pending if TIER_INDEX[e["endpoint"]] == idx] for idx in range(len(TIERS))]
+    if dry_run:
+        for idx, tier in enumerate(tiers):
+            for e in tier:
+                reports.append({"file": e["path"], "endpoint": e["endpoint"], "ok": True, "tier": idx,
+                                "dry_run": True, "error": None})
+        return reports, warnings
+
+    session = make_session(workers, retries)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for idx, tier in enumerate(tiers):
+                if not tier:
+                    continue
+                print(f"Tier {idx} ({TIERS[idx][0]}): {', '.join(os.path.basename(e['path']) for e in tier)}")
+                tier_reports = list(pool.map(lambda e: post_file(session, base_url, e, timeout), tier))
+                for e, r in zip(tier, tier_reports):
+                    r["tier"] = idx
+                    if r["ok"]:
+                        state["done"][e["path"]] = e["sha256"]
+                reports.extend(tier_reports)
+
+                if not all(r["ok"] for r in tier_reports):
+                    # Later tiers reference this one; stop and keep what was accepted for the next run
+                    for later in tiers[idx + 1:]:
+                        for e in later:
+                            reports.append({"file": e["path"], "endpoint": e["endpoint"], "ok": False,
+                                            "error": "not sent, an earlier tier failed"})
+                    if state_path:
+                        _save_state(state_path, state)
+                    return reports, warnings
+    finally:
+        session.close()
+
+    if state_path and os.path.exists(state_path):
+        os.remove(state_path)
+    return reports, warnings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upload scenario content to the simulation engine in dependency order.")
+    parser.add_argument("manifest", help="Manifest JSON listing the content files")
+    parser.add_argument("--url", default=None, help=f"Engine base URL (default: manifest base_url or {DEFAULT_BASE_URL})")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent uploads within a tier")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds per request")
+    parser.add_argument("--retries", type=int, default=2, help="Retries when the engine cannot be reached (a sent upload is never repeated)")
+    parser.add_argument("--restart", action="store_true", help="Ignore the state of a previous failed run")
+    parser.add_argument("--dry-run", action="store_true", help="Show the tiers without sending anything")
+    args = parser.parse_args()
+
+    with open(args.manifest, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    state_path = os.path.splitext(os.path.abspath(args.manifest))[0] + STATE_SUFFIX
+    if args.restart and os.path.exists(state_path):
+        os.remove(state_path)
+
+    start = time.perf_counter()
+    reports, warnings = load_scenario(manifest, os.path.dirname(os.path.abspath(args.manifest)), args.url,
+                                      args.workers, state_path, args.timeout, args.retries, args.dry_run)
+    for w in warnings:
+        print(f"Warning: {w}")
+
+    failed = 0
+    for r in reports:
+        name = os.path.basename(r["file"])
+        if r.get("skipped"):
+            print(f"[SKIP] {name} -> /{r['endpoint']} (already loaded)")
+        elif r.get("dry_run"):
+            print(f"[TIER {r['tier']}] {name} -> /{r['endpoint']}")
+        elif r["ok"]:
+            print(f"[OK] {name} -> /{r['endpoint']} ({r['seconds']}s)")
+        else:
+            failed += 1
+            print(f"[ERROR] {name} -> /{r['endpoint']}: {r['error']}")
+
+    print(f"{len(reports) - failed}/{len(reports)} files loaded in {time.perf_counter() - start:.2f}s")
+    if failed and not args.dry_run:
+        print(f"Rerun to resume from the failure (state: {state_path})")
+    sys.exit(1 if failed else 0)
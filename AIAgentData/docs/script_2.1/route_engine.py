@@ -0,0 +1,289 @@
+import os
+import sys
+import json
+import zlib
+import base64
+import struct
+import argparse
+
+import numpy as np
+
+# Waypoint route engine for pattern and scenario JSON.
+#
+# Every waypoint list ({"wps": [...]}) found in a file is loaded into arrays:
+#   core    (n, 5) wpsCore = lon, lat, hgt, ref, simtime (3-element cores are padded)
+#   extras  (n, 6) useExt, speed, roll, pitch, yaw, yawEx
+# and can then be
+#   simplified  Douglas-Peucker in metres (WGS84 local tangent plane plus
+#               altitude); points whose extras change are always kept, as are
+#               the end points, and kept waypoints are left untouched
+#   resampled   to uniform spacing along the route; interpolated points take
+#               ref and extras from the waypoint they follow
+#   encoded     to a compact "wpsEncoded" string (fixed-point deltas, zlib,
+#               base64) replacing "wps"; --decode restores the verbose form
+#               (wpsCore and the extras, other per-waypoint keys are dropped)
+#
+#   python route_engine.py contents/patterndata_*.json --tolerance 10 --out compressed
+#   python route_engine.py "../LaViC想定案例/fxctsimulation.json" --spacing 500 --encode --out compressed
+
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+
+CORE_LEN = 5
+EXTRA_FIELDS = ["useExt", "speed", "roll", "pitch", "yaw", "yawEx"]
+
+ENCODING = "zdelta1"
+# Fixed-point scale per column: lon/lat 1e-7 deg, hgt/simtime 1 mm / 1 ms, extras 1e-6
+COLUMN_SCALES = np.array([1e7, 1e7, 1e3, 1e3, 1e3] + [1e6] * len(EXTRA_FIELDS))
+
+
+def geodetic_to_ecef(lon, lat, hgt):
+    """WGS84 geodetic (degrees, metres) to ECEF metres, shape (..., 3)"""
+    lon = np.radians(lon)
+    lat = np.radians(lat)
+    sin_lat = np.sin(lat)
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_lat ** 2)
+    x = (n + hgt) * np.cos(lat) * np.cos(lon)
+    y = (n + hgt) * np.cos(lat) * np.sin(lon)
+    z = (n * (1 - WGS84_E2) + hgt) * sin_lat
+    return np.stack([x, y, z], axis=-1)
+
+
+def waypoint_arrays(wps):
+    """wps list -> (core (n, 5), extras (n, 6), core length as stored)"""
+    n = len(wps)
+    core_len = max((len(w.get("wpsCore") or []) for w in wps), default=CORE_LEN)
+    core = np.zeros((n, CORE_LEN))
+    core[:, 3] = 1.0
+    for i, w in enumerate(wps):
+        values = w.get("wpsCore") or []
+        core[i, :len(values)] = values[:CORE_LEN]
+    extras = np.array([[w.get(k) or 0.0 for k in EXTRA_FIELDS] for w in wps], dtype=np.float64).reshape(n, len(EXTRA_FIELDS))
+    return core, extras, core_len
+
+
+def to_wps(core, extras, core_len=CORE_LEN, templates=None):
+    """Arrays back to the verbose wps list; other keys are copied from templates"""
+    wps = []
+    for i, (row, extra) in enumerate(zip(core.tolist(), extras.tolist())):
+        w = dict(templates[i]) if templates else {}
+        w["wpsCore"] = row[:core_len]
+        for key, value in zip(EXTRA_FIELDS, extra):
+            w[key] = int(value) if key == "useExt" else value
+        wps.append(w)
+    return wps
+
+
+def local_metres(core):
+    """Positions (n, 3) in metres on a tangent plane at the route's mean latitude.
+
+    Legs that are straight in lon/lat stay straight, which is how the engine
+    interpolates between waypoints.
+    """
+    lat0 = np.radians(np.mean(core[:, 1]))
+    sin_lat0 = np.sin(lat0)
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_lat0 ** 2)
+    m = n * (1 - WGS84_E2) / (1 - WGS84_E2 * sin_lat0 ** 2)
+    x = np.radians(core[:, 0] - core[0, 0]) * n * np.cos(lat0)
+    y = np.radians(core[:, 1] - core[0, 1]) * m
+    return np.column_stack([x, y, core[:, 2]])
+
+
+def douglas_peucker(points, tolerance):
+    """Boolean keep-mask for points (n, d) so no dropped point is farther than tolerance from the kept polyline"""
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = points[start], points[end]
+        inner = points[start + 1:end]
+        ab = b - a
+        length2 = ab @ ab
+        if length2 == 0:
+            dist = np.linalg.norm(inner - a, axis=1)
+        else:
+            t = np.clip((inner - a) @ ab / length2, 0.0, 1.0)
+            dist = np.linalg.norm(inner - (a + t[:, None] * ab), axis=1)
+        worst = int(np.argmax(dist))
+        if dist[worst] > tolerance:
+            split = start + 1 + worst
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return keep
+
+
+def _pinned(extras):
+    """Points where the waypoint attributes change must survive simplification"""
+    pinned = np.zeros(len(extras), dtype=bool)
+    if len(extras):
+        pinned[0] = pinned[-1] = True
+        pinned[1:] |= np.any(extras[1:] != extras[:-1], axis=1)
+    return pinned
+
+
+def simplify(core, extras, tolerance):
+    """Douglas-Peucker between pinned points. Returns the indices of the kept waypoints"""
+    if len(core) < 3:
+        return np.arange(len(core))
+    points = local_metres(core)
+    keep = _pinned(extras)
+    anchors = np.flatnonzero(keep)
+    for start, end in zip(anchors[:-1], anchors[1:]):
+        keep[start:end + 1] |= douglas_peucker(points[start:end + 1], tolerance)
+    return np.flatnonzero(keep)
+
+
+def cumulative_distance(core):
+    """Distance along the route in metres at every waypoint (straight ECEF segments)"""
+    points = geodetic_to_ecef(core[:, 0], core[:, 1], core[:, 2])
+    steps = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    return np.concatenate([[0.0], np.cumsum(steps)])
+
+
+def resample(core, extras, spacing):
+    """Uniformly spaced waypoints every `spacing` metres, end points kept.
+
+    Returns (core, extras, source) where source is the original waypoint each new one follows.
+    """
+    source = np.arange(len(core))
+    if len(core) < 2 or spacing <= 0:
+        return core, extras, source
+    dist = cumulative_distance(core)
+    total = dist[-1]
+    if total == 0:
+        return core[:1], extras[:1], source[:1]
+    stations = np.append(np.arange(0.0, total, spacing), total)
+
+    # Repeated waypoints give zero-length steps; interp needs increasing x
+    unique = np.concatenate([[True], np.diff(dist) > 0])
+    new_core = np.empty((len(stations), CORE_LEN))
+    for col in (0, 1, 2, 4):
+        new_core[:, col] = np.interp(stations, dist[unique], core[unique, col])
+    source = np.clip(np.searchsorted(dist, stations, side="right") - 1, 0, len(core) - 1)
+    source[-1] = len(core) - 1
+    new_core[:, 3] = core[source, 3]
+    return new_core, extras[source], source
+
+
+def encode_wps(core, extras, core_len=CORE_LEN):
+    """Compact string for a waypoint list: header, then zlib'd int64 deltas of the non-zero columns"""
+    columns = np.hstack([core, extras])
+    values = np.round(columns * COLUMN_SCALES).astype(np.int64)
+    present = np.any(values != 0, axis=0)
+    mask = int(sum(1 << i for i, p in enumerate(present) if p))
+    deltas = np.diff(values[:, present], axis=0, prepend=0)
+    header = struct.pack("<IBH", len(values), core_len, mask)
+    payload = zlib.compress(header + deltas.T.astype("<i8").tobytes(), 9)
+    return f"{ENCODING}:{base64.b64encode(payload).decode('ascii')}"
+
+
+def decode_wps(text):
+    """Inverse of encode_wps. Returns (core, extras, core_len)"""
+    encoding, _, data = text.partition(":")
+    if encoding != ENCODING:
+        raise ValueError(f"unknown waypoint encoding: {encoding}")
+    raw = zlib.decompress(base64.b64decode(data))
+    n, core_len, mask = struct.unpack_from("<IBH", raw)
+    present = [i for i in range(len(COLUMN_SCALES)) if mask & (1 << i)]
+    deltas = np.frombuffer(raw, dtype="<i8", offset=struct.calcsize("<IBH")).reshape(len(present), n).T
+    columns = np.zeros((n, len(COLUMN_SCALES)))
+    columns[:, present] = np.cumsum(deltas, axis=0) / COLUMN_SCALES[present]
+    return columns[:, :CORE_LEN], columns[:, CORE_LEN:], core_len
+
+
+def iter_waypoint_lists(data):
+    """Every dict holding a "wps" list or a "wpsEncoded" string"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if isinstance(node.get("wps"), list) or isinstance(node.get("wpsEncoded"), str):
+                yield node
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def process_routes(data, tolerance=None, spacing=None, encode=False, decode=False):
+    """Rewrite every waypoint list of data in place. Returns point counts (before, after)"""
+    before = after = 0
+    for holder in iter_waypoint_lists(data):
+        if "wpsEncoded" in holder:
+            if not decode:
+                continue
+            core, extras, core_len = decode_wps(holder.pop("wpsEncoded"))
+            wps = to_wps(core, extras, core_len)
+        else:
+            wps = holder["wps"]
+            if not wps:
+                # A route not drawn yet stays an empty list
+                continue
+            core, extras, core_len = waypoint_arrays(wps)
+        before += len(core)
+        if tolerance:
+            kept = simplify(core, extras, tolerance)
+            # Kept waypoints stay the original objects, untouched
+            wps = [wps[i] for i in kept]
+            core, extras = core[kept], extras[kept]
+        if spacing:
+            core, extras, source = resample(core, extras, spacing)
+            wps = to_wps(core, extras, core_len, [wps[i] for i in source])
+        after += len(core)
+        if encode:
+            holder.pop("wps", None)
+            holder["wpsEncoded"] = encode_wps(core, extras, core_len)
+        else:
+            holder["wps"] = wps
+    return before, after
+
+
+def dump_like(data, original_text):
+    """Serialize data in the layout of the source file (compact or indented)"""
+    if "\n" in original_text.strip()[:200]:
+        return json.dumps(data, ensure_ascii=False, indent=4)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simplify, resample and encode waypoint routes in scenario JSON.")
+    parser.add_argument("files", nargs="+", help="Pattern or simulation JSON files")
+    parser.add_argument("--tolerance", type=float, default=None, help="Douglas-Peucker tolerance in metres")
+    parser.add_argument("--spacing", type=float, default=None, help="Resample to this spacing in metres")
+    parser.add_argument("--encode", action="store_true", help="Write the compact wpsEncoded form")
+    parser.add_argument("--decode", action="store_true", help="Expand wpsEncoded back to wps")
+    parser.add_argument("--out", default=None, help="Output directory (default: report only)")
+    parser.add_argument("--in-place", action="store_true", help="Overwrite the input files")
+    args = parser.parse_args()
+
+    total_in = total_out = 0
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            text = f.read()
+        data = json.loads(text)
+        before, after = process_routes(data, args.tolerance, args.spacing, args.encode, args.decode)
+        output = dump_like(data, text)
+
+        size_in = len(text.encode("utf-8"))
+        size_out = len(output.encode("utf-8"))
+        total_in += size_in
+        total_out += size_out
+        print(f"{os.path.basename(path)}: {before} -> {after} waypoints, "
+              f"{size_in} -> {size_out} bytes ({size_in - size_out:+d} saved)")
+
+        target = path if args.in_place else (os.path.join(args.out, os.path.basename(path)) if args.out else None)
+        if target:
+            os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+            with open(target, 'w', encoding='utf-8') as f:
+                f.write(output)
+
+    if len(args.files) > 1:
+        print(f"Total: {total_in} -> {total_out} bytes ({total_in - total_out:+d} saved)")
+    sys.exit(0)
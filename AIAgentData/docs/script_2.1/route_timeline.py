@@ -0,0 +1,275 @@
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+
+from route_engine import WGS84_A, WGS84_F, decode_wps, geodetic_to_ecef, waypoint_arrays
+
+# Route lengths, ETAs and a spatio-temporal index for the pattern agents of
+# scenario files, computed before the scenario runs.
+#
+# All legs of all agents are measured in one vectorized WGS84 (Vincenty)
+# pass; altitude changes are added to each leg. A leg is flown at the speed
+# of the waypoint it starts from, else the agent's speed0, else
+# --default-speed; agents without any speed get no timeline. The first
+# waypoint's simtime is the departure time and agents are only present
+# between departure and arrival.
+#
+# Timelines are sampled every --step seconds, which answers:
+#   --at T           where every agent is at time T
+#   --separation D   pairs of agents closer than D metres, first time and minimum distance
+#   --cell DEG       grid cells each agent passes and when (the index written by --index)
+#
+#   python route_timeline.py contents/patterndata_*.json --default-speed 200 --separation 1000
+#   python route_timeline.py "../LaViC想定案例/slmhsimulation.json" --at 600 --index slmh_index.json
+
+VINCENTY_ITERATIONS = 200
+VINCENTY_TOLERANCE = 1e-12
+# Memory for the (agent, agent, time) arrays of one conflict block; the
+# number of time steps per block shrinks as the agent count grows
+PAIR_BLOCK_BYTES = 256 * 1024 * 1024
+
+
+def vincenty_distance(lon1, lat1, lon2, lat2):
+    """WGS84 inverse geodesic distance in metres, vectorized over arrays of degrees.
+
+    Nearly antipodal pairs that do not converge fall back to the last iterate.
+    """
+    lon1, lat1, lon2, lat2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lon1, lat1, lon2, lat2))
+    b = WGS84_A * (1 - WGS84_F)
+    u1 = np.arctan((1 - WGS84_F) * np.tan(lat1))
+    u2 = np.arctan((1 - WGS84_F) * np.tan(lat2))
+    sin_u1, cos_u1, sin_u2, cos_u2 = np.sin(u1), np.cos(u1), np.sin(u2), np.cos(u2)
+    big_l = lon2 - lon1
+
+    lam = big_l.copy()
+    sin_sigma = cos_sigma = sigma = cos2_alpha = cos_2sm = np.zeros_like(lam)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(VINCENTY_ITERATIONS):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+            cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(sin_sigma == 0, 0.0, cos_u1 * cos_u2 * sin_lam / sin_sigma)
+            cos2_alpha = 1 - sin_alpha ** 2
+            # Equatorial lines have cos2_alpha == 0
+            cos_2sm = np.where(cos2_alpha == 0, 0.0, cos_sigma - 2 * sin_u1 * sin_u2 / cos2_alpha)
+            c = WGS84_F / 16 * cos2_alpha * (4 + WGS84_F * (4 - 3 * cos2_alpha))
+            new_lam = big_l + (1 - c) * WGS84_F * sin_alpha * (
+                sigma + c * sin_sigma * (cos_2sm + c * cos_sigma * (-1 + 2 * cos_2sm ** 2)))
+            new_lam = np.where(np.isfinite(new_lam), new_lam, lam)
+            converged = np.abs(new_lam - lam) <= VINCENTY_TOLERANCE
+            lam = new_lam
+            # Converged pairs sit at a fixed point, so iterating the whole array is harmless
+            if converged.all():
+                break
+
+    u_sq = cos2_alpha * (WGS84_A ** 2 - b ** 2) / b ** 2
+    big_a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+    big_b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    delta_sigma = big_b * sin_sigma * (cos_2sm + big_b / 4 * (
+        cos_sigma * (-1 + 2 * cos_2sm ** 2) - big_b / 6 * cos_2sm * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sm ** 2)))
+    return np.where(sin_sigma == 0, 0.0, b * big_a * (sigma - delta_sigma))
+
+
+def load_pattern_agents(data, source=""):
+    """Every patternAgents entry with its active waypoint list as arrays"""
+    agents = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for p in node.get("patternAgents") or []:
+                routes = p.get("waypoints") or []
+                if not routes:
+                    continue
+                route = routes[min(int(p.get("waypointsIndexActive") or 0), len(routes) - 1)]
+                if isinstance(route.get("wpsEncoded"), str):
+                    core, extras, _ = decode_wps(route["wpsEncoded"])
+                else:
+                    core, extras, _ = waypoint_arrays(route.get("wps") or [])
+                if len(core) == 0:
+                    continue
+                agents.append({"agentId": p.get("agentId"), "agentLabel": p.get("agentLabel"),
+                               "instanceName": p.get("instanceName"), "source": source,
+                               "asmParentPath": p.get("asmParentPath") or "",
+                               "speed0": float(p.get("speed0") or 0.0), "core": core, "extras": extras})
+            stack.extend(v for k, v in node.items() if k != "patternAgents")
+        elif isinstance(node, list):
+            stack.extend(node)
+    return agents
+
+
+def build_timelines(agents, default_speed=0.0):
+    """Leg lengths, durations and arrival times for all agents in one pass.
+
+    Adds "legs" (length_m, speed, depart, arrive per leg), "length_m", "depart", "eta" to every agent.
+    """
+    counts = np.array([len(a["core"]) - 1 for a in agents])
+    starts = np.concatenate([a["core"][:-1] for a in agents]) if counts.sum() else np.zeros((0, 5))
+    ends = np.concatenate([a["core"][1:] for a in agents]) if counts.sum() else np.zeros((0, 5))
+    leg_speed = np.concatenate([a["extras"][:-1, 1] for a in agents]) if counts.sum() else np.zeros(0)
+
+    surface = vincenty_distance(starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1])
+    length = np.hypot(surface, ends[:, 2] - starts[:, 2])
+    agent_speed = np.repeat([a["speed0"] or default_speed for a in agents], counts)
+    speed = np.where(leg_speed > 0, leg_speed, agent_speed)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        duration = np.where(speed > 0, length / speed, np.where(length == 0, 0.0, np.nan))
+
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    for i, a in enumerate(agents):
+        legs = slice(offsets[i], offsets[i + 1])
+        depart = float(a["core"][0, 4])
+        arrive = depart + np.cumsum(duration[legs])
+        a["legs"] = {"length_m": length[legs], "speed": speed[legs],
+                     "depart": np.concatenate([[depart], arrive[:-1]]), "arrive": arrive}
+        a["length_m"] = float(length[legs].sum())
+        a["depart"] = depart
+        a["eta"] = float(arrive[-1]) if len(arrive) else depart
+        # Arrival time at every waypoint, for interpolation
+        a["times"] = np.concatenate([[depart], arrive])
+    return agents
+
+
+def sample_positions(agents, times):
+    """lon, lat, hgt arrays (agents, len(times)); NaN where an agent has not departed or has arrived"""
+    shape = (len(agents), len(times))
+    lon, lat, hgt = np.full(shape, np.nan), np.full(shape, np.nan), np.full(shape, np.nan)
+    for i, a in enumerate(agents):
+        t = a["times"]
+        if not np.all(np.isfinite(t)):
+            continue
+        present = (times >= t[0]) & (times <= t[-1])
+        # Waypoints reached at the same time (zero-length legs) keep the later one
+        keep = np.concatenate([np.diff(t) > 0, [True]])
+        for out, col in ((lon, 0), (lat, 1), (hgt, 2)):
+            out[i, present] = np.interp(times[present], t[keep], a["core"][keep, col])
+    return lon, lat, hgt
+
+
+def find_conflicts(agents, times, lon, lat, hgt, separation):
+    """Pairs closer than separation metres: [{a, b, first_time, min_distance_m, min_time}]
+
+    An agent and the agents it carries (asmParentPath) are not a conflict.
+    """
+    points = geodetic_to_ecef(lon, lat, hgt)
+    n = len(agents)
+    first = np.full((n, n), np.nan)
+    closest = np.full((n, n), np.inf)
+    closest_time = np.full((n, n), np.nan)
+    # About four (n, n, step) float64 arrays are alive at once
+    step = max(1, PAIR_BLOCK_BYTES // (n * n * 8 * 4))
+    for start in range(0, len(times), step):
+        block = points[:, start:start + step]
+        # Squared distance summed per axis, without an (n, n, step, 3) temporary
+        dist = np.zeros((n, n, block.shape[1]))
+        for axis in range(3):
+            dist += (block[:, None, :, axis] - block[None, :, :, axis]) ** 2
+        np.sqrt(dist, out=dist)
+        dist = np.where(np.isnan(dist), np.inf, dist)
+        idx = np.argmin(dist, axis=-1)
+        block_min = np.take_along_axis(dist, idx[..., None], axis=-1)[..., 0]
+        better = block_min < closest
+        closest = np.where(better, block_min, closest)
+        closest_time = np.where(better, times[start + idx], closest_time)
+        close = dist < separation
+        hit = close.any(axis=-1) & np.isnan(first)
+        first[hit] = times[start + np.argmax(close, axis=-1)][hit]
+
+    paths = [a["asmParentPath"].split("/") for a in agents]
+    conflicts = []
+    for i, j in zip(*np.nonzero(np.triu(~np.isnan(first), 1))):
+        if agents[i]["agentId"] in paths[j] or agents[j]["agentId"] in paths[i]:
+            continue
+        conflicts.append({"a": agents[i]["agentLabel"], "a_id": agents[i]["agentId"],
+                          "b": agents[j]["agentLabel"], "b_id": agents[j]["agentId"],
+                          "first_time": float(first[i, j]), "min_distance_m": round(float(closest[i, j]), 1),
+                          "min_time": float(closest_time[i, j])})
+    return sorted(conflicts, key=lambda c: c["first_time"])
+
+
+def cell_index(agents, times, lon, lat, cell_deg):
+    """{"ix,iy": [[agentId, enter, leave], ...]} for grid cells of cell_deg degrees"""
+    index = {}
+    for i, a in enumerate(agents):
+        present = ~np.isnan(lon[i])
+        if not present.any():
+            continue
+        t = times[present]
+        ix = np.floor(lon[i, present] / cell_deg).astype(np.int64)
+        iy = np.floor(lat[i, present] / cell_deg).astype(np.int64)
+        # One interval per run of consecutive samples in the same cell
+        change = np.flatnonzero((np.diff(ix) != 0) | (np.diff(iy) != 0)) + 1
+        begins = np.concatenate([[0], change])
+        ends = np.concatenate([change - 1, [len(t) - 1]])
+        for b, e in zip(begins, ends):
+            index.setdefault(f"{ix[b]},{iy[b]}", []).append([a["agentId"], float(t[b]), float(t[e])])
+    return index
+
+
+def agents_at(agents, time, lon, lat, hgt, times):
+    """Positions of all present agents at the sample closest to time"""
+    k = int(np.clip(np.searchsorted(times, time), 0, len(times) - 1))
+    return [{"agentId": a["agentId"], "agentLabel": a["agentLabel"], "lon": float(lon[i, k]),
+             "lat": float(lat[i, k]), "hgt": float(hgt[i, k])}
+            for i, a in enumerate(agents) if not np.isnan(lon[i, k])]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute route lengths, ETAs and a spatio-temporal index for pattern agents.")
+    parser.add_argument("files", nargs="+", help="Pattern or simulation JSON files")
+    parser.add_argument("--default-speed", type=float, default=0.0, help="m/s for agents without speed0 or waypoint speed")
+    parser.add_argument("--step", type=float, default=1.0, help="Sampling step in seconds")
+    parser.add_argument("--at", type=float, default=None, help="Show where every agent is at this time")
+    parser.add_argument("--separation", type=float, default=None, help="Report pairs closer than this many metres")
+    parser.add_argument("--cell", type=float, default=0.01, help="Index cell size in degrees")
+    parser.add_argument("--index", default=None, help="Write timelines and the cell index to this JSON file")
+    args = parser.parse_args()
+
+    agents = []
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            agents.extend(load_pattern_agents(json.load(f), os.path.basename(path)))
+    if not agents:
+        print("No pattern agents with waypoints")
+        sys.exit(1)
+    build_timelines(agents, args.default_speed)
+
+    for a in agents:
+        eta = f"{a['eta'] - a['depart']:.1f}s" if np.isfinite(a["eta"]) else "no speed"
+        print(f"{a['source']}: {a['agentLabel']} {a['agentId']}: {len(a['core'])} waypoints, "
+              f"{a['length_m'] / 1000:.3f} km, ETA {eta}")
+
+    timed = [a for a in agents if np.isfinite(a["eta"])]
+    if not timed:
+        print("No agent has a speed, pass --default-speed for timelines")
+        sys.exit(0)
+    t0 = min(a["depart"] for a in timed)
+    t1 = max(a["eta"] for a in timed)
+    times = np.append(np.arange(t0, t1, args.step), t1)
+    lon, lat, hgt = sample_positions(timed, times)
+
+    if args.at is not None:
+        print(f"At t={args.at}:")
+        for p in agents_at(timed, args.at, lon, lat, hgt, times):
+            print(f"  {p['agentLabel']} {p['agentId']}: {p['lon']:.6f}, {p['lat']:.6f}, {p['hgt']:.1f}")
+
+    if args.separation:
+        conflicts = find_conflicts(timed, times, lon, lat, hgt, args.separation)
+        print(f"{len(conflicts)} pairs closer than {args.separation} m")
+        for c in conflicts:
+            print(f"  {c['a']} {c['a_id']} / {c['b']} {c['b_id']}: from t={c['first_time']}, "
+                  f"min {c['min_distance_m']} m at t={c['min_time']}")
+
+    if args.index:
+        index = cell_index(timed, times, lon, lat, args.cell)
+        timelines = [{"agentId": a["agentId"], "agentLabel": a["agentLabel"], "source": a["source"],
+                      "length_m": a["length_m"], "depart": a["depart"], "eta": a["eta"],
+                      "waypoint_times": a["times"].tolist()} for a in timed]
+        with open(args.index, 'w', encoding='utf-8') as f:
+            json.dump({"cell_deg": args.cell, "step": args.step, "timelines": timelines, "cells": index},
+                      f, ensure_ascii=False, indent=2)
+        print(f"Index of {len(index)} cells written to {args.index}")
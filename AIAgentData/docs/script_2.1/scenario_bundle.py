@@ -0,0 +1,263 @@
+import os
+import sys
+import gzip
+import json
+import lzma
+import hashlib
+import argparse
+
+from scenario_reader import ScenarioReader
+
+# Deduplicating bundles for LaViC scenario exports.
+#
+# A scenario library stores the same agent and model definitions again and
+# again, and every agent instance repeats most of its agent. A store is one
+# pack file holding content-addressed JSON values and one manifest per export:
+#   manifest   the export, with large values replaced by {"$obj": sha256}
+#   object     one JSON value, stored once whatever references it
+# Values of CHUNK_MIN bytes or more are replaced by references, recursively,
+# so equal agents, models, axns or vardefs are shared across records and
+# scenarios even when their keys or audit fields differ. Agent instances are
+# stored as the fields that differ from their agent ({"$inst": ...}).
+# The pack is compressed as a whole with xz, so the small values left inline
+# and the references still compress against each other. It is read into
+# memory and rewritten atomically on every pack; objects no manifest reaches
+# any more are dropped then. Unpacking rebuilds the export exactly (same
+# values and key order).
+#
+#   python scenario_bundle.py pack "../LaViC想定案例/"*.json --store scenarios.lavicpack
+#   python scenario_bundle.py unpack fkfdsimulation --store scenarios.lavicpack --out fkfdsimulation.json
+#   python scenario_bundle.py verify fkfdsimulation "../LaViC想定案例/fkfdsimulation.json" --store scenarios.lavicpack
+
+FORMAT = "lavic-bundle/1"
+PACK_HEADER = "lavic-pack/1"
+# Roughly a whole agent, model or axn; smaller values stay inline in the manifest
+CHUNK_MIN = 4096
+REF_KEY = "$obj"
+INSTANCE_KEY = "$inst"
+
+
+def _canonical(value):
+    # Key order is part of the content: rebuilt exports keep the original order
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ObjectStore:
+    """Objects and manifests of one pack file, held in memory until save()"""
+    def __init__(self, path):
+        self.path = path
+        self.objects = {}       # sha -> canonical JSON bytes
+        self.bundles = {}       # name -> manifest dict
+        self._cache = {}
+        if os.path.exists(path):
+            self._load()
+        self._loaded = set(self.objects)
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            lines = lzma.decompress(f.read()).decode("utf-8").split("\n")
+        if lines[0] != PACK_HEADER:
+            raise ValueError(f"{self.path} is not a scenario pack")
+        for line in lines[1:]:
+            if not line:
+                continue
+            kind, key, value = line.split("\t", 2)
+            if kind == "O":
+                self.objects[key] = value.encode("utf-8")
+            elif kind == "B":
+                self.bundles[key] = json.loads(value)
+
+    def put(self, data):
+        sha = hashlib.sha256(data).hexdigest()
+        self.objects.setdefault(sha, data)
+        return sha
+
+    def get(self, sha):
+        if sha not in self._cache:
+            self._cache[sha] = json.loads(self.objects[sha].decode("utf-8"))
+        return self._cache[sha]
+
+    def reachable(self):
+        """Shas referenced, directly or through other objects, by any manifest"""
+        seen = set()
+        stack = list(self.bundles.values())
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                if len(value) == 1 and REF_KEY in value:
+                    sha = value[REF_KEY]
+                    if sha not in seen:
+                        seen.add(sha)
+                        stack.append(self.get(sha))
+                else:
+                    stack.extend(value.values())
+            elif isinstance(value, list):
+                stack.extend(value)
+        return seen
+
+    def save(self):
+        """Rewrite the pack with every manifest and the objects they reach.
+        Returns (objects kept, objects new in this pack, pack bytes)"""
+        keep = self.reachable()
+        lines = [PACK_HEADER]
+        lines += [f"B\t{name}\t{_canonical(bundle).decode('utf-8')}" for name, bundle in sorted(self.bundles.items())]
+        lines += [f"O\t{sha}\t{self.objects[sha].decode('utf-8')}" for sha in sorted(keep)]
+        data = lzma.compress("\n".join(lines).encode("utf-8"), preset=9 | lzma.PRESET_EXTREME)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        return len(keep), len(keep - self._loaded), len(data)
+
+
+def chunk(value, store):
+    """Replace every value of CHUNK_MIN bytes or more by a store reference, innermost first"""
+    if isinstance(value, dict):
+        packed = {k: chunk(v, store) for k, v in value.items()}
+    elif isinstance(value, list):
+        packed = [chunk(v, store) for v in value]
+    else:
+        return value
+    data = _canonical(packed)
+    if len(data) < CHUNK_MIN:
+        return packed
+    return {REF_KEY: store.put(data)}
+
+
+def unchunk(value, store):
+    if isinstance(value, dict):
+        if len(value) == 1 and REF_KEY in value:
+            return unchunk(store.get(value[REF_KEY]), store)
+        return {k: unchunk(v, store) for k, v in value.items()}
+    if isinstance(value, list):
+        return [unchunk(v, store) for v in value]
+    return value
+
+
+def _shallow(value, store):
+    """One level of a chunked record: a reference is opened, its fields stay packed"""
+    while isinstance(value, dict) and len(value) == 1 and REF_KEY in value:
+        value = store.get(value[REF_KEY])
+    return value
+
+
+def pack_instance(instance, agents, store):
+    """An instance as the fields that differ from its agent (plus its key order)"""
+    base = agents.get(instance.get("agentKey"))
+    packed = _shallow(chunk(instance, store), store)
+    if base is None or not isinstance(packed, dict):
+        return packed
+    base = _shallow(base, store)
+    changed = {k: v for k, v in packed.items() if k not in base or base[k] != v}
+    return {INSTANCE_KEY: {"agentKey": instance.get("agentKey"), "keys": chunk(list(packed), store),
+                           "set": changed}}
+
+
+def unpack_instance(entry, agents, store):
+    spec = entry[INSTANCE_KEY]
+    base = _shallow(agents[spec["agentKey"]], store)
+    keys = unchunk(spec["keys"], store)
+    return {k: unchunk(spec["set"][k] if k in spec["set"] else base[k], store) for k in keys}
+
+
+def pack_export(path, store):
+    """Manifest dict for one export file; records are streamed through ScenarioReader"""
+    elements = []
+    with ScenarioReader(path, write_index=False) as reader:
+        for element in range(len(reader.index["elements"])):
+            out = {}
+            packed_agents = [chunk(r, store) for r in reader.iter_records("agents", element)]
+            agents = {}
+            for (_, _, ids), packed in zip(reader.records("agents", element), packed_agents):
+                agents.setdefault(ids.get("agentKey"), packed)
+            for section in reader.sections(element):
+                if section == "agents" and packed_agents:
+                    out[section] = packed_agents
+                elif section == "agentInstances":
+                    out[section] = [pack_instance(r, agents, store) for r in reader.iter_records(section, element)]
+                elif reader.records(section, element):
+                    out[section] = [chunk(r, store) for r in reader.iter_records(section, element)]
+                else:
+                    out[section] = chunk(reader.section(section, element), store)
+            elements.append(out)
+    return {"format": FORMAT, "source": os.path.basename(path), "elements": elements}
+
+
+def unpack_export(bundle, store):
+    """Rebuild the export list from a manifest"""
+    if bundle.get("format") != FORMAT:
+        raise ValueError(f"unsupported bundle format: {bundle.get('format')}")
+    elements = []
+    for packed in bundle["elements"]:
+        agents = {}
+        for a in packed.get("agents") or []:
+            agents.setdefault(_shallow(a, store).get("agentKey"), a)
+        out = {}
+        for section, value in packed.items():
+            if section == "agentInstances":
+                out[section] = [unpack_instance(v, agents, store) if isinstance(v, dict) and INSTANCE_KEY in v
+                                else unchunk(v, store) for v in value]
+            else:
+                out[section] = unchunk(value, store)
+        elements.append(out)
+    return elements
+
+
+def dump_export(elements):
+    """Exports are written compact, as the platform does"""
+    return json.dumps(elements, ensure_ascii=False, separators=(",", ":"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack scenario exports into a deduplicated store and rebuild them.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_pack = sub.add_parser("pack", help="Add exports to a store (one bundle per file, named by its stem)")
+    p_pack.add_argument("files", nargs="+", help="Scenario export JSON files")
+    p_pack.add_argument("--store", required=True, help="Pack file (created if missing)")
+    p_unpack = sub.add_parser("unpack", help="Rebuild an export from a bundle")
+    p_unpack.add_argument("bundle", help="Bundle name (the export's file stem)")
+    p_unpack.add_argument("--store", required=True, help="Pack file")
+    p_unpack.add_argument("--out", required=True, help="Output export JSON")
+    p_verify = sub.add_parser("verify", help="Check that a bundle rebuilds an export exactly")
+    p_verify.add_argument("bundle", help="Bundle name (the export's file stem)")
+    p_verify.add_argument("original", help="The export it was packed from")
+    p_verify.add_argument("--store", required=True, help="Pack file")
+    args = parser.parse_args()
+
+    store = ObjectStore(args.store)
+    if args.command == "pack":
+        original = 0
+        baseline = 0
+        for path in args.files:
+            name = os.path.splitext(os.path.basename(path))[0]
+            store.bundles[name] = pack_export(path, store)
+            with open(path, 'rb') as f:
+                data = f.read()
+            original += len(data)
+            baseline += len(gzip.compress(data, 9))
+            print(f"{os.path.basename(path)} -> bundle {name}")
+        objects, new, size = store.save()
+        print(f"Store {args.store}: {len(store.bundles)} bundles, {objects} objects ({new} new), {size} bytes")
+        print(f"{len(args.files)} exports: {original} bytes ({baseline} bytes as gzip -9 files) -> {size} bytes; "
+              f"{original / max(size, 1):.1f}x smaller than raw, {baseline / max(size, 1):.1f}x smaller than gzip")
+        sys.exit(0)
+
+    if args.bundle not in store.bundles:
+        print(f"[ERROR] no bundle {args.bundle} in {args.store} (have: {', '.join(sorted(store.bundles))})")
+        sys.exit(1)
+    elements = unpack_export(store.bundles[args.bundle], store)
+    if args.command == "unpack":
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(dump_export(elements))
+        print(f"Rebuilt {args.out}")
+        sys.exit(0)
+
+    with open(args.original, 'r', encoding='utf-8-sig') as f:
+        text = f.read()
+    expected = json.loads(text)
+    if elements != expected:
+        print(f"[ERROR] {args.bundle} does not rebuild {args.original}")
+        sys.exit(1)
+    same_bytes = dump_export(elements) == text.strip()
+    print(f"[OK] {args.bundle} rebuilds {args.original}" + ("" if same_bytes else " (same values, different layout)"))
+    sys.exit(0)
@@ -0,0 +1,235 @@
+import sys
+import json
+import argparse
+from collections import deque
+
+from scenario_reader import ScenarioReader
+
+# Dependency graph of a scenario export and dead-reference analysis.
+#
+# Nodes are "simulation:<sig>", "pattern:<patternSig>", "instance:<agentId>",
+# "agent:<agentKey>", "model:<asset sig>" and "file:<url>" (model files, only
+# ever leaves). Edges are collected in one pass over the records read through
+# ScenarioReader:
+#   simulation -> pattern     runningPatterns[].patternSigRef
+#   simulation -> instance    runningPatterns[].patternAgentUpdates[].patternAgentInstId
+#   pattern    -> instance    patternAgents[].agentId
+#   pattern    -> agent       patternAgents[].agentKey
+#   instance   -> agent       agentKey
+#   instance   -> instance    asmParentPath (carried by), doctrines[].doctOwnerAgentId
+#   agent      -> agent       subagents[].agentChild
+#   agent/instance -> model   modelUrlSlim/Fat/Medium/PAK ("asset_..." ids)
+#   model      -> file        dimModelUrls, pakUrl
+# Everything reachable from the simulation is what the scenario needs; the
+# rest are orphans. Edges to a node missing from a section the export has are
+# dangling; references into sections the export lacks (models, in most
+# exports) are listed as external.
+#
+#   python scenario_graph.py "../LaViC想定案例/fkfdsimulation.json"
+#   python scenario_graph.py "../LaViC想定案例/fkfdsimulation.json" --why agent:AGENTKEY_228841409403277335
+#   python scenario_graph.py "../LaViC想定案例/fkfdsimulation.json" --prune fkfd_min.json
+
+MODEL_FIELDS = ("modelUrlSlim", "modelUrlFat", "modelUrlMedium", "modelUrlPAK")
+# Node kinds the export defines; references to other kinds are external
+DEFINED_KINDS = {"simulation", "pattern", "instance", "agent", "model"}
+SECTION_KINDS = {"agentInstances": "instance", "agentRunningPatterns": "pattern", "agents": "agent", "models": "model"}
+
+
+class ScenarioGraph:
+    def __init__(self):
+        self.nodes = {}         # node -> (section, position) where it is defined
+        self.edges = {}         # node -> [(target, label)]
+        self.kinds = set()      # node kinds whose section the export has
+        self.root = None
+
+    def add_node(self, node, where):
+        self.nodes.setdefault(node, where)
+
+    def add_edge(self, source, target, label):
+        if target and source != target:
+            self.edges.setdefault(source, []).append((target, label))
+
+    def _model_refs(self, node, record):
+        for field in MODEL_FIELDS:
+            value = record.get(field)
+            if isinstance(value, str) and value.startswith("asset_"):
+                self.add_edge(node, f"model:{value}", field)
+
+    def add_record(self, section, position, record):
+        """Add one record's node and outgoing edges"""
+        if section == "simulation":
+            node = f"simulation:{record.get('simulationSig')}"
+            self.root = node
+            self.add_node(node, (section, 0))
+            for rp in record.get("runningPatterns") or []:
+                self.add_edge(node, f"pattern:{rp.get('patternSigRef')}", "runningPatterns")
+                for update in rp.get("patternAgentUpdates") or []:
+                    self.add_edge(node, f"instance:{update.get('patternAgentInstId')}", "patternAgentUpdates")
+        elif section == "agentRunningPatterns":
+            node = f"pattern:{record.get('patternSig')}"
+            self.add_node(node, (section, position))
+            for pa in record.get("patternAgents") or []:
+                self.add_edge(node, f"instance:{pa.get('agentId')}", "patternAgents")
+                self.add_edge(node, f"agent:{pa.get('agentKey')}", "patternAgents.agentKey")
+        elif section == "agentInstances":
+            node = f"instance:{record.get('agentId')}"
+            self.add_node(node, (section, position))
+            self.add_edge(node, f"agent:{record.get('agentKey')}", "agentKey")
+            self._model_refs(node, record)
+            path = [p for p in (record.get("asmParentPath") or "").split("/") if p]
+            if len(path) > 1:
+                self.add_edge(node, f"instance:{path[-2]}", "asmParentPath")
+            for doctrine in record.get("doctrines") or []:
+                if doctrine.get("doctOwnerAgentId"):
+                    self.add_edge(node, f"instance:{doctrine['doctOwnerAgentId']}", "doctOwnerAgentId")
+        elif section == "agents":
+            node = f"agent:{record.get('agentKey')}"
+            self.add_node(node, (section, position))
+            self._model_refs(node, record)
+            for sub in record.get("subagents") or []:
+                self.add_edge(node, f"agent:{sub.get('agentChild')}", "subagents")
+        elif section == "models":
+            node = f"model:{record.get('sig')}"
+            self.add_node(node, (section, position))
+            for url in record.get("dimModelUrls") or []:
+                if url.get("url"):
+                    self.add_edge(node, f"file:{url['url']}", "dimModelUrls")
+            if (record.get("pakUrl") or {}).get("url"):
+                self.add_edge(node, f"file:{record['pakUrl']['url']}", "pakUrl")
+
+    def reachable(self, start=None):
+        """{node: (parent, label)} for every node reachable from start (default: the simulation)"""
+        start = start or self.root
+        seen = {start: (None, None)}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for target, label in self.edges.get(node, []):
+                if target not in seen:
+                    seen[target] = (node, label)
+                    queue.append(target)
+        return seen
+
+    def path_to(self, node, reach=None):
+        """Chain of (node, label) from the simulation to node, or None if unreachable"""
+        reach = reach if reach is not None else self.reachable()
+        if node not in reach:
+            return None
+        chain = []
+        while node is not None:
+            parent, label = reach[node]
+            chain.append((node, label))
+            node = parent
+        return chain[::-1]
+
+    def dangling(self):
+        """{target: [(source, label)]} for references to nodes missing from a section the export has"""
+        missing = {}
+        for source, targets in self.edges.items():
+            for target, label in targets:
+                if target.split(":", 1)[0] in self.kinds and target not in self.nodes:
+                    missing.setdefault(target, []).append((source, label))
+        return missing
+
+    def external(self):
+        """Referenced nodes of kinds the export has no section for (e.g. models kept on the platform)"""
+        return sorted({target for targets in self.edges.values() for target, _ in targets
+                       if target.split(":", 1)[0] in DEFINED_KINDS - self.kinds})
+
+    def orphans(self, reach=None):
+        reach = reach if reach is not None else self.reachable()
+        return sorted(node for node in self.nodes if node not in reach)
+
+
+def build_graph(reader, element=0):
+    """Single pass over the export's records"""
+    graph = ScenarioGraph()
+    sections = reader.sections(element)
+    graph.kinds = {kind for section, kind in SECTION_KINDS.items() if section in sections}
+    if "simulation" in sections:
+        graph.kinds.add("simulation")
+        simulation = reader.section("simulation", element)
+        if isinstance(simulation, dict):
+            graph.add_record("simulation", 0, simulation)
+    for section in SECTION_KINDS:
+        for position, record in enumerate(reader.iter_records(section, element)):
+            graph.add_record(section, position, record)
+    return graph
+
+
+def prune_export(reader, graph, element=0):
+    """The export with only the records reachable from the simulation"""
+    reach = graph.reachable()
+    keep = {}
+    for node in reach:
+        where = graph.nodes.get(node)
+        if where and where[0] in SECTION_KINDS:
+            keep.setdefault(where[0], set()).add(where[1])
+    out = {}
+    for section in reader.sections(element):
+        if section in SECTION_KINDS:
+            out[section] = [r for i, r in enumerate(reader.iter_records(section, element)) if i in keep.get(section, ())]
+        else:
+            out[section] = reader.section(section, element)
+    return [out]
+
+
+def summarize(graph, reach):
+    counts = {}
+    for node in graph.nodes:
+        kind = node.split(":", 1)[0]
+        used, total = counts.get(kind, (0, 0))
+        counts[kind] = (used + (node in reach), total + 1)
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze references in a scenario export and compute what it needs.")
+    parser.add_argument("file", help="Scenario export JSON")
+    parser.add_argument("--element", type=int, default=0, help="Scenario index within the export list")
+    parser.add_argument("--why", default=None, metavar="NODE", help="Show how the simulation reaches a node (e.g. agent:AGENTKEY_...)")
+    parser.add_argument("--needs", default=None, metavar="NODE", help="List everything a node depends on")
+    parser.add_argument("--prune", default=None, metavar="OUT", help="Write the export with orphans removed")
+    args = parser.parse_args()
+
+    with ScenarioReader(args.file) as reader:
+        graph = build_graph(reader, args.element)
+        if graph.root is None:
+            print(f"{args.file}: no simulation section")
+            sys.exit(1)
+        reach = graph.reachable()
+
+        if args.why:
+            chain = graph.path_to(args.why, reach)
+            if chain is None:
+                print(f"{args.why} is not reachable from {graph.root}")
+            else:
+                print(" -> ".join(f"{node}" + (f" [{label}]" if label else "") for node, label in chain))
+            sys.exit(0)
+        if args.needs:
+            for node in sorted(graph.reachable(args.needs)):
+                if node != args.needs:
+                    print(node + ("  (missing)" if node.split(":", 1)[0] in graph.kinds and node not in graph.nodes else ""))
+            sys.exit(0)
+
+        for kind, (used, total) in sorted(summarize(graph, reach).items()):
+            print(f"{kind}: {used}/{total} used")
+        dangling = graph.dangling()
+        for target, sources in dangling.items():
+            examples = ", ".join(f"{source} ({label})" for source, label in sources[:3])
+            print(f"[DANGLING] {target} referenced by {len(sources)}: {examples}")
+        external = graph.external()
+        if external:
+            print(f"{len(external)} references to sections not in this export: {', '.join(external)}")
+        for node in graph.orphans(reach):
+            print(f"[ORPHAN] {node}")
+        needed = [n for n in reach if n not in dangling]
+        print(f"Closure: {sum(n.startswith('agent:') for n in needed)} agents, "
+              f"{sum(n.startswith('model:') for n in needed)} models, "
+              f"{sum(n.startswith('file:') for n in needed)} model files")
+
+        if args.prune:
+            with open(args.prune, 'w', encoding='utf-8') as f:
+                json.dump(prune_export(reader, graph, args.element), f, ensure_ascii=False)
+            print(f"Pruned export written to {args.prune}")
+    sys.exit(1 if dangling else 0)
@@ -0,0 +1,252 @@
+import os
+import re
+import sys
+import json
+import mmap
+import argparse
+
+import numpy as np
+
+# Lazy reader for LaViC scenario exports (docs/LaViC想定案例/*simulation.json).
+#
+# An export is [{"simulation": {...}, "agentInstances": [...],
+# "agentRunningPatterns": [...], "agents": [...], "models": [...]}]. Instead
+# of json.load-ing the whole document, the file is scanned once through a
+# memory map for the byte span of every section and of every record in the
+# array sections, together with the record's id fields. String masking and
+# nesting depth are computed with NumPy over the raw bytes, so the scan never
+# builds Python objects for the records. The spans are kept in
+# a sidecar <file>.idx.json (rebuilt when the file's size or mtime change), so
+# later runs seek straight to a record and parse only that slice.
+#
+#   reader = ScenarioReader("fkfdsimulation.json")
+#   for inst in reader.iter_records("agentInstances"): ...
+#   agent = reader.get("agents", agentKey="AGENTKEY_228841409403277332")
+#
+#   python scenario_reader.py "../LaViC想定案例/fkfdsimulation.json" --section agents --field agentKey
+#   python scenario_reader.py "../LaViC想定案例/fkfdsimulation.json" --get agents agentKey=AGENTKEY_228841409403277332
+
+INDEX_SUFFIX = ".idx.json"
+INDEX_VERSION = 1
+
+# Top-level fields of a record that identify it, captured while scanning
+ID_FIELDS = ("agentKey", "agentId", "agentInstId", "patternSig", "simulationSig", "sig", "agentKeyword", "modelName")
+
+_SCALAR_RE = re.compile(rb'\s*("(?:[^"\\]|\\.)*"|-?[0-9][0-9.eE+-]*|true|false|null)', re.S)
+_ID_KEY_RE = re.compile(rb'"(' + b"|".join(f.encode() for f in ID_FIELDS) + rb')"\s*:', re.S)
+_KEY_END_RE = re.compile(rb'"\s*:\s*')
+
+
+def _structure(data):
+    """Vectorized pass: positions of real quotes and the depth after every byte"""
+    arr = np.frombuffer(data, dtype=np.uint8)
+    quotes = np.flatnonzero(arr == ord('"'))
+    # A quote preceded by an odd run of backslashes is inside a string
+    maybe = quotes[(quotes > 0) & (arr[np.maximum(quotes - 1, 0)] == ord('\\'))]
+    escaped = set()
+    for q in maybe.tolist():
+        run = 0
+        while q - run - 1 >= 0 and arr[q - run - 1] == ord('\\'):
+            run += 1
+        if run % 2:
+            escaped.add(q)
+    if escaped:
+        quotes = quotes[~np.isin(quotes, list(escaped))]
+
+    toggle = np.zeros(len(arr), dtype=np.uint8)
+    toggle[quotes] = 1
+    outside = np.bitwise_xor.accumulate(toggle) == 0
+    del toggle
+    step = np.zeros(len(arr), dtype=np.int8)
+    step[((arr == ord('{')) | (arr == ord('['))) & outside] = 1
+    step[((arr == ord('}')) | (arr == ord(']'))) & outside] = -1
+    del outside
+    depth = np.cumsum(step, dtype=np.int32)
+    opens = np.flatnonzero(step == 1)
+    closes = np.flatnonzero(step == -1)
+    return arr, quotes, depth, opens, closes
+
+
+def _key_before(data, quotes, pos):
+    """Name of the key whose value starts at pos"""
+    i = np.searchsorted(quotes, pos) - 1
+    return json.loads(bytes(data[quotes[i - 1]:quotes[i] + 1]).decode('utf-8'))
+
+
+def scan_export(path):
+    """One pass over the file. Returns the index dict (without validation fields)"""
+    elements = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        arr, quotes, depth, opens, closes = _structure(data)
+        # A single object (patterndata_*.json etc.) is read as a one-element export
+        base = 1 if len(opens) and arr[opens[0]] == ord('{') else 0
+        level_open = depth[opens] + base            # depth inside each opened bracket
+        level_close = depth[closes] + 1 + base      # depth that each close bracket ends
+
+        def spans(level):
+            return zip(opens[level_open == level].tolist(), (closes[level_close == level] + 1).tolist())
+
+        element_spans = list(spans(2))
+        section_spans = list(spans(3))
+        record_spans = list(spans(4))
+        record_starts = np.array([s for s, _ in record_spans], dtype=np.int64)
+
+        # Keys at the element level; the ones with scalar values are sections too
+        key_quotes = quotes[0::2][depth[quotes[0::2]] + base == 2]
+        for element_start, element_end in element_spans:
+            element = {"sections": {}, "records": {}}
+            for q in key_quotes[(key_quotes > element_start) & (key_quotes < element_end)].tolist():
+                key_end = _KEY_END_RE.match(data, int(quotes[np.searchsorted(quotes, q) + 1]))
+                if not key_end:
+                    continue
+                value = _SCALAR_RE.match(data, key_end.end())
+                if value and data[key_end.end():key_end.end() + 1] not in (b'{', b'['):
+                    name = json.loads(bytes(data[q:key_end.start() + 1]).decode('utf-8'))
+                    element["sections"][name] = [value.start(1), value.end(1)]
+            for start, end in section_spans:
+                if element_start < start < element_end:
+                    element["sections"][_key_before(data, quotes, start)] = [start, end]
+            element["sections"] = dict(sorted(element["sections"].items(), key=lambda item: item[1][0]))
+            elements.append(element)
+
+        # Records are the objects directly inside array sections
+        records = {}
+        for start, end in record_spans:
+            if arr[start] == ord('{'):
+                records[start] = [start, end, {}]
+        for element in elements:
+            for name, (start, end) in element["sections"].items():
+                if arr[start] == ord('['):
+                    for r in record_starts[(record_starts > start) & (record_starts < end)].tolist():
+                        if r in records:
+                            element["records"].setdefault(name, []).append(records[r])
+
+        # Id fields: keys named in ID_FIELDS sitting directly in a record
+        opening = quotes[0::2]
+        for m in _ID_KEY_RE.finditer(data):
+            pos = m.start()
+            k = np.searchsorted(opening, pos)
+            if depth[pos] + base != 4 or k == len(opening) or opening[k] != pos:
+                continue
+            i = np.searchsorted(record_starts, pos) - 1
+            record = records.get(int(record_starts[i])) if i >= 0 else None
+            value = _SCALAR_RE.match(data, m.end())
+            if record is not None and value and pos < record[1]:
+                record[2].setdefault(m.group(1).decode('utf-8'), json.loads(value.group(1)))
+        del arr
+    return {"version": INDEX_VERSION, "elements": elements}
+
+
+def _stat(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def load_index(path, rebuild=False, write=True):
+    """Sidecar index of path, rebuilt if missing or stale"""
+    index_path = path + INDEX_SUFFIX
+    stat = _stat(path)
+    if not rebuild and os.path.exists(index_path):
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION and index.get("source") == stat:
+                return index
+        except (OSError, ValueError):
+            pass
+    index = scan_export(path)
+    index["source"] = stat
+    if write:
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, index_path)
+    return index
+
+
+class ScenarioReader:
+    """Random access to the sections and records of one export file"""
+    def __init__(self, path, rebuild=False, write_index=True):
+        self.path = path
+        self.index = load_index(path, rebuild, write_index)
+        self._file = open(path, 'rb')
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read(self, start, end):
+        self._file.seek(start)
+        return json.loads(self._file.read(end - start).decode('utf-8'))
+
+    def _element(self, element):
+        elements = self.index["elements"]
+        if not 0 <= element < len(elements):
+            raise IndexError(f"{self.path} has {len(elements)} scenario(s)")
+        return elements[element]
+
+    def sections(self, element=0):
+        return list(self._element(element)["sections"])
+
+    def section(self, name, element=0):
+        """A whole section value (e.g. "simulation")"""
+        span = self._element(element)["sections"].get(name)
+        if span is None:
+            raise KeyError(f"section {name} not found")
+        return self._read(*span)
+
+    def records(self, section, element=0):
+        """[(start, end, ids)] of an array section, without reading the records"""
+        return self._element(element)["records"].get(section, [])
+
+    def iter_records(self, section, element=0, **match):
+        """Parse the records of a section one by one, optionally only those whose id fields match"""
+        for start, end, ids in self.records(section, element):
+            if all(ids.get(k) == v for k, v in match.items()):
+                yield self._read(start, end)
+
+    def get(self, section, element=0, **match):
+        """First record whose id fields match, or None"""
+        return next(self.iter_records(section, element, **match), None)
+
+    def get_agent(self, agent_key, element=0):
+        return self.get("agents", element, agentKey=agent_key)
+
+    def get_instance(self, agent_id, element=0):
+        return self.get("agentInstances", element, agentId=agent_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index and read LaViC scenario exports without loading them whole.")
+    parser.add_argument("file", help="Scenario export JSON")
+    parser.add_argument("--section", default=None, help="List the records of this section")
+    parser.add_argument("--field", default=None, help="Id field to show when listing (default: all captured)")
+    parser.add_argument("--get", nargs=2, metavar=("SECTION", "FIELD=VALUE"), default=None, help="Print one record")
+    parser.add_argument("--element", type=int, default=0, help="Scenario index within the export list")
+    parser.add_argument("--rebuild", action="store_true", help="Rescan even if the sidecar index is current")
+    args = parser.parse_args()
+
+    with ScenarioReader(args.file, args.rebuild) as reader:
+        if args.get:
+            section, condition = args.get
+            field, _, value = condition.partition("=")
+            record = reader.get(section, args.element, **{field: value})
+            if record is None:
+                print(f"No {section} record with {field}={value}")
+                sys.exit(1)
+            print(json.dumps(record, ensure_ascii=False, indent=2))
+        elif args.section:
+            for start, end, ids in reader.records(args.section, args.element):
+                shown = ids.get(args.field) if args.field else ", ".join(f"{k}={v}" for k, v in ids.items())
+                print(f"[{start}:{end}] {shown}")
+        else:
+            for element in range(len(reader.index["elements"])):
+                print(f"Scenario {element}:")
+                for name in reader.sections(element):
+                    count = len(reader.records(name, element))
+                    print(f"  {name}" + (f": {count} records" if count else ""))
@@ -0,0 +1,337 @@
+import os
+import re
+import sys
+import json
+import glob
+import fnmatch
+import hashlib
+import argparse
+
+# Static index and cross-check of the GaeaScript (ChaiScript) action scripts.
+#
+# Every script under script/ and every inline axnScript/oodaScript of the
+# agent data is scanned once for:
+#   calls      Agent.<method>(...)           the engine API it uses
+#   props      Agent.<member> reads           (targets, event, instance, ...)
+#   variables  Agent.variables["name"]       custom agent variables
+#   actions    Agent.action_do("Keyword")    actions it triggers
+#   inputs     free identifiers              must come from an inputVar binding
+# The result is cached in script/.index.json keyed by content hash, so only
+# edited scripts are rescanned.
+#
+# The check then walks doctrines -> handling agents -> axns -> scripts and
+# reports, in one pass:
+#   errors     action keyword missing on the handling agent,
+#              missing script file, unparsable inputVar, script inputs not bound
+#   warnings   bindings the script never reads,
+#              unknown $$ system variables, Agent.variables not declared in
+#              vardefs, action_do targets the agent does not define, filters
+#              matching no pattern agent
+# Doctrine owners no pattern defines (agentId, agentInstId or asmParentPath)
+# are only counted: they are usually sub-agents the engine creates.
+#
+#   python script_index.py                  # contents/ and script/ next to this file
+#   python script_index.py --json report.json
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_NAME = ".index.json"
+
+# $$ values the engine substitutes when a doctrine fires
+SYSTEM_VARS = {
+    "Self", "SelectedAgentId", "TargetFusionId",
+    "TargetFusionLocation_lon", "TargetFusionLocation_lat", "TargetFusionLocation_hgt",
+    "TargetFusionLocation_ref", "TargetFusionLocation_simtime",
+}
+
+KEYWORDS = {
+    "var", "auto", "fun", "def", "return", "if", "else", "while", "for", "break", "continue",
+    "true", "false", "try", "catch", "throw", "class", "attr", "global", "this",
+}
+
+_TOKEN_RE = re.compile(r'''
+    (?P<skip>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<str>"(?:[^"\\]|\\.)*")
+  | (?P<num>0[xX][0-9A-Fa-f]+|(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<op>\+\+|--|::|[^\sA-Za-z_0-9"])
+''', re.X | re.S)
+
+_ENUM_RE = re.compile(r"^E_[A-Z0-9_]+$")
+_BARE_SYSVAR_RE = re.compile(r'(?<!")\$\$(\w+)')
+
+
+def tokenize(source):
+    tokens = []
+    for m in _TOKEN_RE.finditer(source):
+        if m.lastgroup != "skip":
+            tokens.append((m.lastgroup, m.group()))
+    return tokens
+
+
+def analyze_script(source):
+    """Scan one script. Returns {calls, props, variables, actions, inputs, functions, declared}"""
+    tokens = tokenize(source)
+    calls, props, variables, actions = set(), set(), set(), set()
+    declared, functions, used = set(), set(), set()
+
+    def at(i, text):
+        return 0 <= i < len(tokens) and tokens[i][1] == text
+
+    i = 0
+    while i < len(tokens):
+        kind, text = tokens[i]
+        if kind != "name":
+            i += 1
+            continue
+        if text in ("var", "auto") and i + 1 < len(tokens) and tokens[i + 1][0] == "name":
+            declared.add(tokens[i + 1][1])
+        elif text in ("fun", "def"):
+            # def name(a, b) / fun(a, b): parameters are locals
+            j = i + 1
+            if text == "def" and j < len(tokens) and tokens[j][0] == "name":
+                declared.add(tokens[j][1])
+                j += 1
+            if at(j, "("):
+                j += 1
+                while j < len(tokens) and not at(j, ")"):
+                    if tokens[j][0] == "name":
+                        declared.add(tokens[j][1])
+                    j += 1
+                i = j
+        elif text == "Agent" and at(i + 1, ".") and i + 2 < len(tokens):
+            member = tokens[i + 2][1]
+            if at(i + 3, "("):
+                calls.add(member)
+                if member == "action_do" and i + 4 < len(tokens) and tokens[i + 4][0] == "str":
+                    actions.add(tokens[i + 4][1][1:-1])
+            elif member == "variables" and at(i + 3, "[") and i + 4 < len(tokens) and tokens[i + 4][0] == "str":
+                variables.add(tokens[i + 4][1][1:-1])
+            else:
+                props.add(member)
+            i += 3
+            continue
+        elif not at(i - 1, ".") and text not in KEYWORDS and text != "Agent" and not _ENUM_RE.match(text):
+            if at(i + 1, "("):
+                functions.add(text)
+            else:
+                used.add(text)
+        i += 1
+
+    return {
+        "calls": sorted(calls),
+        "props": sorted(props),
+        "variables": sorted(variables),
+        "actions": sorted(actions),
+        "inputs": sorted(used - declared - functions),
+        "functions": sorted(functions - declared),
+        "declared": sorted(declared),
+    }
+
+
+def _sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def build_index(script_dir, use_cache=True):
+    """Index script/*.json by stem. Unchanged scripts come from the cache"""
+    index_path = os.path.join(script_dir, INDEX_NAME)
+    cached = {}
+    if use_cache and os.path.exists(index_path):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+
+    index = {}
+    for path in sorted(glob.glob(os.path.join(script_dir, "*.json"))):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            source = f.read()
+        sha = _sha256(source)
+        entry = cached.get(stem)
+        if not entry or entry.get("sha256") != sha:
+            entry = dict(analyze_script(source), sha256=sha)
+        index[stem] = entry
+
+    if use_cache and index != cached:
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, index_path)
+    return index
+
+
+def pattern_agent_ids(pattern_agents):
+    """Every agent id a pattern defines: agents, their instances and the assembly parents above them"""
+    ids = set()
+    for a in pattern_agents:
+        ids.update((a.get("agentId"), a.get("agentInstId")))
+        ids.update((a.get("asmParentPath") or "").split("/"))
+    return ids - {"", None}
+
+
+def load_contents(contents_dir):
+    """Agent definitions by agentKey, pattern agents by agentId and the doctrines"""
+    agents, pattern_agents, doctrines = {}, {}, []
+    for path in sorted(glob.glob(os.path.join(contents_dir, "*.json"))):
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            continue
+        name = os.path.basename(path)
+        for a in data.get("agents", []):
+            agents[a.get("agentKey")] = dict(a, _file=name)
+        for p in data.get("patternAgents", []):
+            pattern_agents[p.get("agentId")] = dict(p, _file=name)
+        for d in data.get("doctrines", []):
+            doctrines.append(dict(d, _file=name))
+    return agents, pattern_agents, doctrines
+
+
+def resolve_script(lines, index, inline_cache):
+    """axnScript/oodaScript lines -> (label, index entry or None)
+
+    A single .chai path refers to script/<stem>.json; anything else is inline code.
+    """
+    if not lines:
+        return None, None
+    if len(lines) == 1 and lines[0].strip().lower().endswith(".chai"):
+        stem = os.path.splitext(os.path.basename(lines[0].strip().replace("\\", "/")))[0]
+        return f"script/{stem}.json", index.get(stem)
+    source = "\n".join(lines)
+    sha = _sha256(source)
+    if sha not in inline_cache:
+        inline_cache[sha] = dict(analyze_script(source), sha256=sha)
+    return "inline", inline_cache[sha]
+
+
+def parse_input_var(text):
+    """inputVar is JSON except that $$ values may be unquoted"""
+    if not text:
+        return {}
+    if isinstance(text, dict):
+        return text
+    return json.loads(_BARE_SYSVAR_RE.sub(r'"$$\1"', text))
+
+
+def _handling_agents(subject, owner, filters, pattern_agents):
+    if subject == "$$Self":
+        return [owner] if owner else []
+    if subject == "$$SelectedAgentId":
+        return [p for p in pattern_agents.values()
+                if any(fnmatch.fnmatchcase(p.get("agentLabel") or "", f) for f in filters or ["*"])]
+    target = pattern_agents.get(subject)
+    return [target] if target else []
+
+
+def check_contents(contents_dir, script_dir, use_cache=True):
+    """Cross-check doctrines and agent scripts. Returns (errors, warnings, index, owners not in any pattern)"""
+    index = build_index(script_dir, use_cache)
+    agents, pattern_agents, doctrines = load_contents(contents_dir)
+    errors, warnings = [], []
+    inline_cache = {}
+    known_ids = pattern_agent_ids(pattern_agents.values())
+    owners = set()
+
+    # Pattern agents must point at an agent definition of the bundle
+    for p in pattern_agents.values():
+        if p.get("agentKey") not in agents:
+            warnings.append(f"{p['_file']}: pattern agent {p.get('agentId')} uses agentKey {p.get('agentKey')} "
+                            f"not defined in contents")
+
+    # Every script an agent carries: declared variables and triggered actions must exist on it
+    for a in agents.values():
+        var_keys = {v.get("varKeyword") for v in a.get("vardefs") or []}
+        axn_keys = {x.get("axnKeyword") for x in a.get("axns") or []}
+        scripts = [(x.get("axnKeyword"), x.get("axnScript")) for x in a.get("axns") or []]
+        scripts += [(f"ooda[{i}]", o.get("oodaScript")) for i, o in enumerate(a.get("oodas") or [])]
+        where = f"{a['_file']}: {a.get('agentKeyword')}"
+        for label, lines in scripts:
+            source, entry = resolve_script(lines, index, inline_cache)
+            if source is None:
+                continue
+            if entry is None:
+                errors.append(f"{where}.{label}: script {source} not found")
+                continue
+            for name in sorted(set(entry["variables"]) - var_keys):
+                warnings.append(f"{where}.{label}: Agent.variables[\"{name}\"] not in vardefs")
+            for action in sorted(set(entry["actions"]) - axn_keys):
+                warnings.append(f"{where}.{label}: action_do(\"{action}\") not defined on this agent")
+
+    for d in doctrines:
+        where = f"{d['_file']}: {d.get('doctKeyword')} ({d.get('doctOwnerAgentId')})"
+        owner = pattern_agents.get(d.get("doctOwnerAgentId"))
+        if d.get("doctOwnerAgentId") and d.get("doctOwnerAgentId") not in known_ids:
+            owners.add(d.get("doctOwnerAgentId"))
+        for action in d.get("doctActions", []):
+            filters = action.get("handlingAgentFileters") or []
+            if filters and not any(fnmatch.fnmatchcase(p.get("agentLabel") or "", f)
+                                   for p in pattern_agents.values() for f in filters):
+                warnings.append(f"{where}: handlingAgentFileters {filters} match no pattern agent")
+
+            for h in action.get("handlingAgentActions", []):
+                keyword = h.get("keyword")
+                try:
+                    bindings = parse_input_var(h.get("inputVar"))
+                except json.JSONDecodeError as e:
+                    errors.append(f"{where}.{keyword}: invalid inputVar ({e})")
+                    continue
+                for value in bindings.values():
+                    if isinstance(value, str) and value.startswith("$$") and value[2:] not in SYSTEM_VARS:
+                        warnings.append(f"{where}.{keyword}: unknown system variable {value}")
+
+                subject = h.get("subject")
+                if isinstance(subject, str) and subject.startswith("$$") and subject[2:] not in SYSTEM_VARS:
+                    warnings.append(f"{where}.{keyword}: unknown subject {subject}")
+
+                checked = set()
+                for p in _handling_agents(subject, owner, filters, pattern_agents):
+                    agent = agents.get(p.get("agentKey"))
+                    if agent is None or p.get("agentKey") in checked:
+                        continue
+                    checked.add(p.get("agentKey"))
+                    axn = next((x for x in agent.get("axns") or [] if x.get("axnKeyword") == keyword), None)
+                    if axn is None:
+                        errors.append(f"{where}: action {keyword} not defined on {agent.get('agentKeyword')}")
+                        continue
+                    source, entry = resolve_script(axn.get("axnScript"), index, inline_cache)
+                    if entry is None:
+                        # Missing files are reported with the agent above; empty scripts are engine built-ins
+                        continue
+                    unbound = sorted(set(entry["inputs"]) - set(bindings))
+                    if unbound:
+                        errors.append(f"{where}.{keyword} on {agent.get('agentKeyword')} ({source}): "
+                                      f"unbound {', '.join(unbound)}")
+                    unused = sorted(set(bindings) - set(entry["inputs"]))
+                    if unused:
+                        warnings.append(f"{where}.{keyword} on {agent.get('agentKeyword')} ({source}): "
+                                        f"binding {', '.join(unused)} never read")
+    return errors, warnings, index, owners
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index GaeaScript action scripts and cross-check doctrine references.")
+    parser.add_argument("--contents", default=os.path.join(BASE_DIR, "contents"), help="Scenario content directory")
+    parser.add_argument("--scripts", default=os.path.join(BASE_DIR, "script"), help="Script directory")
+    parser.add_argument("--no-cache", action="store_true", help="Rescan every script and do not write the index")
+    parser.add_argument("--api", action="store_true", help="List the Agent API used by each script")
+    parser.add_argument("--json", default=None, help="Also write the report to this file")
+    args = parser.parse_args()
+
+    errors, warnings, index, owners = check_contents(args.contents, args.scripts, not args.no_cache)
+
+    if args.api:
+        for stem, entry in index.items():
+            print(f"{stem}: {', '.join('Agent.' + c for c in entry['calls']) or '-'}"
+                  + (f" | inputs: {', '.join(entry['inputs'])}" if entry["inputs"] else ""))
+    for w in warnings:
+        print(f"[WARN] {w}")
+    for e in errors:
+        print(f"[ERROR] {e}")
+    if owners:
+        print(f"{len(owners)} doctrine owners are not in any pattern, assumed to exist on the engine")
+    print(f"{len(index)} scripts indexed, {len(errors)} errors, {len(warnings)} warnings")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"errors": errors, "warnings": warnings, "owners_not_in_patterns": sorted(owners),
+                       "index": index}, f, ensure_ascii=False, indent=2)
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,268 @@
+import os
+import re
+import sys
+import json
+import difflib
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# Declarative rewrite engine for model package agent.json files.
+#
+# A rule is {"path": ..., "value": ..., "create": false}. Paths use a small
+# JSONPath-style syntax evaluated against every agent in the file:
+#   model.thumbnail.url                      plain keys
+#   model.dimModelUrls[*].url                every list item
+#   modelUrlSymbols[0].thumbnail             list index
+#   modelUrlSymbols[?symbolSeries==2].x      list items whose key equals a JSON literal
+# String values are templates, "{name}" is the package directory name.
+# By default only existing keys are overwritten; "create": true also adds the
+# final key when its parent object exists. "keep" lists templates of values
+# that are left alone, e.g. the package's own LOD URLs written by
+# gen_lod_models.py.
+
+# URLs of the package's own LOD GLBs (gen_lod_models.py)
+LOD_URLS = [f"{{name}}/{{name}}_AI_Rodin_{level}.glb" for level in ("slim", "medium", "fat")]
+
+# Same fields fix_agent_json used to patch by hand
+DEFAULT_RULES = [
+    {"path": "model.modelName", "value": "{name}", "create": True},
+    {"path": "model.thumbnail.url", "value": "{name}/{name}.png"},
+    {"path": "model.thumbnail.ossSig", "value": "{name}.png"},
+    {"path": "model.mapIconUrl.url", "value": "{name}/{name}_mil.png"},
+    {"path": "model.mapIconUrl.ossSig", "value": "{name}_mil.png"},
+    {"path": "model.dimModelUrls[*].url", "value": "{name}/{name}_AI_Rodin.glb"},
+    {"path": "model.dimModelUrls[*].ossSig", "value": "{name}_AI_Rodin.glb"},
+    {"path": "modelUrlSlim", "value": "{name}/{name}_AI_Rodin.glb", "keep": LOD_URLS},
+    {"path": "modelUrlMedium", "value": "{name}/{name}_AI_Rodin.glb", "keep": LOD_URLS},
+    {"path": "modelUrlFat", "value": "{name}/{name}_AI_Rodin.glb", "keep": LOD_URLS},
+    {"path": "modelUrlSymbols[?symbolSeries==1].symbolName", "value": "{name}/{name}.png"},
+    {"path": "modelUrlSymbols[?symbolSeries==1].thumbnail", "value": "{name}/{name}.png"},
+    {"path": "modelUrlSymbols[?symbolSeries==2].symbolName", "value": "{name}/{name}_mil.png"},
+    {"path": "modelUrlSymbols[?symbolSeries==2].thumbnail", "value": "{name}/{name}_mil.png"},
+]
+
+_TOKEN_RE = re.compile(r'\.?([^.\[\]]+)|\[(\*|\d+|\?[^\]]+)\]')
+_MISSING = object()
+
+
+def compile_path(path):
+    """Compile a path string into a tuple of steps: ('key', k), ('index', i), ('all',), ('filter', k, v)."""
+    steps = []
+    pos = 0
+    for m in _TOKEN_RE.finditer(path):
+        if m.start() != pos:
+            raise ValueError(f"Invalid path syntax at offset {pos}: {path}")
+        pos = m.end()
+        key, bracket = m.groups()
+        if key is not None:
+            steps.append(("key", key))
+        elif bracket == "*":
+            steps.append(("all",))
+        elif bracket.isdigit():
+            steps.append(("index", int(bracket)))
+        else:
+            expr = bracket[1:]
+            if "==" not in expr:
+                raise ValueError(f"Filter must be [?key==value]: {path}")
+            f_key, f_val = expr.split("==", 1)
+            try:
+                f_val = json.loads(f_val.strip())
+            except json.JSONDecodeError:
+                f_val = f_val.strip()
+            steps.append(("filter", f_key.strip(), f_val))
+    if pos != len(path) or not steps:
+        raise ValueError(f"Invalid path syntax: {path}")
+    if steps[-1][0] not in ("key", "index"):
+        raise ValueError(f"Path must end with a key or index: {path}")
+    return tuple(steps)
+
+
+def compile_rules(rules):
+    """Compile rule dicts once so they can be shipped to many workers."""
+    compiled = []
+    for rule in rules:
+        compiled.append((rule["path"], compile_path(rule["path"]), rule["value"],
+                         bool(rule.get("create", False)), tuple(rule.get("keep", ()))))
+    return compiled
+
+
+def _iter_children(node, step):
+    kind = step[0]
+    if kind == "key":
+        if isinstance(node, dict):
+            child = node.get(step[1])
+            if child is not None:
+                yield child
+    elif kind == "index":
+        if isinstance(node, list) and -len(node) <= step[1] < len(node):
+            yield node[step[1]]
+    elif kind == "all":
+        if isinstance(node, list):
+            yield from node
+    elif kind == "filter":
+        if isinstance(node, list):
+            for item in node:
+                if isinstance(item, dict) and item.get(step[1], _MISSING) == step[2]:
+                    yield item
+
+
+def _iter_targets(node, steps):
+    """Yield the parent containers addressed by all but the last step."""
+    if not steps:
+        yield node
+        return
+    for child in _iter_children(node, steps[0]):
+        yield from _iter_targets(child, steps[1:])
+
+
+def _render(value, context):
+    if isinstance(value, str):
+        return value.format_map(context)
+    return value
+
+
+def apply_rules(agent, compiled_rules, context):
+    """Apply compiled rules to one agent dict in place. Returns [(path, old, new), ...] of real changes."""
+    changes = []
+    for path_str, steps, value, create, keep in compiled_rules:
+        new = _render(value, context)
+        kept = {_render(k, context) for k in keep}
+        last = steps[-1]
+        for parent in _iter_targets(agent, steps[:-1]):
+            if last[0] == "key":
+                if not isinstance(parent, dict):
+                    continue
+                old = parent.get(last[1], _MISSING)
+                if old is _MISSING and not create:
+                    continue
+                if old in kept:
+                    continue
+                if old != new:
+                    parent[last[1]] = new
+                    changes.append((path_str, None if old is _MISSING else old, new))
+            else:
+                if not isinstance(parent, list) or not -len(parent) <= last[1] < len(parent):
+                    continue
+                old = parent[last[1]]
+                if old in kept:
+                    continue
+                if old != new:
+                    parent[last[1]] = new
+                    changes.append((path_str, old, new))
+    return changes
+
+
+def _detect_indent(text):
+    for line in text.splitlines()[1:]:
+        stripped = line.lstrip(" ")
+        if stripped and len(stripped) != len(line):
+            return len(line) - len(stripped)
+    return 2
+
+
+def atomic_write(path, text):
+    """Write text next to path and rename over it so readers never see a partial file."""
+    dir_name = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=dir_name)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def rewrite_file(json_path, compiled_rules, context, dry_run=False):
+    """Rewrite one agent.json. The file is only touched when the rules produce a real diff."""
+    result = {"path": json_path, "changed": False, "changes": [], "diff": "", "error": None}
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            original = f.read()
+        data = json.loads(original)
+
+        agents = data if isinstance(data, list) else [data]
+        for agent in agents:
+            if isinstance(agent, dict):
+                result["changes"].extend(apply_rules(agent, compiled_rules, context))
+
+        if not result["changes"]:
+            return result
+
+        result["changed"] = True
+        updated = json.dumps(data, indent=_detect_indent(original), ensure_ascii=False)
+        if original.endswith("\n"):
+            updated += "\n"
+
+        if dry_run:
+            result["diff"] = "".join(difflib.unified_diff(
+                original.splitlines(True), updated.splitlines(True),
+                fromfile=json_path, tofile=json_path + " (rewritten)"))
+        else:
+            atomic_write(json_path, updated)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def _rewrite_job(job):
+    json_path, compiled_rules, context, dry_run = job
+    return rewrite_file(json_path, compiled_rules, context, dry_run)
+
+
+def find_agent_jsons(models_dir):
+    """Return (agent.json path, package name) for every package directory."""
+    jobs = []
+    for d in sorted(os.listdir(models_dir)):
+        json_path = os.path.join(models_dir, d, "agent.json")
+        if d != "assets" and os.path.isfile(json_path):
+            jobs.append((json_path, d))
+    return jobs
+
+
+def rewrite_library(models_dir, rules=None, dry_run=False, workers=None):
+    """Apply a rule set to every package agent.json under models_dir in a process pool."""
+    compiled = compile_rules(rules if rules is not None else DEFAULT_RULES)
+    jobs = [(path, compiled, {"name": name}, dry_run) for path, name in find_agent_jsons(models_dir)]
+    if not jobs:
+        return []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_rewrite_job, jobs, chunksize=4))
+
+
+if __name__ == "__main__":
+    default_models = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+    parser = argparse.ArgumentParser(description="Apply declarative rewrite rules to every model package agent.json.")
+    parser.add_argument("--models-dir", default=default_models, help="Directory containing the model package folders")
+    parser.add_argument("--rules", default=None, help="JSON file with a list of {path, value, create, keep} rules (default: built-in rules)")
+    parser.add_argument("--dry-run", action="store_true", help="Print unified diffs instead of writing")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+
+    args = parser.parse_args()
+
+    rules = None
+    if args.rules:
+        with open(args.rules, 'r', encoding='utf-8') as f:
+            rules = json.load(f)
+
+    results = rewrite_library(args.models_dir, rules, args.dry_run, args.workers)
+
+    errors = 0
+    for r in results:
+        if r["error"]:
+            errors += 1
+            print(f"Failed to process {r['path']}: {r['error']}")
+        elif r["changed"]:
+            action = "Would update" if args.dry_run else "Updated"
+            print(f"{action} {r['path']} ({len(r['changes'])} fields)")
+            if r["diff"]:
+                print(r["diff"])
+
+    changed = sum(1 for r in results if r["changed"])
+    print(f"{changed}/{len(results)} files changed, {errors} errors")
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,468 @@
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import tempfile
+import subprocess
+
+# Headless batch GLB processing with Blender in background mode.
+#
+# Run with plain Python, this is the driver: it reads a manifest, splits the
+# models over N background Blender processes (largest files first, each to
+# the least loaded worker) and collects their reports:
+#
+#   python blender_glb_worker.py manifest.json --workers 4 --blender "C:/Program Files/Blender/blender.exe"
+#
+# Each worker is `blender -b --factory-startup -P blender_glb_worker.py -- --worker job.json`.
+# It starts from an empty factory scene and only uses operators where there
+# is no data-API equivalent (glTF import/export). Rotation, transform apply
+# and decimation work on matrices and evaluated meshes directly, and every
+# datablock created by an import is removed before the next model.
+#
+# Manifest:
+#   {
+#     "models_dir": "../models",                       optional, for package names
+#     "operations": [                                  default chain for every model
+#       {"op": "rotate", "axis": "X", "degrees": -90},
+#       {"op": "apply_transforms", "location": false, "rotation": true, "scale": false},
+#       {"op": "decimate", "ratio": 0.5} | {"op": "decimate", "target_faces": 20000},
+#       {"op": "export", "output": "{dir}/{stem}_out.glb"},
+#       {"op": "thumbnail", "views": ["iso", "side"], "resolution": 1024}
+#     ],
+#     "models": [
+#       "F-22_Raptor",                                   package -> {name}/{name}/{name}_AI_Rodin.glb
+#       "path/to/file.glb",
+#       {"input": "path/to/file.glb", "operations": [...]}
+#     ]
+#   }
+# Without an explicit "export" the chain ends with an in-place re-export,
+# unless it only contains read-only operations (thumbnail).
+
+try:
+    import bpy
+    import mathutils
+except ImportError:
+    bpy = None
+
+AXES = {"X": (1, 0, 0), "Y": (0, 1, 0), "Z": (0, 0, 1)}
+
+# Thumbnail views as (azimuth, elevation) in degrees and file suffix. glTF +Z
+# (model front) imports as Blender -Y, azimuth 0 looks at the front.
+VIEWS = {
+    "iso": (-45.0, 30.0, ""),
+    "front": (0.0, 0.0, "_front"),
+    "side": (-90.0, 0.0, "_side"),
+    "top": (0.0, 90.0, "_top")
+}
+STUDIO_GREY = (0.42, 0.42, 0.42)
+
+# Operations that leave the model untouched, a chain of only these is not re-exported
+READ_ONLY_OPERATIONS = {"thumbnail"}
+
+# Datablock types an import can create; anything new is removed after each model
+ID_COLLECTIONS = [
+    "objects", "meshes", "materials", "images", "textures", "node_groups", "collections",
+    "cameras", "lights", "actions", "armatures", "curves", "worlds"
+]
+
+
+# ---------------------------------------------------------------------------
+# Manifest handling (plain Python)
+# ---------------------------------------------------------------------------
+
+def default_models_dir():
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+
+def resolve_models(manifest, base_dir):
+    """Expand manifest models into [{input, operations}] with absolute paths"""
+    models_dir = manifest.get("models_dir") or default_models_dir()
+    if not os.path.isabs(models_dir):
+        models_dir = os.path.normpath(os.path.join(base_dir, models_dir))
+    default_ops = manifest.get("operations", [])
+
+    items = []
+    for entry in manifest.get("models", []):
+        if isinstance(entry, str):
+            entry = {"input": entry}
+        path = entry["input"]
+        if not path.lower().endswith(".glb"):
+            path = os.path.join(models_dir, path, path, f"{path}_AI_Rodin.glb")
+        elif not os.path.isabs(path):
+            path = os.path.normpath(os.path.join(base_dir, path))
+        items.append({"input": path, "operations": entry.get("operations", default_ops)})
+    return items
+
+
+def plan_jobs(items, workers):
+    """Split items over workers by file size, largest first, each to the least loaded worker"""
+    def size(item):
+        try:
+            return os.path.getsize(item["input"])
+        except OSError:
+            return 0
+
+    jobs = [[] for _ in range(max(1, min(workers, len(items))))]
+    loads = [0] * len(jobs)
+    for item in sorted(items, key=size, reverse=True):
+        idx = loads.index(min(loads))
+        jobs[idx].append(item)
+        loads[idx] += size(item)
+    return [job for job in jobs if job]
+
+
+def run_manifest(manifest, base_dir, blender="blender", workers=None, timeout=None):
+    """Process every model of a manifest with a pool of background Blender processes. Returns item reports"""
+    items = resolve_models(manifest, base_dir)
+    if not items:
+        return []
+    jobs = plan_jobs(items, workers or os.cpu_count() or 1)
+
+    work_dir = tempfile.mkdtemp(prefix="glb_worker_")
+    procs = []
+    for idx, job in enumerate(jobs):
+        job_path = os.path.join(work_dir, f"job_{idx}.json")
+        report_path = os.path.join(work_dir, f"report_{idx}.json")
+        log_path = os.path.join(work_dir, f"worker_{idx}.log")
+        with open(job_path, 'w', encoding='utf-8') as f:
+            json.dump({"items": job, "report": report_path}, f, ensure_ascii=False)
+        cmd = [blender, "-b", "--factory-startup", "-noaudio", "-P", os.path.abspath(__file__), "--", "--worker", job_path]
+        log = open(log_path, 'w', encoding='utf-8', errors='replace')
+        print(f"Worker {idx}: {len(job)} models")
+        procs.append((idx, job, report_path, log_path, log, subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)))
+
+    reports = []
+    for idx, job, report_path, log_path, log, proc in procs:
+        try:
+            code = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            code = "timeout"
+        log.close()
+
+        done = []
+        if os.path.exists(report_path):
+            with open(report_path, 'r', encoding='utf-8') as f:
+                done = json.load(f)
+        reports.extend(done)
+
+        # Items the worker never reported were lost with the process
+        finished = {r["input"] for r in done}
+        for item in job:
+            if item["input"] not in finished:
+                reports.append({"input": item["input"], "ok": False,
+                                "error": f"worker {idx} exited ({code}) before finishing, see {log_path}"})
+    return reports
+
+
+# ---------------------------------------------------------------------------
+# Worker side (inside Blender)
+# ---------------------------------------------------------------------------
+
+def _snapshot():
+    return {name: {block.as_pointer() for block in getattr(bpy.data, name)} for name in ID_COLLECTIONS}
+
+
+def clear_new_data(before):
+    """Remove every datablock created since the snapshot. Returns how many survived (leaks)"""
+    new_ids = []
+    for name in ID_COLLECTIONS:
+        new_ids.extend(b for b in getattr(bpy.data, name) if b.as_pointer() not in before[name])
+    bpy.data.batch_remove(new_ids)
+    if hasattr(bpy.data, "orphans_purge"):
+        bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+    return sum(1 for name in ID_COLLECTIONS for b in getattr(bpy.data, name) if b.as_pointer() not in before[name])
+
+
+def _depth(obj):
+    depth = 0
+    while obj.parent is not None:
+        obj = obj.parent
+        depth += 1
+    return depth
+
+
+def count_triangles(objects):
+    total = 0
+    for obj in objects:
+        if obj.type == 'MESH':
+            obj.data.calc_loop_triangles()
+            total += len(obj.data.loop_triangles)
+    return total
+
+
+def op_rotate(objects, axis="X", degrees=-90.0):
+    """Rotate the model about a global axis through the origin"""
+    rot = mathutils.Matrix.Rotation(math.radians(degrees), 4, mathutils.Vector(AXES[axis.upper()]))
+    for obj in objects:
+        if obj.parent is None:
+            obj.matrix_world = rot @ obj.matrix_world
+    bpy.context.view_layer.update()
+
+
+def op_apply_transforms(objects, location=True, rotation=True, scale=True):
+    """Bake the selected parts of each object's world matrix into its mesh, keeping the hierarchy"""
+    bpy.context.view_layer.update()
+    worlds = {obj.as_pointer(): obj.matrix_world.copy() for obj in objects}
+    for obj in sorted(objects, key=_depth):
+        world = worlds[obj.as_pointer()]
+        loc, rot, sca = world.decompose()
+        kept = mathutils.Matrix.Identity(4)
+        if not location:
+            kept = mathutils.Matrix.Translation(loc)
+        if not rotation:
+            kept = kept @ rot.to_matrix().to_4x4()
+        if not scale:
+            kept = kept @ mathutils.Matrix.Diagonal(sca).to_4x4()
+
+        if obj.type == 'MESH' and obj.data is not None:
+            if obj.data.users > 1:
+                obj.data = obj.data.copy()
+            obj.data.transform(kept.inverted() @ world, shape_keys=True)
+        # Parents are handled first, so the child's local matrix is solved against the new parent
+        obj.matrix_world = kept
+    bpy.context.view_layer.update()
+
+
+def op_decimate(objects, ratio=None, target_faces=None):
+    """Collapse-decimate meshes by ratio, or share a triangle budget in proportion to mesh size"""
+    meshes = [obj for obj in objects if obj.type == 'MESH' and obj.data is not None]
+    if target_faces is not None:
+        total = count_triangles(meshes)
+        ratio = target_faces / float(total) if total else 1.0
+    if ratio is None or ratio >= 1.0:
+        return
+
+    for obj in meshes:
+        mod = obj.modifiers.new(name="BatchDecimate", type='DECIMATE')
+        mod.ratio = max(ratio, 0.0001)
+        mod.use_collapse_triangulate = True
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    for obj in meshes:
+        # Bake the evaluated mesh instead of modifier_apply, which needs an active object context
+        new_mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph), preserve_all_data_layers=True,
+                                                   depsgraph=depsgraph)
+        old_mesh = obj.data
+        obj.modifiers.clear()
+        obj.data = new_mesh
+        if old_mesh.users == 0:
+            bpy.data.meshes.remove(old_mesh)
+
+
+def op_export(objects, input_path, output=None, **export_args):
+    """Export the whole (single-model) scene as GLB. output may use {dir}, {stem} and {name}"""
+    out_path = input_path
+    if output:
+        stem = os.path.splitext(os.path.basename(input_path))[0]
+        out_path = output.format(dir=os.path.dirname(input_path), stem=stem, name=stem.replace("_AI_Rodin", ""))
+    out_dir = os.path.dirname(out_path)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+    bpy.ops.export_scene.gltf(filepath=out_path, export_format='GLB', use_selection=False, **export_args)
+    return out_path
+
+
+def _frame_bounds(objects):
+    """Bounding sphere (center, radius) of the model's world-space bounding boxes"""
+    meshes = [obj for obj in objects if obj.type == 'MESH'] or objects
+    corners = [obj.matrix_world @ mathutils.Vector(c) for obj in meshes for c in obj.bound_box]
+    lo = mathutils.Vector((min(c.x for c in corners), min(c.y for c in corners), min(c.z for c in corners)))
+    hi = mathutils.Vector((max(c.x for c in corners), max(c.y for c in corners), max(c.z for c in corners)))
+    return (lo + hi) / 2, max((hi - lo).length / 2, 1e-4)
+
+
+def _setup_stage(scene, engine, resolution, transparent):
+    """Camera, light and a flat studio-grey world for thumbnail renders"""
+    world = bpy.data.worlds.new("ThumbnailWorld")
+    world.color = STUDIO_GREY
+    world.use_nodes = True
+    background = world.node_tree.nodes.get("Background")
+    if background is not None:
+        background.inputs["Color"].default_value = (*STUDIO_GREY, 1.0)
+        background.inputs["Strength"].default_value = 1.0
+    scene.world = world
+
+    camera = bpy.data.objects.new("ThumbnailCamera", bpy.data.cameras.new("ThumbnailCamera"))
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+
+    sun = bpy.data.objects.new("ThumbnailSun", bpy.data.lights.new("ThumbnailSun", type='SUN'))
+    sun.data.energy = 3.0
+    sun.rotation_euler = (math.radians(50), 0, math.radians(-30))
+    scene.collection.objects.link(sun)
+
+    if engine.upper() == "EEVEE":
+        # Renamed BLENDER_EEVEE_NEXT in 4.2 and back again in 5.0
+        items = {item.identifier for item in scene.render.bl_rna.properties["engine"].enum_items}
+        scene.render.engine = "BLENDER_EEVEE_NEXT" if "BLENDER_EEVEE_NEXT" in items else "BLENDER_EEVEE"
+    else:
+        scene.render.engine = "BLENDER_WORKBENCH"
+        shading = scene.display.shading
+        shading.light = 'STUDIO'
+        shading.color_type = 'TEXTURE'
+        shading.show_shadows = True
+        shading.show_cavity = True
+
+    scene.render.resolution_x = resolution
+    scene.render.resolution_y = resolution
+    scene.render.resolution_percentage = 100
+    scene.render.film_transparent = transparent
+    scene.render.image_settings.file_format = 'PNG'
+    scene.render.image_settings.color_mode = 'RGBA' if transparent else 'RGB'
+    scene.view_settings.view_transform = 'Standard'
+    return camera
+
+
+def op_thumbnail(objects, input_path, views=("iso",), resolution=1024, engine="workbench", margin=1.1,
+                 transparent=False, output="{dir}/{name}{suffix}.png"):
+    """Render auto-framed studio thumbnails. The iso view is written as {name}.png, others get a suffix"""
+    scene = bpy.context.scene
+    bpy.context.view_layer.update()
+    camera = _setup_stage(scene, engine, resolution, transparent)
+    center, radius = _frame_bounds(objects)
+
+    # Distance at which the bounding sphere fits the (square) field of view
+    fov = min(camera.data.angle_x, camera.data.angle_y)
+    distance = radius * margin / math.sin(fov / 2)
+    camera.data.clip_start = max(distance - radius * 2, distance * 0.001)
+    camera.data.clip_end = distance + radius * 2
+
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    written = []
+    for view in views:
+        if view not in VIEWS:
+            raise ValueError(f"Unknown view: {view} (available: {', '.join(VIEWS)})")
+        azimuth, elevation, suffix = VIEWS[view]
+        az, el = math.radians(azimuth), math.radians(elevation)
+        direction = mathutils.Vector((math.sin(az) * math.cos(el), -math.cos(az) * math.cos(el), math.sin(el)))
+        camera.location = center + direction * distance
+        # Straight down has no usable up vector for the track, so the top view is built directly
+        if elevation >= 89.9:
+            camera.rotation_euler = (0.0, 0.0, az)
+        else:
+            camera.rotation_euler = (-direction).to_track_quat('-Z', 'Y').to_euler()
+
+        out_path = output.format(dir=os.path.dirname(input_path), stem=stem, name=stem.replace("_AI_Rodin", ""),
+                                 view=view, suffix=suffix)
+        out_dir = os.path.dirname(out_path)
+        if out_dir and not os.path.exists(out_dir):
+            os.makedirs(out_dir)
+        scene.render.filepath = out_path
+        bpy.ops.render.render(write_still=True)
+        written.append(out_path)
+    return written
+
+
+OPERATIONS = {
+    "rotate": op_rotate,
+    "apply_transforms": op_apply_transforms,
+    "decimate": op_decimate,
+}
+
+
+def process_item(item):
+    """Import one GLB, run its operation chain and re-export. Returns a report dict"""
+    report = {"input": item["input"], "ok": False, "error": None}
+    start = time.perf_counter()
+    if not os.path.exists(item["input"]):
+        report["error"] = "file not found"
+        return report
+
+    ops = list(item["operations"])
+    modifies = any(op.get("op") not in READ_ONLY_OPERATIONS for op in ops)
+    if modifies and not any(op.get("op") == "export" for op in ops):
+        ops.append({"op": "export"})
+
+    before = _snapshot()
+    try:
+        bpy.ops.import_scene.gltf(filepath=item["input"])
+        objects = [obj for obj in bpy.data.objects if obj.as_pointer() not in before["objects"]]
+        if not objects:
+            raise RuntimeError("no objects imported")
+        report["triangles_before"] = count_triangles(objects)
+
+        for op in ops:
+            params = {k: v for k, v in op.items() if k != "op"}
+            if op.get("op") == "export":
+                report["output"] = op_export(objects, item["input"], **params)
+            elif op.get("op") == "thumbnail":
+                report.setdefault("thumbnails", []).extend(op_thumbnail(objects, item["input"], **params))
+            elif op.get("op") in OPERATIONS:
+                OPERATIONS[op["op"]](objects, **params)
+            else:
+                raise ValueError(f"Unknown operation: {op.get('op')}")
+
+        report["triangles_after"] = count_triangles(objects)
+        report["ok"] = True
+    except Exception as e:
+        report["error"] = str(e)
+    finally:
+        report["leaked_datablocks"] = clear_new_data(before)
+        report["seconds"] = round(time.perf_counter() - start, 3)
+    return report
+
+
+def _write_report(path, reports):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(reports, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def worker_main(job_path):
+    with open(job_path, 'r', encoding='utf-8') as f:
+        job = json.load(f)
+
+    # Empty factory scene: no default cube, camera or light ends up in exports
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    reports = []
+    for item in job["items"]:
+        print(f"Processing {item['input']}...")
+        report = process_item(item)
+        print(f"  {'OK' if report['ok'] else 'ERROR: ' + str(report['error'])} ({report['seconds']}s)")
+        reports.append(report)
+        # Rewritten after every model so a crash loses at most the current one
+        _write_report(job["report"], reports)
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+
+    if bpy is not None and "--worker" in argv:
+        worker_main(argv[argv.index("--worker") + 1])
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Run a GLB operation chain over many models with background Blender workers.")
+    parser.add_argument("manifest", help="Manifest JSON (models + operations)")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable (default: $BLENDER or 'blender')")
+    parser.add_argument("--workers", type=int, default=None, help="Number of Blender processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds before a worker is killed")
+    parser.add_argument("--report", default=None, help="Write the JSON report to this file")
+
+    args = parser.parse_args(argv)
+
+    with open(args.manifest, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    reports = run_manifest(manifest, os.path.dirname(os.path.abspath(args.manifest)), args.blender, args.workers, args.timeout)
+
+    failed = 0
+    for r in reports:
+        if r["ok"]:
+            outputs = [r["output"]] if "output" in r else []
+            outputs += r.get("thumbnails", [])
+            print(f"[OK] {r['input']} -> {', '.join(outputs)} ({r['triangles_before']} -> {r['triangles_after']} tris, {r['seconds']}s)")
+        else:
+            failed += 1
+            print(f"[ERROR] {r['input']}: {r['error']}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+    print(f"{len(reports) - failed}/{len(reports)} models processed")
+    sys.exit(1 if failed else 0)
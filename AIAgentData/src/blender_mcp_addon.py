@@ -3,6 +3,7 @@
 import re
 import bpy
 import mathutils
+import numpy as np
 import json
 import threading
 import socket
@@ -13,6 +14,10 @@ import traceback
 import os
 import shutil
 import zipfile
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
 from bpy.props import IntProperty, BoolProperty
 import io
 from datetime import datetime
@@ -42,6 +47,773 @@ RODIN_FREE_TRIAL_KEY = "k9TcfFoEhNd9cCPP2guHAHHHkctZHIRhZDywZ1euGUXwihbYLpOjQhof
 REQ_HEADERS = requests.utils.default_headers()
 REQ_HEADERS.update({"User-Agent": "blender-mcp"})
 
+# Socket protocol
+#
+# Framed mode: every message is a 4-byte big-endian payload length followed by
+# a UTF-8 JSON object. Commands may carry an "id" which is echoed in the
+# response, so clients can pipeline commands and match responses out of order.
+# Raw mode (legacy): bare JSON objects, optionally back-to-back.
+# A connection whose first byte is "{" or whitespace uses raw mode. Frames are
+# capped at MAX_FRAME_BYTES, so a length prefix never starts with those bytes.
+# Commands that download or call remote APIs run in two phases: the network
+# part on a worker pool, then only the bpy import/scene mutation on the main
+# thread. A command sent with "progress": true receives interim
+# {"status": "progress", "stage": ...} messages (with its id) before the result.
+# Commands are queued by priority (cheap queries first, imports last) and
+# served round-robin across clients. Optional command keys: "priority"
+# (high/normal/low) and "timeout" (seconds). {"type": "cancel", "params":
+# {"id": ...}} cancels an earlier command of the same connection, and
+# "get_scheduler_stats" reports queue depth and execution times; both are
+# answered immediately instead of being queued.
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+IO_WORKERS = 4
+
+# Commands that only talk to a remote API; refused in offline mode
+NETWORK_ONLY_COMMANDS = {
+    "get_polyhaven_categories",
+    "search_polyhaven_assets",
+    "create_rodin_job",
+    "poll_rodin_job_status",
+    "search_sketchfab_models",
+    "get_sketchfab_model_preview",
+    "create_hunyuan_job",
+    "poll_hunyuan_job_status",
+}
+
+# Scheduler limits
+MAX_CLIENTS = 8
+MAX_QUEUED_COMMANDS = 256
+MAX_QUEUED_PER_CLIENT = 64
+MAIN_THREAD_SLICE = 0.02  # seconds of commands per timer tick
+WATCHDOG_INTERVAL = 0.1  # seconds between deadline checks while commands wait on the I/O pool
+
+PRIORITY_QUERY = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HEAVY = 2
+PRIORITY_NAMES = {"high": PRIORITY_QUERY, "normal": PRIORITY_NORMAL, "low": PRIORITY_HEAVY}
+
+# Besides these, every get_* command is a query
+QUERY_COMMANDS = {
+    "search_polyhaven_assets",
+    "search_sketchfab_models",
+    "poll_rodin_job_status",
+    "poll_hunyuan_job_status",
+}
+HEAVY_COMMANDS = {
+    "download_polyhaven_asset",
+    "import_generated_asset",
+    "download_sketchfab_model",
+    "import_generated_asset_hunyuan",
+    # Job creation uploads prompt images with a blocking POST (both Rodin backends)
+    "create_rodin_job",
+    "create_hunyuan_job",
+}
+
+DOWNLOAD_CHUNK = 256 * 1024
+PROGRESS_INTERVAL = 0.5  # seconds between download progress messages
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class LengthPrefixedReader:
+    framed = True
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        """Return the commands completed by data; malformed JSON yields the decode exception"""
+        self.buffer += data
+        commands = []
+        while len(self.buffer) >= 4:
+            length = int.from_bytes(self.buffer[:4], "big")
+            if length > MAX_FRAME_BYTES:
+                raise ProtocolError(f"Frame of {length} bytes exceeds limit of {MAX_FRAME_BYTES}")
+            if len(self.buffer) < 4 + length:
+                break
+            payload = bytes(self.buffer[4:4 + length])
+            del self.buffer[:4 + length]
+            try:
+                commands.append(json.loads(payload.decode('utf-8')))
+            except ValueError as e:
+                commands.append(e)
+        return commands
+
+
+class RawJsonReader:
+    """Splits a stream of bare JSON objects by tracking brace depth, scanning each byte once"""
+    framed = False
+    _TOKEN_RE = re.compile(rb'[{}"\\]')
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.scan_pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.skip_until = 0
+
+    def feed(self, data):
+        self.buffer += data
+        if len(self.buffer) > MAX_FRAME_BYTES:
+            raise ProtocolError(f"Message exceeds limit of {MAX_FRAME_BYTES} bytes")
+
+        ends = []
+        for m in self._TOKEN_RE.finditer(self.buffer, self.scan_pos):
+            i = m.start()
+            if i < self.skip_until:
+                continue
+            c = self.buffer[i]
+            if self.in_string:
+                if c == 0x5C:  # backslash escapes the next byte
+                    self.skip_until = i + 2
+                elif c == 0x22:
+                    self.in_string = False
+            elif c == 0x22:
+                self.in_string = True
+            elif c == 0x7B:
+                self.depth += 1
+            elif c == 0x7D:
+                self.depth -= 1
+                if self.depth == 0:
+                    ends.append(i + 1)
+                elif self.depth < 0:
+                    raise ProtocolError("Unbalanced '}' in JSON stream")
+        self.scan_pos = len(self.buffer)
+
+        commands = []
+        start = 0
+        for end in ends:
+            try:
+                commands.append(json.loads(self.buffer[start:end].decode('utf-8')))
+            except ValueError as e:
+                commands.append(e)
+            start = end
+        if start:
+            del self.buffer[:start]
+            self.scan_pos -= start
+            self.skip_until = max(0, self.skip_until - start)
+        return commands
+
+
+def encode_png(pixels):
+    """Encode a top-down (height, width, 3|4) uint8 array as PNG in memory"""
+    height, width, channels = pixels.shape
+    # Each scanline gets filter type 0 (None)
+    raw = np.zeros((height, 1 + width * channels), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, -1)
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6 if channels == 4 else 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) +
+            chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)) + chunk(b"IEND", b""))
+
+
+class BackgroundTask:
+    """Returned by a handler whose work is network I/O.
+
+    fetch(progress) runs on the I/O pool and must not touch bpy. It returns the
+    final result, or a MainThreadStep for the part that needs the scene.
+    """
+    def __init__(self, fetch):
+        self.fetch = fetch
+
+
+class MainThreadStep:
+    """Second phase of a BackgroundTask: fn(*args) is run on Blender's main thread"""
+    def __init__(self, fn, *args):
+        self.fn = fn
+        self.args = args
+
+
+def stream_download(url, path, progress=None, label="", headers=None, timeout=60):
+    """Stream url into path, reporting progress. Returns the HTTP status code; path is only written on 200"""
+    with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code != 200:
+            return response.status_code
+        total = int(response.headers.get("Content-Length") or 0)
+        done = 0
+        last_report = 0.0
+        with open(path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK):
+                f.write(chunk)
+                done += len(chunk)
+                now = time.monotonic()
+                if progress and now - last_report >= PROGRESS_INTERVAL:
+                    last_report = now
+                    progress(f"Downloading {label}", done / total if total else None, bytes=done)
+        if progress:
+            progress(f"Downloaded {label}", 1.0, bytes=done)
+        return response.status_code
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".blendermcp", "asset_cache")
+
+
+class AssetCache:
+    """Persistent content-addressed cache for downloaded assets.
+
+    An entry is keyed by (provider, asset id, resolution, format) and maps the
+    file names of one download to blobs stored under blobs/ by SHA-256, so a
+    file shared by several entries is kept once. When the blobs exceed
+    max_bytes the least recently used entries are evicted. Entries are handed
+    out as hard links (or copies) in a fresh temp directory, so callers can
+    move or delete what they get. Safe to use from the I/O pool threads.
+    """
+    INDEX_NAME = "index.json"
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.blob_dir = os.path.join(root, "blobs")
+        self.index_path = os.path.join(root, self.INDEX_NAME)
+        self.lock = threading.Lock()
+        self.entries = self._load_index()
+
+    @staticmethod
+    def make_key(provider, asset_id, resolution=None, file_format=None):
+        return "/".join(str(part) for part in (provider, asset_id, resolution or "-", file_format or "-"))
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".index_", suffix=".json", dir=self.root)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": self.entries}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def get(self, key):
+        """Return ({file name: blob path}, meta) for a complete entry, or None. Marks the entry as used"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            files = {name: self._blob_path(digest) for name, digest in entry["files"].items()}
+            if not all(os.path.exists(path) for path in files.values()):
+                # Blob removed behind our back, treat as a miss
+                del self.entries[key]
+                self._save_index()
+                return None
+            entry["last_used"] = time.time()
+            self._save_index()
+            return files, entry.get("meta", {})
+
+    def materialize(self, key):
+        """Link a cached entry into a new temp directory. Returns (temp_dir, {file name: path}, meta) or None"""
+        cached = self.get(key)
+        if cached is None:
+            return None
+        files, meta = cached
+        temp_dir = tempfile.mkdtemp(prefix="blendermcp_cache_")
+        paths = {}
+        for name, blob_path in files.items():
+            target = os.path.join(temp_dir, os.path.normpath(name))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                os.link(blob_path, target)
+            except OSError:
+                shutil.copyfile(blob_path, target)
+            paths[name] = target
+        return temp_dir, paths, meta
+
+    def put(self, key, files, meta=None):
+        """Store {file name: local path} under key, then evict down to max_bytes"""
+        stored = {}
+        for name, src_path in files.items():
+            sha = hashlib.sha256()
+            with open(src_path, "rb") as f:
+                for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            blob_path = self._blob_path(digest)
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                tmp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+                shutil.copyfile(src_path, tmp_path)
+                os.replace(tmp_path, blob_path)
+            stored[name.replace(os.sep, "/")] = digest
+
+        with self.lock:
+            self.entries[key] = {"files": stored, "meta": meta or {}, "last_used": time.time()}
+            self._evict(keep=key)
+            self._save_index()
+
+    def _blob_sizes(self):
+        sizes = {}
+        for entry in self.entries.values():
+            for digest in entry["files"].values():
+                if digest not in sizes:
+                    try:
+                        sizes[digest] = os.path.getsize(self._blob_path(digest))
+                    except OSError:
+                        sizes[digest] = 0
+        return sizes
+
+    def _evict(self, keep=None):
+        sizes = self._blob_sizes()
+        total = sum(sizes.values())
+        if total > self.max_bytes:
+            refs = {}
+            for entry in self.entries.values():
+                for digest in set(entry["files"].values()):
+                    refs[digest] = refs.get(digest, 0) + 1
+            for key in sorted(self.entries, key=lambda k: self.entries[k]["last_used"]):
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                for digest in set(self.entries.pop(key)["files"].values()):
+                    refs[digest] -= 1
+                    if refs[digest] == 0:
+                        total -= sizes[digest]
+                        with suppress(OSError):
+                            os.remove(self._blob_path(digest))
+        return total
+
+    def stats(self):
+        with self.lock:
+            sizes = self._blob_sizes()
+            return {
+                "root": self.root,
+                "entries": len(self.entries),
+                "blobs": len(sizes),
+                "size_bytes": sum(sizes.values()),
+                "max_bytes": self.max_bytes
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+            with suppress(Exception):
+                shutil.rmtree(self.blob_dir)
+            self._save_index()
+
+
+class CommandAborted(Exception):
+    """Raised from progress() inside a fetch whose command was cancelled or timed out"""
+
+
+def command_priority(command):
+    """Explicit "priority" (high/normal/low or 0-2) or the default for the command type"""
+    requested = command.get("priority")
+    if isinstance(requested, str) and requested.lower() in PRIORITY_NAMES:
+        return PRIORITY_NAMES[requested.lower()]
+    if isinstance(requested, int) and not isinstance(requested, bool):
+        return min(max(requested, PRIORITY_QUERY), PRIORITY_HEAVY)
+    cmd_type = command.get("type") or ""
+    if cmd_type in HEAVY_COMMANDS:
+        return PRIORITY_HEAVY
+    if cmd_type in QUERY_COMMANDS or cmd_type.startswith("get_"):
+        return PRIORITY_QUERY
+    return PRIORITY_NORMAL
+
+
+class ScheduledCommand:
+    """A client command tracked from admission to its final reply"""
+    def __init__(self, client_id, request_id, cmd_type, priority, reply, timeout=None):
+        self.client_id = client_id
+        self.request_id = request_id
+        self.cmd_type = cmd_type
+        self.priority = priority
+        self.reply = reply
+        self.run = None  # main-thread callable for the next phase
+        self.submitted = time.perf_counter()
+        self.deadline = self.submitted + timeout if timeout else None
+        self.started = None
+        self.run_start = None  # set while a phase is executing on the main thread
+        self.exec_seconds = 0.0
+        self.done = False
+
+
+class CommandScheduler:
+    """Bounded, prioritized queue of commands drained on Blender's main thread.
+
+    Every priority level holds one FIFO per client and serves the clients
+    round-robin, so an agent pipelining imports cannot starve another agent's
+    queries. The main-thread pump runs commands for at most MAIN_THREAD_SLICE
+    per timer tick to keep the UI responsive. Running bpy code cannot be
+    interrupted: cancellation and timeouts drop queued phases, stop downloads
+    at their next progress report and discard late results.
+    """
+    def __init__(self, capacity=MAX_QUEUED_COMMANDS, per_client=MAX_QUEUED_PER_CLIENT):
+        self.capacity = capacity
+        self.per_client = per_client
+        self.lock = threading.Lock()
+        self.levels = [OrderedDict() for _ in range(PRIORITY_HEAVY + 1)]  # client_id -> deque
+        self.queued = 0
+        self.queued_by_client = {}
+        self.active = set()  # admitted and not finished, queued or running
+        self.timer = None
+        self.counters = {"completed": 0, "failed": 0, "rejected": 0, "cancelled": 0, "timed_out": 0}
+        self.command_stats = {}
+
+    def submit(self, entry, resume=False):
+        """Queue a command (resume=True re-queues a later phase). Returns False when the queue is full"""
+        with self.lock:
+            if entry.done:
+                return True
+            if not resume:
+                if self.queued >= self.capacity or self.queued_by_client.get(entry.client_id, 0) >= self.per_client:
+                    self.counters["rejected"] += 1
+                    return False
+                self.active.add(entry)
+            self.levels[entry.priority].setdefault(entry.client_id, deque()).append(entry)
+            self.queued += 1
+            self.queued_by_client[entry.client_id] = self.queued_by_client.get(entry.client_id, 0) + 1
+            if self.timer is None:
+                self.timer = lambda: self._pump()
+                bpy.app.timers.register(self.timer, first_interval=0.0)
+        return True
+
+    def _count_dequeued(self, entry):
+        self.queued -= 1
+        left = self.queued_by_client[entry.client_id] - 1
+        if left:
+            self.queued_by_client[entry.client_id] = left
+        else:
+            del self.queued_by_client[entry.client_id]
+
+    def _next(self):
+        with self.lock:
+            for level in self.levels:
+                if not level:
+                    continue
+                client_id, queue = next(iter(level.items()))
+                entry = queue.popleft()
+                if queue:
+                    level.move_to_end(client_id)
+                else:
+                    del level[client_id]
+                self._count_dequeued(entry)
+                return entry
+        return None
+
+    def _unqueue(self, entry):
+        """Remove entry from its queue if it is waiting there. Caller holds the lock"""
+        level = self.levels[entry.priority]
+        queue = level.get(entry.client_id)
+        if queue and entry in queue:
+            queue.remove(entry)
+            if not queue:
+                del level[entry.client_id]
+            self._count_dequeued(entry)
+
+    def _pump(self):
+        self._expire()
+        slice_end = time.perf_counter() + MAIN_THREAD_SLICE
+        while time.perf_counter() < slice_end:
+            entry = self._next()
+            if entry is None:
+                break
+            if entry.done:
+                continue
+            entry.run_start = time.perf_counter()
+            if entry.started is None:
+                entry.started = entry.run_start
+            try:
+                entry.run()
+            except Exception as e:
+                print(f"Error executing command: {str(e)}")
+                traceback.print_exc()
+                self.complete(entry, {"status": "error", "message": str(e)})
+            finally:
+                entry.exec_seconds += time.perf_counter() - entry.run_start
+                entry.run_start = None
+
+        with self.lock:
+            if self.queued:
+                return 0.0
+            if any(entry.deadline for entry in self.active):
+                # Keep watching deadlines of commands waiting on the I/O pool
+                return WATCHDOG_INTERVAL
+            self.timer = None
+            return None
+
+    def _expire(self):
+        now = time.perf_counter()
+        with self.lock:
+            expired = [e for e in self.active if e.deadline is not None and e.deadline <= now]
+            for entry in expired:
+                self._unqueue(entry)
+        for entry in expired:
+            self.abort(entry, "timed_out", {"status": "error", "message": f"Command timed out: {entry.cmd_type}"})
+
+    def _finish(self, entry, outcome):
+        """Mark entry done exactly once. Returns False for a late result that must be dropped"""
+        with self.lock:
+            if entry.done:
+                return False
+            entry.done = True
+            self.active.discard(entry)
+            self.counters[outcome] += 1
+            if entry.started is None:
+                return True
+            # Finishing from inside a running phase counts that phase so far
+            exec_seconds = entry.exec_seconds
+            if entry.run_start is not None:
+                exec_seconds += time.perf_counter() - entry.run_start
+            stats = self.command_stats.setdefault(
+                entry.cmd_type, {"count": 0, "exec_ms": 0.0, "max_exec_ms": 0.0, "wait_ms": 0.0})
+            stats["count"] += 1
+            stats["exec_ms"] += exec_seconds * 1000
+            stats["max_exec_ms"] = max(stats["max_exec_ms"], exec_seconds * 1000)
+            stats["wait_ms"] += (entry.started - entry.submitted) * 1000
+            return True
+
+    def complete(self, entry, response):
+        """Send the final response of a command unless it was already cancelled or timed out"""
+        outcome = "failed" if response.get("status") == "error" else "completed"
+        if self._finish(entry, outcome):
+            entry.reply(response)
+
+    def abort(self, entry, outcome, response=None):
+        with self.lock:
+            self._unqueue(entry)
+        if self._finish(entry, outcome) and response is not None:
+            entry.reply(response)
+
+    def cancel(self, client_id, request_id):
+        """Cancel a client's command by request id"""
+        with self.lock:
+            entry = next((e for e in self.active if e.client_id == client_id and e.request_id == request_id), None)
+            if entry is None:
+                return {"cancelled": False, "state": "unknown"}
+            state = "running" if entry.started is not None else "queued"
+        self.abort(entry, "cancelled", {"status": "cancelled", "message": f"Command cancelled: {entry.cmd_type}"})
+        return {"cancelled": True, "state": state}
+
+    def drop_client(self, client_id):
+        """Forget everything a disconnected client still had queued or running"""
+        with self.lock:
+            entries = [e for e in self.active if e.client_id == client_id]
+        for entry in entries:
+            self.abort(entry, "cancelled")
+
+    def stop(self):
+        with self.lock:
+            entries = list(self.active)
+            timer, self.timer = self.timer, None
+        for entry in entries:
+            self.abort(entry, "cancelled", {"status": "error", "message": "Server stopped"})
+        if timer is not None and bpy.app.timers.is_registered(timer):
+            bpy.app.timers.unregister(timer)
+
+    def stats(self):
+        with self.lock:
+            names = ["query", "normal", "heavy"]
+            return {
+                "queued": self.queued,
+                "capacity": self.capacity,
+                "queued_by_priority": {names[p]: sum(len(q) for q in level.values())
+                                       for p, level in enumerate(self.levels)},
+                "queued_by_client": dict(self.queued_by_client),
+                "running": sum(1 for e in self.active if e.started is not None),
+                "counters": dict(self.counters),
+                "commands": {
+                    cmd_type: {
+                        "count": s["count"],
+                        "avg_exec_ms": round(s["exec_ms"] / s["count"], 3),
+                        "max_exec_ms": round(s["max_exec_ms"], 3),
+                        "avg_wait_ms": round(s["wait_ms"] / s["count"], 3)
+                    }
+                    for cmd_type, s in self.command_stats.items()
+                }
+            }
+
+
+MAX_SCENE_EVENTS = 50000
+
+
+def _object_transform(obj):
+    return (tuple(obj.location), tuple(obj.rotation_euler), tuple(obj.scale))
+
+
+class SceneChangeTracker:
+    """Journal of object and material changes fed by depsgraph_update_post.
+
+    Every change gets a sequence number. A client keeps the last number it was
+    given (its cursor) and asks for the changes after it, collapsed to one
+    entry per datablock. Datablocks are keyed by name, which survives undo;
+    a rename shows up as a removal plus an addition. Cursors older than the
+    journal, or from before a file load, get {"reset": true} and should
+    resync with get_scene_info.
+    """
+    def __init__(self, max_events=MAX_SCENE_EVENTS):
+        self.events = deque(maxlen=max_events)  # (seq, category, name, kind, data)
+        self.seq = 0
+        self.reset_seq = 0
+        self.objects = {}  # name -> (type, transform)
+        self.materials = set()
+        self.handlers = None
+
+    @property
+    def active(self):
+        return self.handlers is not None
+
+    def start(self):
+        if self.handlers is not None:
+            return
+
+        @bpy.app.handlers.persistent
+        def on_depsgraph_update(scene, depsgraph):
+            try:
+                self._on_depsgraph_update(depsgraph)
+            except Exception as e:
+                print(f"Error tracking scene changes: {str(e)}")
+
+        @bpy.app.handlers.persistent
+        def on_load(*args):
+            # The load takes a sequence number of its own, so every cursor
+            # handed out before it (including the current one) is reset
+            self._snapshot()
+            self.seq += 1
+            self.reset_seq = self.seq
+
+        self.handlers = (on_depsgraph_update, on_load)
+        self._snapshot()
+        self.reset_seq = self.seq
+        bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+        bpy.app.handlers.load_post.append(on_load)
+
+    def stop(self):
+        if self.handlers is None:
+            return
+        on_depsgraph_update, on_load = self.handlers
+        if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
+        if on_load in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.remove(on_load)
+        self.handlers = None
+
+    def _snapshot(self):
+        self.objects = {obj.name: (obj.type, _object_transform(obj)) for obj in bpy.data.objects}
+        self.materials = set(bpy.data.materials.keys())
+
+    def _record(self, category, name, kind, data=None):
+        if len(self.events) == self.events.maxlen:
+            # The oldest event falls off, cursors before it can no longer be diffed
+            self.reset_seq = self.events[0][0]
+        self.seq += 1
+        self.events.append((self.seq, category, name, kind, data))
+
+    def _resync(self):
+        """Record additions and removals by comparing names with the snapshot"""
+        current = {obj.name: obj for obj in bpy.data.objects}
+        for name in [n for n in self.objects if n not in current]:
+            del self.objects[name]
+            self._record("objects", name, "removed")
+        for name, obj in current.items():
+            if name not in self.objects:
+                self.objects[name] = (obj.type, _object_transform(obj))
+                self._record("objects", name, "added")
+
+        materials = set(bpy.data.materials.keys())
+        for name in self.materials - materials:
+            self._record("materials", name, "removed")
+        for name in materials - self.materials:
+            self._record("materials", name, "added")
+        self.materials = materials
+
+    def _on_depsgraph_update(self, depsgraph):
+        resync = len(bpy.data.objects) != len(self.objects) or len(bpy.data.materials) != len(self.materials)
+        for update in depsgraph.updates:
+            block = update.id.original
+            if isinstance(block, bpy.types.Object):
+                name = block.name
+                if name not in self.objects:
+                    resync = True
+                    continue
+                kinds = []
+                transform = None
+                if update.is_updated_transform:
+                    obj_type, before = self.objects[name]
+                    after = _object_transform(block)
+                    if after != before:
+                        kinds.append("transform")
+                        transform = (before, after)
+                        self.objects[name] = (obj_type, after)
+                if update.is_updated_geometry:
+                    kinds.append("geometry")
+                if update.is_updated_shading:
+                    kinds.append("shading")
+                if kinds:
+                    self._record("objects", name, "modified", (kinds, transform))
+            elif isinstance(block, bpy.types.Material):
+                if block.name not in self.materials:
+                    resync = True
+                    continue
+                self._record("materials", block.name, "modified", (["shading"], None))
+        if resync:
+            self._resync()
+
+    def changes_since(self, cursor=None):
+        """Collapsed diff of everything recorded after cursor"""
+        if cursor is None or cursor < self.reset_seq or cursor > self.seq:
+            return {"cursor": self.seq, "reset": cursor is not None}
+
+        # Per datablock: net status, the kinds of modification and the first/last transform
+        merged = {}
+        for seq, category, name, kind, data in self.events:
+            if seq <= cursor:
+                continue
+            state = merged.get((category, name))
+            if state is None:
+                state = merged[(category, name)] = {"status": kind, "kinds": set(), "before": None, "after": None}
+            elif kind == "removed":
+                state["status"] = None if state["status"] == "added" else "removed"
+            elif kind == "added":
+                state["status"] = "added"
+            if kind == "modified":
+                kinds, transform = data
+                state["kinds"].update(kinds)
+                if transform is not None:
+                    if state["before"] is None:
+                        state["before"] = transform[0]
+                    state["after"] = transform[1]
+
+        diff = {
+            "objects": {"added": [], "removed": [], "modified": []},
+            "materials": {"added": [], "removed": [], "modified": []}
+        }
+        for (category, name), state in merged.items():
+            status = state["status"]
+            if status is None:
+                continue
+            bucket = diff[category][status]
+            if status == "removed" or category == "materials":
+                bucket.append(name)
+            elif status == "added":
+                obj = bpy.data.objects.get(name)
+                if obj is not None:
+                    location, rotation, scale = _object_transform(obj)
+                    bucket.append({"name": name, "type": obj.type, "location": list(location),
+                                   "rotation": list(rotation), "scale": list(scale)})
+            else:
+                entry = {"name": name, "changes": sorted(state["kinds"])}
+                if state["before"] is not None:
+                    entry["transform"] = {
+                        field: {"to": list(after), "delta": [a - b for a, b in zip(after, before)]}
+                        for field, before, after in zip(("location", "rotation", "scale"), state["before"], state["after"])
+                        if before != after
+                    }
+                bucket.append(entry)
+
+        return {"cursor": self.seq, "reset": False, **diff}
+
+
 class BlenderMCPServer:
     def __init__(self, host='localhost', port=9876):
         self.host = host
@@ -49,6 +821,13 @@ class BlenderMCPServer:
         self.running = False
         self.socket = None
         self.server_thread = None
+        self.io_pool = None
+        self.asset_cache = None
+        self.scheduler = None
+        self.scene_tracker = SceneChangeTracker()
+        self.clients_lock = threading.Lock()
+        self.client_count = 0
+        self.next_client_id = 0
 
     def start(self):
         if self.running:
@@ -56,6 +835,8 @@ class BlenderMCPServer:
             return
 
         self.running = True
+        self.io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="blendermcp-io")
+        self.scheduler = CommandScheduler()
 
         try:
             # Create socket
@@ -94,6 +875,17 @@ class BlenderMCPServer:
                 pass
             self.server_thread = None
 
+        if self.scheduler:
+            self.scheduler.stop()
+            self.scheduler = None
+
+        self.scene_tracker.stop()
+
+        # Drop queued downloads; running ones finish but their results go nowhere
+        if self.io_pool:
+            self.io_pool.shutdown(wait=False, cancel_futures=True)
+            self.io_pool = None
+
         print("BlenderMCP server stopped")
 
     def _server_loop(self):
@@ -106,12 +898,22 @@ class BlenderMCPServer:
                 # Accept new connection
                 try:
                     client, address = self.socket.accept()
+                    with self.clients_lock:
+                        full = self.client_count >= MAX_CLIENTS
+                        if not full:
+                            self.client_count += 1
+                            self.next_client_id += 1
+                            client_id = self.next_client_id
+                    if full:
+                        print(f"Refused client {address}: {MAX_CLIENTS} clients already connected")
+                        client.close()
+                        continue
                     print(f"Connected to client: {address}")
 
                     # Handle client in a separate thread
                     client_thread = threading.Thread(
                         target=self._handle_client,
-                        args=(client,)
+                        args=(client, client_id)
                     )
                     client_thread.daemon = True
                     client_thread.start()
@@ -129,54 +931,36 @@ class BlenderMCPServer:
 
         print("Server thread stopped")
 
-    def _handle_client(self, client):
+    def _handle_client(self, client, client_id):
         """Handle connected client"""
         print("Client handler started")
         client.settimeout(None)  # No timeout
-        buffer = b''
+        send_lock = threading.Lock()
+        reader = None
 
         try:
             while self.running:
                 # Receive data
                 try:
-                    data = client.recv(8192)
+                    data = client.recv(65536)
                     if not data:
                         print("Client disconnected")
                         break
 
-                    buffer += data
-                    try:
-                        # Try to parse command
-                        command = json.loads(buffer.decode('utf-8'))
-                        buffer = b''
-
-                        # Execute command in Blender's main thread
-                        def execute_wrapper():
-                            try:
-                                response = self.execute_command(command)
-                                response_json = json.dumps(response)
-                                try:
-                                    client.sendall(response_json.encode('utf-8'))
-                                except:
-                                    print("Failed to send response - client disconnected")
-                            except Exception as e:
-                                print(f"Error executing command: {str(e)}")
-                                traceback.print_exc()
-                                try:
-                                    error_response = {
-                                        "status": "error",
-                                        "message": str(e)
-                                    }
-                                    client.sendall(json.dumps(error_response).encode('utf-8'))
-                                except:
-                                    pass
-                            return None
-
-                        # Schedule execution in main thread
-                        bpy.app.timers.register(execute_wrapper, first_interval=0.0)
-                    except json.JSONDecodeError:
-                        # Incomplete data, wait for more
-                        pass
+                    # The first byte picks the protocol for the whole connection
+                    if reader is None:
+                        if data[:1] in b"{ \t\r\n":
+                            reader = RawJsonReader()
+                        else:
+                            reader = LengthPrefixedReader()
+                        print(f"Client protocol: {'framed' if reader.framed else 'raw JSON'}")
+
+                    for command in reader.feed(data):
+                        self._schedule_command(client, send_lock, reader.framed, command, client_id)
+                except ProtocolError as e:
+                    print(f"Protocol error: {str(e)}")
+                    self._send_response(client, send_lock, reader.framed, {"status": "error", "message": str(e)})
+                    break
                 except Exception as e:
                     print(f"Error receiving data: {str(e)}")
                     break
@@ -187,8 +971,131 @@ class BlenderMCPServer:
                 client.close()
             except:
                 pass
+            scheduler = self.scheduler
+            if scheduler:
+                scheduler.drop_client(client_id)
+            with self.clients_lock:
+                self.client_count -= 1
             print("Client handler stopped")
 
+    def _schedule_command(self, client, send_lock, framed, command, client_id):
+        """Queue one decoded command for Blender's main thread; its response is sent when it finishes"""
+        if isinstance(command, Exception):
+            self._send_response(client, send_lock, framed, {"status": "error", "message": f"Invalid JSON: {command}"})
+            return
+        if not isinstance(command, dict):
+            self._send_response(client, send_lock, framed, {"status": "error", "message": "Command must be a JSON object"})
+            return
+        request_id = command.get("id")
+        wants_progress = bool(command.get("progress"))
+        cmd_type = command.get("type")
+
+        def reply(response):
+            self._send_response(client, send_lock, framed, response, request_id)
+
+        scheduler = self.scheduler
+        if scheduler is None:
+            reply({"status": "error", "message": "Server is not running"})
+            return
+
+        # Control commands bypass the queue
+        if cmd_type == "cancel":
+            target = (command.get("params") or {}).get("id")
+            reply({"status": "success", "result": scheduler.cancel(client_id, target)})
+            return
+        if cmd_type == "get_scheduler_stats":
+            reply({"status": "success", "result": scheduler.stats()})
+            return
+
+        timeout = command.get("timeout")
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+            timeout = None
+        entry = ScheduledCommand(client_id, request_id, cmd_type, command_priority(command), reply, timeout)
+
+        def progress(stage, fraction=None, **extra):
+            if entry.done:
+                raise CommandAborted(f"{cmd_type} was cancelled or timed out")
+            if wants_progress:
+                message = {"status": "progress", "stage": stage, "progress": fraction}
+                message.update(extra)
+                reply(message)
+
+        # Runs on Blender's main thread when the scheduler gets to it
+        def execute_wrapper():
+            try:
+                response = self.execute_command(command)
+            except Exception as e:
+                print(f"Error executing command: {str(e)}")
+                traceback.print_exc()
+                response = {"status": "error", "message": str(e)}
+            if isinstance(response.get("result"), BackgroundTask):
+                self._run_background(response["result"], entry, progress)
+            else:
+                scheduler.complete(entry, response)
+
+        entry.run = execute_wrapper
+        if not scheduler.submit(entry):
+            reply({"status": "error", "message": "Server busy: command queue is full, retry later"})
+
+    def _run_background(self, task, entry, progress):
+        """Run a task's network phase on the I/O pool, then queue its MainThreadStep (if any) for the main thread"""
+        scheduler = self.scheduler
+
+        def run_fetch():
+            try:
+                outcome = task.fetch(progress)
+            except CommandAborted:
+                return
+            except Exception as e:
+                print(f"Error in background task: {str(e)}")
+                traceback.print_exc()
+                scheduler.complete(entry, {"status": "error", "message": str(e)})
+                return
+
+            if not isinstance(outcome, MainThreadStep):
+                scheduler.complete(entry, {"status": "success", "result": outcome})
+                return
+
+            try:
+                progress("Importing into Blender")
+            except CommandAborted:
+                return
+
+            def run_step():
+                try:
+                    response = {"status": "success", "result": outcome.fn(*outcome.args)}
+                except Exception as e:
+                    print(f"Error in main thread step: {str(e)}")
+                    traceback.print_exc()
+                    response = {"status": "error", "message": str(e)}
+                scheduler.complete(entry, response)
+
+            entry.run = run_step
+            scheduler.submit(entry, resume=True)
+
+        if self.io_pool is None:
+            scheduler.complete(entry, {"status": "error", "message": "Server is not running"})
+            return
+        try:
+            self.io_pool.submit(run_fetch)
+        except RuntimeError as e:
+            # Pool shut down between scheduling and submission
+            scheduler.complete(entry, {"status": "error", "message": str(e)})
+
+    @staticmethod
+    def _send_response(client, send_lock, framed, response, request_id=None):
+        """Serialize and send a response; the request id is echoed so pipelined clients can match it"""
+        if request_id is not None:
+            response = dict(response, id=request_id)
+        payload = json.dumps(response).encode('utf-8')
+        if framed:
+            payload = len(payload).to_bytes(4, "big") + payload
+        try:
+            with send_lock:
+                client.sendall(payload)
+        except:
+            print("Failed to send response - client disconnected")
+
     def execute_command(self, command):
         """Execute a command in the main Blender thread"""
         try:
@@ -211,6 +1118,8 @@ class BlenderMCPServer:
         # Base handlers that are always available
         handlers = {
             "get_scene_info": self.get_scene_info,
+            "get_scene_stats": self.get_scene_stats,
+            "get_scene_changes": self.get_scene_changes,
             "get_object_info": self.get_object_info,
             "get_viewport_screenshot": self.get_viewport_screenshot,
             "execute_code": self.execute_code,
@@ -219,6 +1128,9 @@ class BlenderMCPServer:
             "get_hyper3d_status": self.get_hyper3d_status,
             "get_sketchfab_status": self.get_sketchfab_status,
             "get_hunyuan3d_status": self.get_hunyuan3d_status,
+            "batch": self.execute_batch,
+            "get_asset_cache_status": self.get_asset_cache_status,
+            "clear_asset_cache": self.clear_asset_cache,
         }
 
         # Add Polyhaven handlers only if enabled
@@ -258,6 +1170,9 @@ class BlenderMCPServer:
             }
             handlers.update(hunyuan_handlers)
 
+        if cmd_type in NETWORK_ONLY_COMMANDS and bpy.context.scene.blendermcp_offline:
+            return {"status": "error", "message": f"Offline mode: {cmd_type} needs network access"}
+
         handler = handlers.get(cmd_type)
         if handler:
             try:
@@ -274,6 +1189,101 @@ class BlenderMCPServer:
 
 
 
+    def _get_asset_cache(self):
+        """Asset cache configured from the scene settings, or None when caching is disabled"""
+        scene = bpy.context.scene
+        if not scene.blendermcp_use_asset_cache:
+            return None
+        root = bpy.path.abspath(scene.blendermcp_cache_dir) if scene.blendermcp_cache_dir else DEFAULT_CACHE_DIR
+        if self.asset_cache is None or self.asset_cache.root != root:
+            self.asset_cache = AssetCache(root, 0)
+        self.asset_cache.max_bytes = scene.blendermcp_cache_size_mb * 1024 * 1024
+        return self.asset_cache
+
+    @staticmethod
+    def _cache_lookup(cache, key, progress):
+        """Materialize a cache entry; returns (temp_dir, {name: path}, meta) or None on a miss"""
+        if cache is None:
+            return None
+        try:
+            hit = cache.materialize(key)
+        except Exception as e:
+            print(f"Asset cache lookup failed for {key}: {e}")
+            return None
+        if hit:
+            progress("Using cached asset", 1.0, cache_key=key)
+        return hit
+
+    @staticmethod
+    def _cache_store(cache, key, files, meta=None):
+        """Add a finished download to the cache; a cache failure never fails the import"""
+        if cache is None:
+            return
+        try:
+            cache.put(key, files, meta)
+        except Exception as e:
+            print(f"Failed to cache {key}: {e}")
+
+    @staticmethod
+    def _offline_miss(what):
+        return f"Offline mode: {what} is not in the asset cache"
+
+    def get_asset_cache_status(self):
+        """Size and location of the local asset cache"""
+        cache = self._get_asset_cache()
+        if cache is None:
+            return {"enabled": False, "offline": bpy.context.scene.blendermcp_offline}
+        return {"enabled": True, "offline": bpy.context.scene.blendermcp_offline, **cache.stats()}
+
+    def clear_asset_cache(self):
+        """Remove every cached download"""
+        cache = self._get_asset_cache()
+        if cache is None:
+            return {"error": "Asset cache is disabled"}
+        cache.clear()
+        return {"success": True, **cache.stats()}
+
+    def execute_batch(self, commands, undo=False, stop_on_error=False):
+        """Run an ordered list of commands in one main thread slice and return all results.
+
+        Each entry is a normal {"type", "params"} command (an "id" is echoed back).
+        With undo=True the whole batch becomes a single undo step. Commands that
+        need the network cannot run inside a batch and are reported as errors.
+        """
+        if not isinstance(commands, list):
+            return {"error": "commands must be a list"}
+
+        start = time.perf_counter()
+        results = []
+        failed = 0
+        for index, command in enumerate(commands):
+            if failed and stop_on_error:
+                results.append({"status": "skipped"})
+                continue
+
+            if not isinstance(command, dict):
+                response = {"status": "error", "message": f"Command {index} is not an object"}
+            else:
+                response = self.execute_command(command)
+                if isinstance(response.get("result"), BackgroundTask):
+                    response = {"status": "error", "message": f"{command.get('type')} needs network access and cannot be batched"}
+                if "id" in command:
+                    response = dict(response, id=command["id"])
+
+            if response.get("status") != "success":
+                failed += 1
+            results.append(response)
+
+        if undo:
+            bpy.ops.ed.undo_push(message=f"MCP batch ({len(commands)} commands)")
+
+        return {
+            "results": results,
+            "succeeded": sum(1 for r in results if r.get("status") == "success"),
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+
     def get_scene_info(self):
         """Get information about the current Blender scene"""
         try:
@@ -301,6 +1311,9 @@ class BlenderMCPServer:
                 }
                 scene_info["objects"].append(obj_info)
 
+            # Whole-scene totals from the vectorized stats pass, without per-object rows
+            scene_info["stats"] = self.get_scene_stats(limit=0)["totals"]
+
             print(f"Scene info collected: {len(scene_info['objects'])} objects")
             return scene_info
         except Exception as e:
@@ -314,21 +1327,179 @@ class BlenderMCPServer:
         if obj.type != 'MESH':
             raise TypeError("Object must be a mesh")
 
-        # Get the bounding box corners in local space
-        local_bbox_corners = [mathutils.Vector(corner) for corner in obj.bound_box]
-
-        # Convert to world coordinates
-        world_bbox_corners = [obj.matrix_world @ corner for corner in local_bbox_corners]
-
-        # Compute axis-aligned min/max coordinates
-        min_corner = mathutils.Vector(map(min, zip(*world_bbox_corners)))
-        max_corner = mathutils.Vector(map(max, zip(*world_bbox_corners)))
+        # Transform the 8 local bounding box corners to world space in one matrix product
+        corners = np.array(obj.bound_box, dtype=np.float64)
+        matrix = np.array(obj.matrix_world, dtype=np.float64)
+        world = corners @ matrix[:3, :3].T + matrix[:3, 3]
 
         return [
-            [*min_corner], [*max_corner]
+            world.min(axis=0).tolist(), world.max(axis=0).tolist()
         ]
 
+    @staticmethod
+    def _world_aabbs(objects):
+        """World AABBs (n, 2, 3) of every object in a bpy collection, read with two foreach_get calls"""
+        n = len(objects)
+        matrices = np.empty(n * 16, dtype=np.float32)
+        boxes = np.empty(n * 24, dtype=np.float32)
+        objects.foreach_get("matrix_world", matrices)
+        objects.foreach_get("bound_box", boxes)
+        # foreach_get returns matrices column-major
+        matrices = matrices.reshape(n, 4, 4).transpose(0, 2, 1)
+        boxes = boxes.reshape(n, 8, 3)
+        world = np.einsum('nij,nkj->nki', matrices[:, :3, :3], boxes) + matrices[:, None, :3, 3]
+        return np.stack([world.min(axis=1), world.max(axis=1)], axis=1)
 
+    @staticmethod
+    def _image_bytes(image):
+        """Approximate GPU memory of an image: width x height x channels x bytes per channel, plus mipmaps"""
+        width, height = image.size
+        if not width or not height:
+            return 0
+        return int(width * height * image.channels * (4 if image.is_float else 1) * 4 / 3)
+
+    @staticmethod
+    def _node_tree_images(node_tree, found, seen_groups=None):
+        seen_groups = seen_groups if seen_groups is not None else set()
+        for node in node_tree.nodes:
+            image = getattr(node, "image", None)
+            if image is not None:
+                found.add(image)
+            group = getattr(node, "node_tree", None)
+            if group is not None and group.name not in seen_groups:
+                seen_groups.add(group.name)
+                BlenderMCPServer._node_tree_images(group, found, seen_groups)
+        return found
+
+    def get_scene_stats(self, offset=0, limit=50, types=None, name_contains=None, collection=None,
+                        visible_only=False, sort_by="name"):
+        """World AABBs, vertex/triangle/material counts and texture memory for every object in one pass.
+
+        Objects can be filtered by type, name substring, collection and visibility, sorted by
+        name/vertices/triangles/materials/texture_bytes/volume (numbers descending) and paged
+        with offset/limit. Totals cover the whole filtered set; instanced meshes are counted
+        per object and once in unique_triangles.
+        """
+        scene = bpy.context.scene
+        objects = scene.objects
+        aabbs = self._world_aabbs(objects)
+
+        wanted_types = {t.upper() for t in types} if types else None
+        needle = name_contains.lower() if name_contains else None
+        members = None
+        if collection:
+            coll = bpy.data.collections.get(collection)
+            if coll is None:
+                return {"error": f"Collection not found: {collection}"}
+            members = set(o.name for o in coll.all_objects)
+
+        # Per-datablock caches: instanced meshes and shared materials are measured once
+        mesh_counts = {}
+        material_images = {}
+        image_bytes = {}
+
+        rows = []
+        indices = []
+        for index, obj in enumerate(objects):
+            if wanted_types and obj.type not in wanted_types:
+                continue
+            if needle and needle not in obj.name.lower():
+                continue
+            if members is not None and obj.name not in members:
+                continue
+            visible = obj.visible_get()
+            if visible_only and not visible:
+                continue
+
+            vertices = triangles = 0
+            if obj.type == 'MESH' and obj.data is not None:
+                mesh = obj.data
+                key = mesh.as_pointer()
+                if key not in mesh_counts:
+                    # Triangles of an n-gon fan: sum(loop_total - 2) == loops - 2 * polygons
+                    mesh_counts[key] = (len(mesh.vertices), len(mesh.loops) - 2 * len(mesh.polygons))
+                vertices, triangles = mesh_counts[key]
+
+            images = set()
+            materials = [slot.material for slot in obj.material_slots if slot.material]
+            for mat in materials:
+                key = mat.as_pointer()
+                if key not in material_images:
+                    material_images[key] = self._node_tree_images(mat.node_tree, set()) if mat.node_tree else set()
+                images |= material_images[key]
+            texture_bytes = 0
+            for image in images:
+                key = image.as_pointer()
+                if key not in image_bytes:
+                    image_bytes[key] = self._image_bytes(image)
+                texture_bytes += image_bytes[key]
+
+            rows.append({
+                "name": obj.name,
+                "type": obj.type,
+                "visible": visible,
+                "vertices": vertices,
+                "triangles": triangles,
+                "materials": len(materials),
+                "texture_bytes": texture_bytes,
+            })
+            indices.append(index)
+
+        idx = np.array(indices, dtype=np.int64)
+        boxes = aabbs[idx] if len(idx) else np.zeros((0, 2, 3), dtype=np.float32)
+        extents = boxes[:, 1] - boxes[:, 0]
+        volumes = np.prod(extents, axis=1)
+        has_bounds = np.array([row["type"] in ('MESH', 'CURVE', 'SURFACE', 'META', 'FONT') for row in rows], dtype=bool)
+
+        if sort_by == "volume":
+            order = np.argsort(-volumes, kind="stable")
+        elif sort_by in ("vertices", "triangles", "materials", "texture_bytes"):
+            order = np.argsort(-np.array([row[sort_by] for row in rows], dtype=np.int64), kind="stable")
+        else:
+            order = np.argsort(np.array([row["name"] for row in rows], dtype=object), kind="stable")
+
+        page = []
+        for i in order[offset:offset + limit] if limit else []:
+            row = rows[i]
+            if has_bounds[i]:
+                row["world_bounding_box"] = np.round(boxes[i], 4).tolist()
+                row["dimensions"] = np.round(extents[i], 4).tolist()
+            page.append(row)
+
+        totals = {
+            "objects": len(rows),
+            "vertices": sum(row["vertices"] for row in rows),
+            "triangles": sum(row["triangles"] for row in rows),
+            "unique_meshes": len(mesh_counts),
+            "unique_triangles": sum(t for _, t in mesh_counts.values()),
+            "materials": len(material_images),
+            "images": len(image_bytes),
+            "texture_bytes": sum(image_bytes.values()),
+        }
+        if has_bounds.any():
+            totals["world_bounding_box"] = [
+                np.round(boxes[has_bounds, 0].min(axis=0), 4).tolist(),
+                np.round(boxes[has_bounds, 1].max(axis=0), 4).tolist()
+            ]
+
+        return {
+            "scene": scene.name,
+            "totals": totals,
+            "offset": offset,
+            "limit": limit,
+            "returned": len(page),
+            "objects": page
+        }
+
+    def get_scene_changes(self, cursor=None):
+        """Objects and materials added, removed or modified since cursor.
+
+        The first call (no cursor) starts tracking and returns only the current
+        cursor; pass the returned cursor to the next call.
+        """
+        if not self.scene_tracker.active:
+            self.scene_tracker.start()
+        return self.scene_tracker.changes_since(cursor)
 
     def get_object_info(self, name):
         """Get detailed information about a specific object"""
@@ -363,25 +1534,38 @@ class BlenderMCPServer:
                 "vertices": len(mesh.vertices),
                 "edges": len(mesh.edges),
                 "polygons": len(mesh.polygons),
+                "triangles": len(mesh.loops) - 2 * len(mesh.polygons),
             }
 
+        # Texture memory of the images used by the object's materials
+        images = set()
+        for slot in obj.material_slots:
+            if slot.material and slot.material.node_tree:
+                self._node_tree_images(slot.material.node_tree, images)
+        obj_info["texture_bytes"] = sum(self._image_bytes(image) for image in images)
+
         return obj_info
 
-    def get_viewport_screenshot(self, max_size=800, filepath=None, format="png"):
+    def get_viewport_screenshot(self, max_size=800, filepath=None, format="png", quality=90, region=None,
+                                use_camera=False):
         """
-        Capture a screenshot of the current 3D viewport and save it to the specified path.
+        Capture the current 3D viewport.
 
         Parameters:
         - max_size: Maximum size in pixels for the largest dimension of the image
-        - filepath: Path where to save the screenshot file
+        - filepath: Path where to save the screenshot file. Without it the viewport is
+          rendered offscreen and returned as base64 "image_data" without touching the disk
         - format: Image format (png, jpg, etc.)
+        - quality: JPEG quality 1-100 (offscreen capture)
+        - region: [x, y, width, height] as fractions of the viewport, origin bottom-left (offscreen capture)
+        - use_camera: Render through the scene camera instead of the viewport view (offscreen capture)
 
         Returns success/error status
         """
-        try:
-            if not filepath:
-                return {"error": "No filepath provided"}
+        if not filepath:
+            return self._capture_viewport_offscreen(max_size, format, quality, region, use_camera)
 
+        try:
             # Find the active 3D viewport
             area = None
             for a in bpy.context.screen.areas:
@@ -424,6 +1608,125 @@ class BlenderMCPServer:
         except Exception as e:
             return {"error": str(e)}
 
+    def _capture_viewport_offscreen(self, max_size=800, format="png", quality=90, region=None, use_camera=False):
+        """Draw the viewport into a GPUOffScreen at the output size and encode it in memory"""
+        try:
+            import gpu
+
+            fmt = format.lower()
+            if fmt in ("jpg", "jpeg"):
+                fmt = "jpeg"
+            elif fmt != "png":
+                return {"error": f"Unsupported format for offscreen capture: {format} (use png or jpeg)"}
+
+            area = None
+            for a in (bpy.context.screen.areas if bpy.context.screen else []):
+                if a.type == 'VIEW_3D':
+                    area = a
+                    break
+            if not area:
+                return {"error": "No 3D viewport found"}
+            space = area.spaces.active
+            window_region = next(r for r in area.regions if r.type == 'WINDOW')
+
+            # Output size follows the aspect of the (cropped) view
+            fx, fy, fw, fh = region if region else (0.0, 0.0, 1.0, 1.0)
+            if fw <= 0 or fh <= 0 or fx < 0 or fy < 0 or fx + fw > 1 or fy + fh > 1:
+                return {"error": "region must be [x, y, width, height] fractions inside [0, 1]"}
+            view_w = window_region.width * fw
+            view_h = window_region.height * fh
+            scale = max_size / max(view_w, view_h)
+            width, height = max(1, int(round(view_w * scale))), max(1, int(round(view_h * scale)))
+
+            scene = bpy.context.scene
+            if use_camera:
+                if scene.camera is None:
+                    return {"error": "Scene has no camera"}
+                view_matrix = scene.camera.matrix_world.inverted()
+                projection_matrix = scene.camera.calc_matrix_camera(
+                    bpy.context.evaluated_depsgraph_get(), x=window_region.width, y=window_region.height)
+            else:
+                view_matrix = space.region_3d.view_matrix
+                projection_matrix = space.region_3d.window_matrix
+
+            if region:
+                # Map the region's NDC rectangle onto the whole target, so the crop renders at full resolution
+                x0, x1 = 2 * fx - 1, 2 * (fx + fw) - 1
+                y0, y1 = 2 * fy - 1, 2 * (fy + fh) - 1
+                crop = mathutils.Matrix((
+                    (2 / (x1 - x0), 0, 0, -(x1 + x0) / (x1 - x0)),
+                    (0, 2 / (y1 - y0), 0, -(y1 + y0) / (y1 - y0)),
+                    (0, 0, 1, 0),
+                    (0, 0, 0, 1)
+                ))
+                projection_matrix = crop @ projection_matrix
+
+            offscreen = gpu.types.GPUOffScreen(width, height)
+            try:
+                offscreen.draw_view3d(scene, bpy.context.view_layer, space, window_region,
+                                      view_matrix, projection_matrix, do_color_management=True)
+                with offscreen.bind():
+                    framebuffer = gpu.state.active_framebuffer_get()
+                    buffer = framebuffer.read_color(0, 0, width, height, 4, 0, 'UBYTE')
+            finally:
+                offscreen.free()
+
+            buffer.dimensions = width * height * 4
+            # GPU rows are bottom-up
+            pixels = np.asarray(buffer, dtype=np.uint8).reshape(height, width, 4)
+
+            if fmt == "png":
+                data = encode_png(pixels[::-1])
+            else:
+                data = self._encode_jpeg(pixels, int(quality))
+
+            return {
+                "success": True,
+                "width": width,
+                "height": height,
+                "format": fmt,
+                "bytes": len(data),
+                "image_data": base64.b64encode(data).decode('ascii')
+            }
+        except Exception as e:
+            traceback.print_exc()
+            return {"error": str(e)}
+
+    @staticmethod
+    def _encode_jpeg(pixels, quality):
+        """JPEG-encode bottom-up RGBA pixels: in memory with Pillow, else through one temp file"""
+        quality = max(1, min(100, quality))
+        try:
+            from PIL import Image
+            out = io.BytesIO()
+            Image.fromarray(np.ascontiguousarray(pixels[::-1, :, :3])).save(out, "JPEG", quality=quality)
+            return out.getvalue()
+        except ImportError:
+            pass
+
+        # Blender's bundled Python has no JPEG encoder, fall back to the image saver.
+        # Image.save writes the pixels as they are; save_render would apply the
+        # scene's view transform a second time to already display-referred pixels.
+        height, width = pixels.shape[:2]
+        image = bpy.data.images.new("_mcp_capture", width, height, alpha=False)
+        fd, path = tempfile.mkstemp(suffix=".jpg")
+        os.close(fd)
+        try:
+            image.pixels.foreach_set((pixels.astype(np.float32) / 255.0).ravel())
+            image.filepath_raw = path
+            image.file_format = 'JPEG'
+            try:
+                image.save(filepath=path, quality=quality)
+            except TypeError:
+                # Blender before 4.0 has no quality argument and uses its default
+                image.save()
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            bpy.data.images.remove(image)
+            with suppress(OSError):
+                os.unlink(path)
+
     def execute_code(self, code):
         """Execute arbitrary Blender Python code"""
         # This is powerful but potentially dangerous - use with caution
@@ -445,371 +1748,427 @@ class BlenderMCPServer:
 
     def get_polyhaven_categories(self, asset_type):
         """Get categories for a specific asset type from Polyhaven"""
-        try:
-            if asset_type not in ["hdris", "textures", "models", "all"]:
-                return {"error": f"Invalid asset type: {asset_type}. Must be one of: hdris, textures, models, all"}
+        def fetch(progress):
+            try:
+                if asset_type not in ["hdris", "textures", "models", "all"]:
+                    return {"error": f"Invalid asset type: {asset_type}. Must be one of: hdris, textures, models, all"}
 
-            response = requests.get(f"https://api.polyhaven.com/categories/{asset_type}", headers=REQ_HEADERS)
-            if response.status_code == 200:
-                return {"categories": response.json()}
-            else:
-                return {"error": f"API request failed with status code {response.status_code}"}
-        except Exception as e:
-            return {"error": str(e)}
+                response = requests.get(f"https://api.polyhaven.com/categories/{asset_type}", headers=REQ_HEADERS)
+                if response.status_code == 200:
+                    return {"categories": response.json()}
+                else:
+                    return {"error": f"API request failed with status code {response.status_code}"}
+            except Exception as e:
+                return {"error": str(e)}
+
+        return BackgroundTask(fetch)
 
     def search_polyhaven_assets(self, asset_type=None, categories=None):
         """Search for assets from Polyhaven with optional filtering"""
-        try:
-            url = "https://api.polyhaven.com/assets"
-            params = {}
+        def fetch(progress):
+            try:
+                url = "https://api.polyhaven.com/assets"
+                params = {}
 
-            if asset_type and asset_type != "all":
-                if asset_type not in ["hdris", "textures", "models"]:
-                    return {"error": f"Invalid asset type: {asset_type}. Must be one of: hdris, textures, models, all"}
-                params["type"] = asset_type
-
-            if categories:
-                params["categories"] = categories
-
-            response = requests.get(url, params=params, headers=REQ_HEADERS)
-            if response.status_code == 200:
-                # Limit the response size to avoid overwhelming Blender
-                assets = response.json()
-                # Return only the first 20 assets to keep response size manageable
-                limited_assets = {}
-                for i, (key, value) in enumerate(assets.items()):
-                    if i >= 20:  # Limit to 20 assets
-                        break
-                    limited_assets[key] = value
+                if asset_type and asset_type != "all":
+                    if asset_type not in ["hdris", "textures", "models"]:
+                        return {"error": f"Invalid asset type: {asset_type}. Must be one of: hdris, textures, models, all"}
+                    params["type"] = asset_type
 
-                return {"assets": limited_assets, "total_count": len(assets), "returned_count": len(limited_assets)}
-            else:
-                return {"error": f"API request failed with status code {response.status_code}"}
-        except Exception as e:
-            return {"error": str(e)}
+                if categories:
+                    params["categories"] = categories
+
+                response = requests.get(url, params=params, headers=REQ_HEADERS)
+                if response.status_code == 200:
+                    # Limit the response size to avoid overwhelming Blender
+                    assets = response.json()
+                    # Return only the first 20 assets to keep response size manageable
+                    limited_assets = {}
+                    for i, (key, value) in enumerate(assets.items()):
+                        if i >= 20:  # Limit to 20 assets
+                            break
+                        limited_assets[key] = value
+
+                    return {"assets": limited_assets, "total_count": len(assets), "returned_count": len(limited_assets)}
+                else:
+                    return {"error": f"API request failed with status code {response.status_code}"}
+            except Exception as e:
+                return {"error": str(e)}
+
+        return BackgroundTask(fetch)
 
     def download_polyhaven_asset(self, asset_id, asset_type, resolution="1k", file_format=None):
+        """Download on the I/O pool, then build the world/material or import the model on the main thread"""
+        cache = self._get_asset_cache()
+        offline = bpy.context.scene.blendermcp_offline
+
+        def fetch(progress):
+            try:
+                return self._fetch_polyhaven_asset(asset_id, asset_type, resolution, file_format, progress, cache, offline)
+            except Exception as e:
+                return {"error": f"Failed to download asset: {str(e)}"}
+
+        return BackgroundTask(fetch)
+
+    def _fetch_polyhaven_asset(self, asset_id, asset_type, resolution, file_format, progress, cache=None, offline=False):
+        """Network phase of download_polyhaven_asset; runs on the I/O pool and never touches bpy"""
+        default_formats = {"hdris": "hdr", "textures": "jpg", "models": "gltf"}
+        if asset_type not in default_formats:
+            return {"error": f"Unsupported asset type: {asset_type}"}
+        if not file_format:
+            file_format = default_formats[asset_type]
+
+        # A cache hit skips the files API as well as the downloads
+        cache_key = AssetCache.make_key("polyhaven", asset_id, resolution, file_format)
+        hit = self._cache_lookup(cache, cache_key, progress)
+        if hit:
+            temp_dir, paths, meta = hit
+            if asset_type == "hdris":
+                return MainThreadStep(self._apply_polyhaven_hdri, asset_id, file_format, paths[f"{asset_id}.{file_format}"])
+            elif asset_type == "textures":
+                maps = {name.rsplit(".", 1)[0]: path for name, path in paths.items()}
+                return MainThreadStep(self._apply_polyhaven_textures, asset_id, file_format, maps)
+            else:
+                return MainThreadStep(self._apply_polyhaven_model, asset_id, file_format, temp_dir, paths[meta["main"]])
+        if offline:
+            return {"error": self._offline_miss(f"Poly Haven asset {asset_id} ({resolution}, {file_format})")}
+
+        # First get the files information
+        progress("Fetching file list")
+        files_response = requests.get(f"https://api.polyhaven.com/files/{asset_id}", headers=REQ_HEADERS)
+        if files_response.status_code != 200:
+            return {"error": f"Failed to get asset files: {files_response.status_code}"}
+
+        files_data = files_response.json()
+
+        # Handle different asset types
+        if asset_type == "hdris":
+            if "hdri" in files_data and resolution in files_data["hdri"] and file_format in files_data["hdri"][resolution]:
+                file_info = files_data["hdri"][resolution][file_format]
+                file_url = file_info["url"]
+
+                # For HDRIs, we need to save to a temporary file first
+                # since Blender can't properly load HDR data directly from memory
+                with tempfile.NamedTemporaryFile(suffix=f".{file_format}", delete=False) as tmp_file:
+                    tmp_path = tmp_file.name
+                status = stream_download(file_url, tmp_path, progress, f"{asset_id}.{file_format}", REQ_HEADERS)
+                if status != 200:
+                    with suppress(Exception):
+                        os.unlink(tmp_path)
+                    return {"error": f"Failed to download HDRI: {status}"}
+
+                self._cache_store(cache, cache_key, {f"{asset_id}.{file_format}": tmp_path})
+                return MainThreadStep(self._apply_polyhaven_hdri, asset_id, file_format, tmp_path)
+            else:
+                return {"error": f"Requested resolution or format not available for this HDRI"}
+
+        elif asset_type == "textures":
+            downloaded_paths = {}
+            try:
+                for map_type in files_data:
+                    if map_type not in ["blend", "gltf"]:  # Skip non-texture files
+                        if resolution in files_data[map_type] and file_format in files_data[map_type][resolution]:
+                            file_info = files_data[map_type][resolution][file_format]
+                            file_url = file_info["url"]
+
+                            # Use NamedTemporaryFile like we do for HDRIs
+                            with tempfile.NamedTemporaryFile(suffix=f".{file_format}", delete=False) as tmp_file:
+                                tmp_path = tmp_file.name
+                            status = stream_download(file_url, tmp_path, progress, f"{asset_id} {map_type}", REQ_HEADERS)
+                            if status == 200:
+                                downloaded_paths[map_type] = tmp_path
+                            else:
+                                with suppress(Exception):
+                                    os.unlink(tmp_path)
+            except Exception as e:
+                for tmp_path in downloaded_paths.values():
+                    with suppress(Exception):
+                        os.unlink(tmp_path)
+                return {"error": f"Failed to process textures: {str(e)}"}
+
+            if not downloaded_paths:
+                return {"error": f"No texture maps found for the requested resolution and format"}
+
+            self._cache_store(cache, cache_key, {f"{map_type}.{file_format}": path for map_type, path in downloaded_paths.items()})
+            return MainThreadStep(self._apply_polyhaven_textures, asset_id, file_format, downloaded_paths)
+
+        elif asset_type == "models":
+            if file_format in files_data and resolution in files_data[file_format]:
+                file_info = files_data[file_format][resolution][file_format]
+                file_url = file_info["url"]
+
+                # Create a temporary directory to store the model and its dependencies
+                temp_dir = tempfile.mkdtemp()
+
+                try:
+                    # Download the main model file
+                    main_file_name = file_url.split("/")[-1]
+                    main_file_path = os.path.join(temp_dir, main_file_name)
+
+                    status = stream_download(file_url, main_file_path, progress, main_file_name, REQ_HEADERS)
+                    if status != 200:
+                        with suppress(Exception):
+                            shutil.rmtree(temp_dir)
+                        return {"error": f"Failed to download model: {status}"}
+
+                    # Check for included files and download them
+                    if "include" in file_info and file_info["include"]:
+                        for include_path, include_info in file_info["include"].items():
+                            # Get the URL for the included file - this is the fix
+                            include_url = include_info["url"]
+
+                            # Create the directory structure for the included file
+                            include_file_path = os.path.join(temp_dir, include_path)
+                            os.makedirs(os.path.dirname(include_file_path), exist_ok=True)
+
+                            # Download the included file
+                            status = stream_download(include_url, include_file_path, progress, include_path, REQ_HEADERS)
+                            if status != 200:
+                                print(f"Failed to download included file: {include_path}")
+                except Exception as e:
+                    with suppress(Exception):
+                        shutil.rmtree(temp_dir)
+                    return {"error": f"Failed to import model: {str(e)}"}
+
+                files = {}
+                for dir_path, _, file_names in os.walk(temp_dir):
+                    for file_name in file_names:
+                        path = os.path.join(dir_path, file_name)
+                        files[os.path.relpath(path, temp_dir)] = path
+                self._cache_store(cache, cache_key, files, {"main": main_file_name})
+                return MainThreadStep(self._apply_polyhaven_model, asset_id, file_format, temp_dir, main_file_path)
+            else:
+                return {"error": f"Requested format or resolution not available for this model"}
+
+        else:
+            return {"error": f"Unsupported asset type: {asset_type}"}
+
+    def _apply_polyhaven_hdri(self, asset_id, file_format, tmp_path):
+        """Main thread phase: set the downloaded HDRI up as the world background"""
         try:
-            # First get the files information
-            files_response = requests.get(f"https://api.polyhaven.com/files/{asset_id}", headers=REQ_HEADERS)
-            if files_response.status_code != 200:
-                return {"error": f"Failed to get asset files: {files_response.status_code}"}
+            # Create a new world if none exists
+            if not bpy.data.worlds:
+                bpy.data.worlds.new("World")
 
-            files_data = files_response.json()
+            world = bpy.data.worlds[0]
+            world.use_nodes = True
+            node_tree = world.node_tree
 
-            # Handle different asset types
-            if asset_type == "hdris":
-                # For HDRIs, download the .hdr or .exr file
-                if not file_format:
-                    file_format = "hdr"  # Default format for HDRIs
+            # Clear existing nodes
+            for node in node_tree.nodes:
+                node_tree.nodes.remove(node)
 
-                if "hdri" in files_data and resolution in files_data["hdri"] and file_format in files_data["hdri"][resolution]:
-                    file_info = files_data["hdri"][resolution][file_format]
-                    file_url = file_info["url"]
+            # Create nodes
+            tex_coord = node_tree.nodes.new(type='ShaderNodeTexCoord')
+            tex_coord.location = (-800, 0)
 
-                    # For HDRIs, we need to save to a temporary file first
-                    # since Blender can't properly load HDR data directly from memory
-                    with tempfile.NamedTemporaryFile(suffix=f".{file_format}", delete=False) as tmp_file:
-                        # Download the file
-                        response = requests.get(file_url, headers=REQ_HEADERS)
-                        if response.status_code != 200:
-                            return {"error": f"Failed to download HDRI: {response.status_code}"}
+            mapping = node_tree.nodes.new(type='ShaderNodeMapping')
+            mapping.location = (-600, 0)
 
-                        tmp_file.write(response.content)
-                        tmp_path = tmp_file.name
+            # Load the image from the temporary file
+            env_tex = node_tree.nodes.new(type='ShaderNodeTexEnvironment')
+            env_tex.location = (-400, 0)
+            env_tex.image = bpy.data.images.load(tmp_path)
 
+            # Use a color space that exists in all Blender versions
+            if file_format.lower() == 'exr':
+                # Try to use Linear color space for EXR files
+                try:
+                    env_tex.image.colorspace_settings.name = 'Linear'
+                except:
+                    # Fallback to Non-Color if Linear isn't available
+                    env_tex.image.colorspace_settings.name = 'Non-Color'
+            else:  # hdr
+                # For HDR files, try these options in order
+                for color_space in ['Linear', 'Linear Rec.709', 'Non-Color']:
                     try:
-                        # Create a new world if none exists
-                        if not bpy.data.worlds:
-                            bpy.data.worlds.new("World")
-
-                        world = bpy.data.worlds[0]
-                        world.use_nodes = True
-                        node_tree = world.node_tree
-
-                        # Clear existing nodes
-                        for node in node_tree.nodes:
-                            node_tree.nodes.remove(node)
-
-                        # Create nodes
-                        tex_coord = node_tree.nodes.new(type='ShaderNodeTexCoord')
-                        tex_coord.location = (-800, 0)
-
-                        mapping = node_tree.nodes.new(type='ShaderNodeMapping')
-                        mapping.location = (-600, 0)
-
-                        # Load the image from the temporary file
-                        env_tex = node_tree.nodes.new(type='ShaderNodeTexEnvironment')
-                        env_tex.location = (-400, 0)
-                        env_tex.image = bpy.data.images.load(tmp_path)
-
-                        # Use a color space that exists in all Blender versions
-                        if file_format.lower() == 'exr':
-                            # Try to use Linear color space for EXR files
-                            try:
-                                env_tex.image.colorspace_settings.name = 'Linear'
-                            except:
-                                # Fallback to Non-Color if Linear isn't available
-                                env_tex.image.colorspace_settings.name = 'Non-Color'
-                        else:  # hdr
-                            # For HDR files, try these options in order
-                            for color_space in ['Linear', 'Linear Rec.709', 'Non-Color']:
-                                try:
-                                    env_tex.image.colorspace_settings.name = color_space
-                                    break  # Stop if we successfully set a color space
-                                except:
-                                    continue
-
-                        background = node_tree.nodes.new(type='ShaderNodeBackground')
-                        background.location = (-200, 0)
-
-                        output = node_tree.nodes.new(type='ShaderNodeOutputWorld')
-                        output.location = (0, 0)
-
-                        # Connect nodes
-                        node_tree.links.new(tex_coord.outputs['Generated'], mapping.inputs['Vector'])
-                        node_tree.links.new(mapping.outputs['Vector'], env_tex.inputs['Vector'])
-                        node_tree.links.new(env_tex.outputs['Color'], background.inputs['Color'])
-                        node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
-
-                        # Set as active world
-                        bpy.context.scene.world = world
-
-                        # Clean up temporary file
-                        try:
-                            tempfile._cleanup()  # This will clean up all temporary files
-                        except:
-                            pass
+                        env_tex.image.colorspace_settings.name = color_space
+                        break  # Stop if we successfully set a color space
+                    except:
+                        continue
 
-                        return {
-                            "success": True,
-                            "message": f"HDRI {asset_id} imported successfully",
-                            "image_name": env_tex.image.name
-                        }
-                    except Exception as e:
-                        return {"error": f"Failed to set up HDRI in Blender: {str(e)}"}
-                else:
-                    return {"error": f"Requested resolution or format not available for this HDRI"}
+            background = node_tree.nodes.new(type='ShaderNodeBackground')
+            background.location = (-200, 0)
 
-            elif asset_type == "textures":
-                if not file_format:
-                    file_format = "jpg"  # Default format for textures
+            output = node_tree.nodes.new(type='ShaderNodeOutputWorld')
+            output.location = (0, 0)
 
-                downloaded_maps = {}
+            # Connect nodes
+            node_tree.links.new(tex_coord.outputs['Generated'], mapping.inputs['Vector'])
+            node_tree.links.new(mapping.outputs['Vector'], env_tex.inputs['Vector'])
+            node_tree.links.new(env_tex.outputs['Color'], background.inputs['Color'])
+            node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
 
-                try:
-                    for map_type in files_data:
-                        if map_type not in ["blend", "gltf"]:  # Skip non-texture files
-                            if resolution in files_data[map_type] and file_format in files_data[map_type][resolution]:
-                                file_info = files_data[map_type][resolution][file_format]
-                                file_url = file_info["url"]
-
-                                # Use NamedTemporaryFile like we do for HDRIs
-                                with tempfile.NamedTemporaryFile(suffix=f".{file_format}", delete=False) as tmp_file:
-                                    # Download the file
-                                    response = requests.get(file_url, headers=REQ_HEADERS)
-                                    if response.status_code == 200:
-                                        tmp_file.write(response.content)
-                                        tmp_path = tmp_file.name
-
-                                        # Load image from temporary file
-                                        image = bpy.data.images.load(tmp_path)
-                                        image.name = f"{asset_id}_{map_type}.{file_format}"
-
-                                        # Pack the image into .blend file
-                                        image.pack()
-
-                                        # Set color space based on map type
-                                        if map_type in ['color', 'diffuse', 'albedo']:
-                                            try:
-                                                image.colorspace_settings.name = 'sRGB'
-                                            except:
-                                                pass
-                                        else:
-                                            try:
-                                                image.colorspace_settings.name = 'Non-Color'
-                                            except:
-                                                pass
-
-                                        downloaded_maps[map_type] = image
-
-                                        # Clean up temporary file
-                                        try:
-                                            os.unlink(tmp_path)
-                                        except:
-                                            pass
-
-                    if not downloaded_maps:
-                        return {"error": f"No texture maps found for the requested resolution and format"}
-
-                    # Create a new material with the downloaded textures
-                    mat = bpy.data.materials.new(name=asset_id)
-                    mat.use_nodes = True
-                    nodes = mat.node_tree.nodes
-                    links = mat.node_tree.links
-
-                    # Clear default nodes
-                    for node in nodes:
-                        nodes.remove(node)
-
-                    # Create output node
-                    output = nodes.new(type='ShaderNodeOutputMaterial')
-                    output.location = (300, 0)
-
-                    # Create principled BSDF node
-                    principled = nodes.new(type='ShaderNodeBsdfPrincipled')
-                    principled.location = (0, 0)
-                    links.new(principled.outputs[0], output.inputs[0])
-
-                    # Add texture nodes based on available maps
-                    tex_coord = nodes.new(type='ShaderNodeTexCoord')
-                    tex_coord.location = (-800, 0)
-
-                    mapping = nodes.new(type='ShaderNodeMapping')
-                    mapping.location = (-600, 0)
-                    mapping.vector_type = 'TEXTURE'  # Changed from default 'POINT' to 'TEXTURE'
-                    links.new(tex_coord.outputs['UV'], mapping.inputs['Vector'])
-
-                    # Position offset for texture nodes
-                    x_pos = -400
-                    y_pos = 300
-
-                    # Connect different texture maps
-                    for map_type, image in downloaded_maps.items():
-                        tex_node = nodes.new(type='ShaderNodeTexImage')
-                        tex_node.location = (x_pos, y_pos)
-                        tex_node.image = image
-
-                        # Set color space based on map type
-                        if map_type.lower() in ['color', 'diffuse', 'albedo']:
-                            try:
-                                tex_node.image.colorspace_settings.name = 'sRGB'
-                            except:
-                                pass  # Use default if sRGB not available
-                        else:
-                            try:
-                                tex_node.image.colorspace_settings.name = 'Non-Color'
-                            except:
-                                pass  # Use default if Non-Color not available
-
-                        links.new(mapping.outputs['Vector'], tex_node.inputs['Vector'])
-
-                        # Connect to appropriate input on Principled BSDF
-                        if map_type.lower() in ['color', 'diffuse', 'albedo']:
-                            links.new(tex_node.outputs['Color'], principled.inputs['Base Color'])
-                        elif map_type.lower() in ['roughness', 'rough']:
-                            links.new(tex_node.outputs['Color'], principled.inputs['Roughness'])
-                        elif map_type.lower() in ['metallic', 'metalness', 'metal']:
-                            links.new(tex_node.outputs['Color'], principled.inputs['Metallic'])
-                        elif map_type.lower() in ['normal', 'nor']:
-                            # Add normal map node
-                            normal_map = nodes.new(type='ShaderNodeNormalMap')
-                            normal_map.location = (x_pos + 200, y_pos)
-                            links.new(tex_node.outputs['Color'], normal_map.inputs['Color'])
-                            links.new(normal_map.outputs['Normal'], principled.inputs['Normal'])
-                        elif map_type in ['displacement', 'disp', 'height']:
-                            # Add displacement node
-                            disp_node = nodes.new(type='ShaderNodeDisplacement')
-                            disp_node.location = (x_pos + 200, y_pos - 200)
-                            links.new(tex_node.outputs['Color'], disp_node.inputs['Height'])
-                            links.new(disp_node.outputs['Displacement'], output.inputs['Displacement'])
-
-                        y_pos -= 250
+            # Set as active world
+            bpy.context.scene.world = world
 
-                    return {
-                        "success": True,
-                        "message": f"Texture {asset_id} imported as material",
-                        "material": mat.name,
-                        "maps": list(downloaded_maps.keys())
-                    }
+            # Clean up temporary file
+            try:
+                tempfile._cleanup()  # This will clean up all temporary files
+            except:
+                pass
 
-                except Exception as e:
-                    return {"error": f"Failed to process textures: {str(e)}"}
+            return {
+                "success": True,
+                "message": f"HDRI {asset_id} imported successfully",
+                "image_name": env_tex.image.name
+            }
+        except Exception as e:
+            return {"error": f"Failed to set up HDRI in Blender: {str(e)}"}
 
-            elif asset_type == "models":
-                # For models, prefer glTF format if available
-                if not file_format:
-                    file_format = "gltf"  # Default format for models
+    def _apply_polyhaven_textures(self, asset_id, file_format, downloaded_paths):
+        """Main thread phase: load the downloaded maps and build a material from them"""
+        downloaded_maps = {}
 
-                if file_format in files_data and resolution in files_data[file_format]:
-                    file_info = files_data[file_format][resolution][file_format]
-                    file_url = file_info["url"]
+        try:
+            for map_type, tmp_path in downloaded_paths.items():
+                # Load image from temporary file
+                image = bpy.data.images.load(tmp_path)
+                image.name = f"{asset_id}_{map_type}.{file_format}"
 
-                    # Create a temporary directory to store the model and its dependencies
-                    temp_dir = tempfile.mkdtemp()
-                    main_file_path = ""
+                # Pack the image into .blend file
+                image.pack()
 
+                # Set color space based on map type
+                if map_type in ['color', 'diffuse', 'albedo']:
                     try:
-                        # Download the main model file
-                        main_file_name = file_url.split("/")[-1]
-                        main_file_path = os.path.join(temp_dir, main_file_name)
-
-                        response = requests.get(file_url, headers=REQ_HEADERS)
-                        if response.status_code != 200:
-                            return {"error": f"Failed to download model: {response.status_code}"}
-
-                        with open(main_file_path, "wb") as f:
-                            f.write(response.content)
-
-                        # Check for included files and download them
-                        if "include" in file_info and file_info["include"]:
-                            for include_path, include_info in file_info["include"].items():
-                                # Get the URL for the included file - this is the fix
-                                include_url = include_info["url"]
-
-                                # Create the directory structure for the included file
-                                include_file_path = os.path.join(temp_dir, include_path)
-                                os.makedirs(os.path.dirname(include_file_path), exist_ok=True)
-
-                                # Download the included file
-                                include_response = requests.get(include_url, headers=REQ_HEADERS)
-                                if include_response.status_code == 200:
-                                    with open(include_file_path, "wb") as f:
-                                        f.write(include_response.content)
-                                else:
-                                    print(f"Failed to download included file: {include_path}")
-
-                        # Import the model into Blender
-                        if file_format == "gltf" or file_format == "glb":
-                            bpy.ops.import_scene.gltf(filepath=main_file_path)
-                        elif file_format == "fbx":
-                            bpy.ops.import_scene.fbx(filepath=main_file_path)
-                        elif file_format == "obj":
-                            bpy.ops.import_scene.obj(filepath=main_file_path)
-                        elif file_format == "blend":
-                            # For blend files, we need to append or link
-                            with bpy.data.libraries.load(main_file_path, link=False) as (data_from, data_to):
-                                data_to.objects = data_from.objects
-
-                            # Link the objects to the scene
-                            for obj in data_to.objects:
-                                if obj is not None:
-                                    bpy.context.collection.objects.link(obj)
-                        else:
-                            return {"error": f"Unsupported model format: {file_format}"}
+                        image.colorspace_settings.name = 'sRGB'
+                    except:
+                        pass
+                else:
+                    try:
+                        image.colorspace_settings.name = 'Non-Color'
+                    except:
+                        pass
 
-                        # Get the names of imported objects
-                        imported_objects = [obj.name for obj in bpy.context.selected_objects]
+                downloaded_maps[map_type] = image
 
-                        return {
-                            "success": True,
-                            "message": f"Model {asset_id} imported successfully",
-                            "imported_objects": imported_objects
-                        }
-                    except Exception as e:
-                        return {"error": f"Failed to import model: {str(e)}"}
-                    finally:
-                        # Clean up temporary directory
-                        with suppress(Exception):
-                            shutil.rmtree(temp_dir)
+                # Clean up temporary file
+                try:
+                    os.unlink(tmp_path)
+                except:
+                    pass
+
+            # Create a new material with the downloaded textures
+            mat = bpy.data.materials.new(name=asset_id)
+            mat.use_nodes = True
+            nodes = mat.node_tree.nodes
+            links = mat.node_tree.links
+
+            # Clear default nodes
+            for node in nodes:
+                nodes.remove(node)
+
+            # Create output node
+            output = nodes.new(type='ShaderNodeOutputMaterial')
+            output.location = (300, 0)
+
+            # Create principled BSDF node
+            principled = nodes.new(type='ShaderNodeBsdfPrincipled')
+            principled.location = (0, 0)
+            links.new(principled.outputs[0], output.inputs[0])
+
+            # Add texture nodes based on available maps
+            tex_coord = nodes.new(type='ShaderNodeTexCoord')
+            tex_coord.location = (-800, 0)
+
+            mapping = nodes.new(type='ShaderNodeMapping')
+            mapping.location = (-600, 0)
+            mapping.vector_type = 'TEXTURE'  # Changed from default 'POINT' to 'TEXTURE'
+            links.new(tex_coord.outputs['UV'], mapping.inputs['Vector'])
+
+            # Position offset for texture nodes
+            x_pos = -400
+            y_pos = 300
+
+            # Connect different texture maps
+            for map_type, image in downloaded_maps.items():
+                tex_node = nodes.new(type='ShaderNodeTexImage')
+                tex_node.location = (x_pos, y_pos)
+                tex_node.image = image
+
+                # Set color space based on map type
+                if map_type.lower() in ['color', 'diffuse', 'albedo']:
+                    try:
+                        tex_node.image.colorspace_settings.name = 'sRGB'
+                    except:
+                        pass  # Use default if sRGB not available
                 else:
-                    return {"error": f"Requested format or resolution not available for this model"}
+                    try:
+                        tex_node.image.colorspace_settings.name = 'Non-Color'
+                    except:
+                        pass  # Use default if Non-Color not available
+
+                links.new(mapping.outputs['Vector'], tex_node.inputs['Vector'])
 
+                # Connect to appropriate input on Principled BSDF
+                if map_type.lower() in ['color', 'diffuse', 'albedo']:
+                    links.new(tex_node.outputs['Color'], principled.inputs['Base Color'])
+                elif map_type.lower() in ['roughness', 'rough']:
+                    links.new(tex_node.outputs['Color'], principled.inputs['Roughness'])
+                elif map_type.lower() in ['metallic', 'metalness', 'metal']:
+                    links.new(tex_node.outputs['Color'], principled.inputs['Metallic'])
+                elif map_type.lower() in ['normal', 'nor']:
+                    # Add normal map node
+                    normal_map = nodes.new(type='ShaderNodeNormalMap')
+                    normal_map.location = (x_pos + 200, y_pos)
+                    links.new(tex_node.outputs['Color'], normal_map.inputs['Color'])
+                    links.new(normal_map.outputs['Normal'], principled.inputs['Normal'])
+                elif map_type in ['displacement', 'disp', 'height']:
+                    # Add displacement node
+                    disp_node = nodes.new(type='ShaderNodeDisplacement')
+                    disp_node.location = (x_pos + 200, y_pos - 200)
+                    links.new(tex_node.outputs['Color'], disp_node.inputs['Height'])
+                    links.new(disp_node.outputs['Displacement'], output.inputs['Displacement'])
+
+                y_pos -= 250
+
+            return {
+                "success": True,
+                "message": f"Texture {asset_id} imported as material",
+                "material": mat.name,
+                "maps": list(downloaded_maps.keys())
+            }
+
+        except Exception as e:
+            return {"error": f"Failed to process textures: {str(e)}"}
+
+    def _apply_polyhaven_model(self, asset_id, file_format, temp_dir, main_file_path):
+        """Main thread phase: import the downloaded model files"""
+        try:
+            # Import the model into Blender
+            if file_format == "gltf" or file_format == "glb":
+                bpy.ops.import_scene.gltf(filepath=main_file_path)
+            elif file_format == "fbx":
+                bpy.ops.import_scene.fbx(filepath=main_file_path)
+            elif file_format == "obj":
+                bpy.ops.import_scene.obj(filepath=main_file_path)
+            elif file_format == "blend":
+                # For blend files, we need to append or link
+                with bpy.data.libraries.load(main_file_path, link=False) as (data_from, data_to):
+                    data_to.objects = data_from.objects
+
+                # Link the objects to the scene
+                for obj in data_to.objects:
+                    if obj is not None:
+                        bpy.context.collection.objects.link(obj)
             else:
-                return {"error": f"Unsupported asset type: {asset_type}"}
+                return {"error": f"Unsupported model format: {file_format}"}
+
+            # Get the names of imported objects
+            imported_objects = [obj.name for obj in bpy.context.selected_objects]
 
+            return {
+                "success": True,
+                "message": f"Model {asset_id} imported successfully",
+                "imported_objects": imported_objects
+            }
         except Exception as e:
-            return {"error": f"Failed to download asset: {str(e)}"}
+            return {"error": f"Failed to import model: {str(e)}"}
+        finally:
+            # Clean up temporary directory
+            with suppress(Exception):
+                shutil.rmtree(temp_dir)
 
     def set_texture(self, object_name, texture_id):
         """Apply a previously downloaded Polyhaven texture to an object by creating a new material"""
@@ -1189,30 +2548,33 @@ class BlenderMCPServer:
             images: list[tuple[str, str]]=None,
             bbox_condition=None
         ):
-        try:
-            if images is None:
-                images = []
-            """Call Rodin API, get the job uuid and subscription key"""
-            files = [
-                *[("images", (f"{i:04d}{img_suffix}", img)) for i, (img_suffix, img) in enumerate(images)],
-                ("tier", (None, "Sketch")),
-                ("mesh_mode", (None, "Raw")),
-            ]
-            if text_prompt:
-                files.append(("prompt", (None, text_prompt)))
-            if bbox_condition:
-                files.append(("bbox_condition", (None, json.dumps(bbox_condition))))
-            response = requests.post(
-                "https://hyperhuman.deemos.com/api/v2/rodin",
-                headers={
-                    "Authorization": f"Bearer {bpy.context.scene.blendermcp_hyper3d_api_key}",
-                },
-                files=files
-            )
-            data = response.json()
-            return data
-        except Exception as e:
-            return {"error": str(e)}
+        """Call Rodin API, get the job uuid and subscription key"""
+        api_key = bpy.context.scene.blendermcp_hyper3d_api_key
+
+        def fetch(progress):
+            try:
+                files = [
+                    *[("images", (f"{i:04d}{img_suffix}", img)) for i, (img_suffix, img) in enumerate(images or [])],
+                    ("tier", (None, "Sketch")),
+                    ("mesh_mode", (None, "Raw")),
+                ]
+                if text_prompt:
+                    files.append(("prompt", (None, text_prompt)))
+                if bbox_condition:
+                    files.append(("bbox_condition", (None, json.dumps(bbox_condition))))
+                response = requests.post(
+                    "https://hyperhuman.deemos.com/api/v2/rodin",
+                    headers={
+                        "Authorization": f"Bearer {api_key}",
+                    },
+                    files=files
+                )
+                data = response.json()
+                return data
+            except Exception as e:
+                return {"error": str(e)}
+
+        return BackgroundTask(fetch)
 
     def create_rodin_job_fal_ai(
             self,
@@ -1220,28 +2582,33 @@ class BlenderMCPServer:
             images: list[tuple[str, str]]=None,
             bbox_condition=None
         ):
-        try:
-            req_data = {
-                "tier": "Sketch",
-            }
-            if images:
-                req_data["input_image_urls"] = images
-            if text_prompt:
-                req_data["prompt"] = text_prompt
-            if bbox_condition:
-                req_data["bbox_condition"] = bbox_condition
-            response = requests.post(
-                "https://queue.fal.run/fal-ai/hyper3d/rodin",
-                headers={
-                    "Authorization": f"Key {bpy.context.scene.blendermcp_hyper3d_api_key}",
-                    "Content-Type": "application/json",
-                },
-                json=req_data
-            )
-            data = response.json()
-            return data
-        except Exception as e:
-            return {"error": str(e)}
+        api_key = bpy.context.scene.blendermcp_hyper3d_api_key
+
+        def fetch(progress):
+            try:
+                req_data = {
+                    "tier": "Sketch",
+                }
+                if images:
+                    req_data["input_image_urls"] = images
+                if text_prompt:
+                    req_data["prompt"] = text_prompt
+                if bbox_condition:
+                    req_data["bbox_condition"] = bbox_condition
+                response = requests.post(
+                    "https://queue.fal.run/fal-ai/hyper3d/rodin",
+                    headers={
+                        "Authorization": f"Key {api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    json=req_data
+                )
+                data = response.json()
+                return data
+            except Exception as e:
+                return {"error": str(e)}
+
+        return BackgroundTask(fetch)
 
     def poll_rodin_job_status(self, *args, **kwargs):
         match bpy.context.scene.blendermcp_hyper3d_mode:
@@ -1254,30 +2621,40 @@ class BlenderMCPServer:
 
     def poll_rodin_job_status_main_site(self, subscription_key: str):
         """Call the job status API to get the job status"""
-        response = requests.post(
-            "https://hyperhuman.deemos.com/api/v2/status",
-            headers={
-                "Authorization": f"Bearer {bpy.context.scene.blendermcp_hyper3d_api_key}",
-            },
-            json={
-                "subscription_key": subscription_key,
-            },
-        )
-        data = response.json()
-        return {
-            "status_list": [i["status"] for i in data["jobs"]]
-        }
+        api_key = bpy.context.scene.blendermcp_hyper3d_api_key
+
+        def fetch(progress):
+            response = requests.post(
+                "https://hyperhuman.deemos.com/api/v2/status",
+                headers={
+                    "Authorization": f"Bearer {api_key}",
+                },
+                json={
+                    "subscription_key": subscription_key,
+                },
+            )
+            data = response.json()
+            return {
+                "status_list": [i["status"] for i in data["jobs"]]
+            }
+
+        return BackgroundTask(fetch)
 
     def poll_rodin_job_status_fal_ai(self, request_id: str):
         """Call the job status API to get the job status"""
-        response = requests.get(
-            f"https://queue.fal.run/fal-ai/hyper3d/requests/{request_id}/status",
-            headers={
-                "Authorization": f"KEY {bpy.context.scene.blendermcp_hyper3d_api_key}",
-            },
-        )
-        data = response.json()
-        return data
+        api_key = bpy.context.scene.blendermcp_hyper3d_api_key
+
+        def fetch(progress):
+            response = requests.get(
+                f"https://queue.fal.run/fal-ai/hyper3d/requests/{request_id}/status",
+                headers={
+                    "Authorization": f"KEY {api_key}",
+                },
+            )
+            data = response.json()
+            return data
+
+        return BackgroundTask(fetch)
 
     @staticmethod
     def _clean_imported_glb(filepath, mesh_name=None):
@@ -1357,108 +2734,92 @@ class BlenderMCPServer:
 
     def import_generated_asset_main_site(self, task_uuid: str, name: str):
         """Fetch the generated asset, import into blender"""
-        response = requests.post(
-            "https://hyperhuman.deemos.com/api/v2/download",
-            headers={
-                "Authorization": f"Bearer {bpy.context.scene.blendermcp_hyper3d_api_key}",
-            },
-            json={
-                'task_uuid': task_uuid
-            }
-        )
-        data_ = response.json()
-        temp_file = None
-        for i in data_["list"]:
-            if i["name"].endswith(".glb"):
-                temp_file = tempfile.NamedTemporaryFile(
-                    delete=False,
-                    prefix=task_uuid,
-                    suffix=".glb",
-                )
-
-                try:
-                    # Download the content
-                    response = requests.get(i["url"], stream=True)
-                    response.raise_for_status()  # Raise an exception for HTTP errors
-
-                    # Write the content to the temporary file
-                    for chunk in response.iter_content(chunk_size=8192):
-                        temp_file.write(chunk)
-
-                    # Close the file
-                    temp_file.close()
-
-                except Exception as e:
-                    # Clean up the file if there's an error
-                    temp_file.close()
-                    os.unlink(temp_file.name)
-                    return {"succeed": False, "error": str(e)}
-
-                break
-        else:
-            return {"succeed": False, "error": "Generation failed. Please first make sure that all jobs of the task are done and then try again later."}
-
-        try:
-            obj = self._clean_imported_glb(
-                filepath=temp_file.name,
-                mesh_name=name
+        api_key = bpy.context.scene.blendermcp_hyper3d_api_key
+        cache = self._get_asset_cache()
+        cache_key = AssetCache.make_key("rodin", task_uuid, None, "glb")
+        offline = bpy.context.scene.blendermcp_offline
+
+        def fetch(progress):
+            step = self._cached_generated_glb(cache, cache_key, name, progress)
+            if step:
+                return step
+            if offline:
+                return {"succeed": False, "error": self._offline_miss(f"Rodin task {task_uuid}")}
+            response = requests.post(
+                "https://hyperhuman.deemos.com/api/v2/download",
+                headers={
+                    "Authorization": f"Bearer {api_key}",
+                },
+                json={
+                    'task_uuid': task_uuid
+                }
             )
-            result = {
-                "name": obj.name,
-                "type": obj.type,
-                "location": [obj.location.x, obj.location.y, obj.location.z],
-                "rotation": [obj.rotation_euler.x, obj.rotation_euler.y, obj.rotation_euler.z],
-                "scale": [obj.scale.x, obj.scale.y, obj.scale.z],
-            }
-
-            if obj.type == "MESH":
-                bounding_box = self._get_aabb(obj)
-                result["world_bounding_box"] = bounding_box
+            data_ = response.json()
+            for i in data_["list"]:
+                if i["name"].endswith(".glb"):
+                    return self._download_generated_glb(i["url"], task_uuid, name, progress, cache, cache_key)
+            return {"succeed": False, "error": "Generation failed. Please first make sure that all jobs of the task are done and then try again later."}
 
-            return {
-                "succeed": True, **result
-            }
-        except Exception as e:
-            return {"succeed": False, "error": str(e)}
+        return BackgroundTask(fetch)
 
     def import_generated_asset_fal_ai(self, request_id: str, name: str):
         """Fetch the generated asset, import into blender"""
-        response = requests.get(
-            f"https://queue.fal.run/fal-ai/hyper3d/requests/{request_id}",
-            headers={
-                "Authorization": f"Key {bpy.context.scene.blendermcp_hyper3d_api_key}",
-            }
-        )
-        data_ = response.json()
-        temp_file = None
+        api_key = bpy.context.scene.blendermcp_hyper3d_api_key
+        cache = self._get_asset_cache()
+        cache_key = AssetCache.make_key("rodin", request_id, None, "glb")
+        offline = bpy.context.scene.blendermcp_offline
+
+        def fetch(progress):
+            step = self._cached_generated_glb(cache, cache_key, name, progress)
+            if step:
+                return step
+            if offline:
+                return {"succeed": False, "error": self._offline_miss(f"Rodin request {request_id}")}
+            response = requests.get(
+                f"https://queue.fal.run/fal-ai/hyper3d/requests/{request_id}",
+                headers={
+                    "Authorization": f"Key {api_key}",
+                }
+            )
+            data_ = response.json()
+            return self._download_generated_glb(data_["model_mesh"]["url"], request_id, name, progress, cache, cache_key)
+
+        return BackgroundTask(fetch)
 
+    def _cached_generated_glb(self, cache, cache_key, name, progress):
+        """MainThreadStep importing a previously downloaded generated GLB, or None on a cache miss"""
+        hit = self._cache_lookup(cache, cache_key, progress)
+        if hit is None:
+            return None
+        _, paths, _ = hit
+        return MainThreadStep(self._import_generated_glb, paths["model.glb"], name)
+
+    def _download_generated_glb(self, url, prefix, name, progress, cache=None, cache_key=None):
+        """Download a generated GLB to a temporary file and hand the import to the main thread"""
         temp_file = tempfile.NamedTemporaryFile(
             delete=False,
-            prefix=request_id,
+            prefix=prefix,
             suffix=".glb",
         )
+        temp_file.close()
 
         try:
-            # Download the content
-            response = requests.get(data_["model_mesh"]["url"], stream=True)
-            response.raise_for_status()  # Raise an exception for HTTP errors
-
-            # Write the content to the temporary file
-            for chunk in response.iter_content(chunk_size=8192):
-                temp_file.write(chunk)
-
-            # Close the file
-            temp_file.close()
-
+            status = stream_download(url, temp_file.name, progress, f"{name or prefix}.glb")
+            if status != 200:
+                raise requests.HTTPError(f"{status} Error for url: {url}")
         except Exception as e:
             # Clean up the file if there's an error
-            temp_file.close()
             os.unlink(temp_file.name)
             return {"succeed": False, "error": str(e)}
 
+        self._cache_store(cache, cache_key, {"model.glb": temp_file.name})
+        return MainThreadStep(self._import_generated_glb, temp_file.name, name)
+
+    def _import_generated_glb(self, filepath, name):
+        """Main thread phase of the Rodin imports"""
         try:
             obj = self._clean_imported_glb(
-                filepath=temp_file.name,
+                filepath=filepath,
                 mesh_name=name
             )
             result = {
@@ -1486,210 +2847,222 @@ class BlenderMCPServer:
         enabled = bpy.context.scene.blendermcp_use_sketchfab
         api_key = bpy.context.scene.blendermcp_sketchfab_api_key
 
-        # Test the API key if present
-        if api_key:
-            try:
-                headers = {
-                    "Authorization": f"Token {api_key}"
-                }
+        def fetch(progress):
+            # Test the API key if present
+            if api_key:
+                try:
+                    headers = {
+                        "Authorization": f"Token {api_key}"
+                    }
 
-                response = requests.get(
-                    "https://api.sketchfab.com/v3/me",
-                    headers=headers,
-                    timeout=30  # Add timeout of 30 seconds
-                )
+                    response = requests.get(
+                        "https://api.sketchfab.com/v3/me",
+                        headers=headers,
+                        timeout=30  # Add timeout of 30 seconds
+                    )
 
-                if response.status_code == 200:
-                    user_data = response.json()
-                    username = user_data.get("username", "Unknown user")
+                    if response.status_code == 200:
+                        user_data = response.json()
+                        username = user_data.get("username", "Unknown user")
+                        return {
+                            "enabled": True,
+                            "message": f"Sketchfab integration is enabled and ready to use. Logged in as: {username}"
+                        }
+                    else:
+                        return {
+                            "enabled": False,
+                            "message": f"Sketchfab API key seems invalid. Status code: {response.status_code}"
+                        }
+                except requests.exceptions.Timeout:
                     return {
-                        "enabled": True,
-                        "message": f"Sketchfab integration is enabled and ready to use. Logged in as: {username}"
+                        "enabled": False,
+                        "message": "Timeout connecting to Sketchfab API. Check your internet connection."
                     }
-                else:
+                except Exception as e:
                     return {
                         "enabled": False,
-                        "message": f"Sketchfab API key seems invalid. Status code: {response.status_code}"
+                        "message": f"Error testing Sketchfab API key: {str(e)}"
                     }
-            except requests.exceptions.Timeout:
-                return {
-                    "enabled": False,
-                    "message": "Timeout connecting to Sketchfab API. Check your internet connection."
-                }
-            except Exception as e:
+
+            if enabled and api_key:
+                return {"enabled": True, "message": "Sketchfab integration is enabled and ready to use."}
+            elif enabled and not api_key:
                 return {
                     "enabled": False,
-                    "message": f"Error testing Sketchfab API key: {str(e)}"
-                }
-
-        if enabled and api_key:
-            return {"enabled": True, "message": "Sketchfab integration is enabled and ready to use."}
-        elif enabled and not api_key:
-            return {
-                "enabled": False,
-                "message": """Sketchfab integration is currently enabled, but API key is not given. To enable it:
+                    "message": """Sketchfab integration is currently enabled, but API key is not given. To enable it:
                             1. In the 3D Viewport, find the BlenderMCP panel in the sidebar (press N if hidden)
                             2. Keep the 'Use Sketchfab' checkbox checked
-                            3. Enter your Sketchfab API Key
-                            4. Restart the connection to Claude"""
-            }
-        else:
-            return {
-                "enabled": False,
-                "message": """Sketchfab integration is currently disabled. To enable it:
+                            3. Enter your Sketchfab API Key
+                            4. Restart the connection to Claude"""
+                }
+            else:
+                return {
+                    "enabled": False,
+                    "message": """Sketchfab integration is currently disabled. To enable it:
                             1. In the 3D Viewport, find the BlenderMCP panel in the sidebar (press N if hidden)
                             2. Check the 'Use assets from Sketchfab' checkbox
                             3. Enter your Sketchfab API Key
                             4. Restart the connection to Claude"""
-            }
+                }
+
+        # Without a key there is nothing to test, answer straight away
+        if not api_key:
+            return fetch(None)
+        return BackgroundTask(fetch)
 
     def search_sketchfab_models(self, query, categories=None, count=20, downloadable=True):
         """Search for models on Sketchfab based on query and optional filters"""
-        try:
-            api_key = bpy.context.scene.blendermcp_sketchfab_api_key
-            if not api_key:
-                return {"error": "Sketchfab API key is not configured"}
-
-            # Build search parameters with exact fields from Sketchfab API docs
-            params = {
-                "type": "models",
-                "q": query,
-                "count": count,
-                "downloadable": downloadable,
-                "archives_flavours": False
-            }
+        api_key = bpy.context.scene.blendermcp_sketchfab_api_key
+        if not api_key:
+            return {"error": "Sketchfab API key is not configured"}
 
-            if categories:
-                params["categories"] = categories
+        def fetch(progress):
+            try:
+                # Build search parameters with exact fields from Sketchfab API docs
+                params = {
+                    "type": "models",
+                    "q": query,
+                    "count": count,
+                    "downloadable": downloadable,
+                    "archives_flavours": False
+                }
 
-            # Make API request to Sketchfab search endpoint
-            # The proper format according to Sketchfab API docs for API key auth
-            headers = {
-                "Authorization": f"Token {api_key}"
-            }
+                if categories:
+                    params["categories"] = categories
 
+                # Make API request to Sketchfab search endpoint
+                # The proper format according to Sketchfab API docs for API key auth
+                headers = {
+                    "Authorization": f"Token {api_key}"
+                }
 
-            # Use the search endpoint as specified in the API documentation
-            response = requests.get(
-                "https://api.sketchfab.com/v3/search",
-                headers=headers,
-                params=params,
-                timeout=30  # Add timeout of 30 seconds
-            )
 
-            if response.status_code == 401:
-                return {"error": "Authentication failed (401). Check your API key."}
+                # Use the search endpoint as specified in the API documentation
+                response = requests.get(
+                    "https://api.sketchfab.com/v3/search",
+                    headers=headers,
+                    params=params,
+                    timeout=30  # Add timeout of 30 seconds
+                )
 
-            if response.status_code != 200:
-                return {"error": f"API request failed with status code {response.status_code}"}
+                if response.status_code == 401:
+                    return {"error": "Authentication failed (401). Check your API key."}
 
-            response_data = response.json()
+                if response.status_code != 200:
+                    return {"error": f"API request failed with status code {response.status_code}"}
 
-            # Safety check on the response structure
-            if response_data is None:
-                return {"error": "Received empty response from Sketchfab API"}
+                response_data = response.json()
 
-            # Handle 'results' potentially missing from response
-            results = response_data.get("results", [])
-            if not isinstance(results, list):
-                return {"error": f"Unexpected response format from Sketchfab API: {response_data}"}
+                # Safety check on the response structure
+                if response_data is None:
+                    return {"error": "Received empty response from Sketchfab API"}
 
-            return response_data
+                # Handle 'results' potentially missing from response
+                results = response_data.get("results", [])
+                if not isinstance(results, list):
+                    return {"error": f"Unexpected response format from Sketchfab API: {response_data}"}
 
-        except requests.exceptions.Timeout:
-            return {"error": "Request timed out. Check your internet connection."}
-        except json.JSONDecodeError as e:
-            return {"error": f"Invalid JSON response from Sketchfab API: {str(e)}"}
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return {"error": str(e)}
+                return response_data
+
+            except requests.exceptions.Timeout:
+                return {"error": "Request timed out. Check your internet connection."}
+            except json.JSONDecodeError as e:
+                return {"error": f"Invalid JSON response from Sketchfab API: {str(e)}"}
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                return {"error": str(e)}
+
+        return BackgroundTask(fetch)
 
     def get_sketchfab_model_preview(self, uid):
         """Get thumbnail preview image of a Sketchfab model by its UID"""
-        try:
-            import base64
-            
-            api_key = bpy.context.scene.blendermcp_sketchfab_api_key
-            if not api_key:
-                return {"error": "Sketchfab API key is not configured"}
+        api_key = bpy.context.scene.blendermcp_sketchfab_api_key
+        if not api_key:
+            return {"error": "Sketchfab API key is not configured"}
 
-            headers = {"Authorization": f"Token {api_key}"}
-            
-            # Get model info which includes thumbnails
-            response = requests.get(
-                f"https://api.sketchfab.com/v3/models/{uid}",
-                headers=headers,
-                timeout=30
-            )
-            
-            if response.status_code == 401:
-                return {"error": "Authentication failed (401). Check your API key."}
-            
-            if response.status_code == 404:
-                return {"error": f"Model not found: {uid}"}
-            
-            if response.status_code != 200:
-                return {"error": f"Failed to get model info: {response.status_code}"}
-            
-            data = response.json()
-            thumbnails = data.get("thumbnails", {}).get("images", [])
-            
-            if not thumbnails:
-                return {"error": "No thumbnail available for this model"}
-            
-            # Find a suitable thumbnail (prefer medium size ~640px)
-            selected_thumbnail = None
-            for thumb in thumbnails:
-                width = thumb.get("width", 0)
-                if 400 <= width <= 800:
-                    selected_thumbnail = thumb
-                    break
-            
-            # Fallback to the first available thumbnail
-            if not selected_thumbnail:
-                selected_thumbnail = thumbnails[0]
-            
-            thumbnail_url = selected_thumbnail.get("url")
-            if not thumbnail_url:
-                return {"error": "Thumbnail URL not found"}
-            
-            # Download the thumbnail image
-            img_response = requests.get(thumbnail_url, timeout=30)
-            if img_response.status_code != 200:
-                return {"error": f"Failed to download thumbnail: {img_response.status_code}"}
-            
-            # Encode image as base64
-            image_data = base64.b64encode(img_response.content).decode('ascii')
-            
-            # Determine format from content type or URL
-            content_type = img_response.headers.get("Content-Type", "")
-            if "png" in content_type or thumbnail_url.endswith(".png"):
-                img_format = "png"
-            else:
-                img_format = "jpeg"
-            
-            # Get additional model info for context
-            model_name = data.get("name", "Unknown")
-            author = data.get("user", {}).get("username", "Unknown")
-            
-            return {
-                "success": True,
-                "image_data": image_data,
-                "format": img_format,
-                "model_name": model_name,
-                "author": author,
-                "uid": uid,
-                "thumbnail_width": selected_thumbnail.get("width"),
-                "thumbnail_height": selected_thumbnail.get("height")
-            }
-            
-        except requests.exceptions.Timeout:
-            return {"error": "Request timed out. Check your internet connection."}
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return {"error": f"Failed to get model preview: {str(e)}"}
+        def fetch(progress):
+            try:
+                import base64
+
+                headers = {"Authorization": f"Token {api_key}"}
+                
+                # Get model info which includes thumbnails
+                response = requests.get(
+                    f"https://api.sketchfab.com/v3/models/{uid}",
+                    headers=headers,
+                    timeout=30
+                )
+                
+                if response.status_code == 401:
+                    return {"error": "Authentication failed (401). Check your API key."}
+                
+                if response.status_code == 404:
+                    return {"error": f"Model not found: {uid}"}
+                
+                if response.status_code != 200:
+                    return {"error": f"Failed to get model info: {response.status_code}"}
+                
+                data = response.json()
+                thumbnails = data.get("thumbnails", {}).get("images", [])
+                
+                if not thumbnails:
+                    return {"error": "No thumbnail available for this model"}
+                
+                # Find a suitable thumbnail (prefer medium size ~640px)
+                selected_thumbnail = None
+                for thumb in thumbnails:
+                    width = thumb.get("width", 0)
+                    if 400 <= width <= 800:
+                        selected_thumbnail = thumb
+                        break
+                
+                # Fallback to the first available thumbnail
+                if not selected_thumbnail:
+                    selected_thumbnail = thumbnails[0]
+                
+                thumbnail_url = selected_thumbnail.get("url")
+                if not thumbnail_url:
+                    return {"error": "Thumbnail URL not found"}
+                
+                # Download the thumbnail image
+                img_response = requests.get(thumbnail_url, timeout=30)
+                if img_response.status_code != 200:
+                    return {"error": f"Failed to download thumbnail: {img_response.status_code}"}
+                
+                # Encode image as base64
+                image_data = base64.b64encode(img_response.content).decode('ascii')
+                
+                # Determine format from content type or URL
+                content_type = img_response.headers.get("Content-Type", "")
+                if "png" in content_type or thumbnail_url.endswith(".png"):
+                    img_format = "png"
+                else:
+                    img_format = "jpeg"
+                
+                # Get additional model info for context
+                model_name = data.get("name", "Unknown")
+                author = data.get("user", {}).get("username", "Unknown")
+                
+                return {
+                    "success": True,
+                    "image_data": image_data,
+                    "format": img_format,
+                    "model_name": model_name,
+                    "author": author,
+                    "uid": uid,
+                    "thumbnail_width": selected_thumbnail.get("width"),
+                    "thumbnail_height": selected_thumbnail.get("height")
+                }
+                
+            except requests.exceptions.Timeout:
+                return {"error": "Request timed out. Check your internet connection."}
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                return {"error": f"Failed to get model preview: {str(e)}"}
+
+        return BackgroundTask(fetch)
 
     def download_sketchfab_model(self, uid, normalize_size=False, target_size=1.0):
         """Download a model from Sketchfab by its UID
@@ -1699,11 +3072,36 @@ class BlenderMCPServer:
         - normalize_size: If True, scale the model so its largest dimension equals target_size
         - target_size: The target size in Blender units (meters) for the largest dimension
         """
-        try:
-            api_key = bpy.context.scene.blendermcp_sketchfab_api_key
-            if not api_key:
-                return {"error": "Sketchfab API key is not configured"}
+        api_key = bpy.context.scene.blendermcp_sketchfab_api_key
+        cache = self._get_asset_cache()
+        offline = bpy.context.scene.blendermcp_offline
 
+        def fetch(progress):
+            try:
+                return self._fetch_sketchfab_model(api_key, uid, normalize_size, target_size, progress, cache, offline)
+            except requests.exceptions.Timeout:
+                return {"error": "Request timed out. Check your internet connection and try again with a simpler model."}
+            except json.JSONDecodeError as e:
+                return {"error": f"Invalid JSON response from Sketchfab API: {str(e)}"}
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                return {"error": f"Failed to download model: {str(e)}"}
+
+        return BackgroundTask(fetch)
+
+    def _fetch_sketchfab_model(self, api_key, uid, normalize_size, target_size, progress, cache=None, offline=False):
+        """Network phase of download_sketchfab_model: download and safely extract the glTF archive"""
+        cache_key = AssetCache.make_key("sketchfab", uid, None, "gltf")
+        hit = self._cache_lookup(cache, cache_key, progress)
+        if hit:
+            temp_dir, paths, _ = hit
+            zip_file_path = paths[f"{uid}.zip"]
+        elif offline:
+            return {"error": self._offline_miss(f"Sketchfab model {uid}")}
+        elif not api_key:
+            return {"error": "Sketchfab API key is not configured"}
+        else:
             # Use proper authorization header for API key auth
             headers = {
                 "Authorization": f"Token {api_key}"
@@ -1712,6 +3110,7 @@ class BlenderMCPServer:
             # Request download URL using the exact endpoint from the documentation
             download_endpoint = f"https://api.sketchfab.com/v3/models/{uid}/download"
 
+            progress("Requesting download URL")
             response = requests.get(
                 download_endpoint,
                 headers=headers,
@@ -1739,20 +3138,27 @@ class BlenderMCPServer:
             if not download_url:
                 return {"error": "No download URL available for this model. Make sure the model is downloadable and you have access."}
 
-            # Download the model (already has timeout)
-            model_response = requests.get(download_url, timeout=60)  # 60 second timeout
-
-            if model_response.status_code != 200:
-                return {"error": f"Model download failed with status code {model_response.status_code}"}
-
             # Save to temporary file
             temp_dir = tempfile.mkdtemp()
             zip_file_path = os.path.join(temp_dir, f"{uid}.zip")
 
-            with open(zip_file_path, "wb") as f:
-                f.write(model_response.content)
+            try:
+                # Download the model (60 second timeout)
+                status = stream_download(download_url, zip_file_path, progress, f"{uid}.zip", timeout=60)
+            except Exception:
+                with suppress(Exception):
+                    shutil.rmtree(temp_dir)
+                raise
+            if status != 200:
+                with suppress(Exception):
+                    shutil.rmtree(temp_dir)
+                return {"error": f"Model download failed with status code {status}"}
+
+            self._cache_store(cache, cache_key, {f"{uid}.zip": zip_file_path})
 
+        try:
             # Extract the zip file with enhanced security
+            progress("Extracting archive")
             with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
                 # More secure zip slip prevention
                 for file_info in zip_ref.infolist():
@@ -1781,53 +3187,104 @@ class BlenderMCPServer:
 
                 # If all files passed security checks, extract them
                 zip_ref.extractall(temp_dir)
+        except Exception:
+            with suppress(Exception):
+                shutil.rmtree(temp_dir)
+            raise
 
-            # Find the main glTF file
-            gltf_files = [f for f in os.listdir(temp_dir) if f.endswith('.gltf') or f.endswith('.glb')]
+        # Find the main glTF file
+        gltf_files = [f for f in os.listdir(temp_dir) if f.endswith('.gltf') or f.endswith('.glb')]
 
-            if not gltf_files:
-                with suppress(Exception):
-                    shutil.rmtree(temp_dir)
-                return {"error": "No glTF file found in the downloaded model"}
+        if not gltf_files:
+            with suppress(Exception):
+                shutil.rmtree(temp_dir)
+            return {"error": "No glTF file found in the downloaded model"}
 
-            main_file = os.path.join(temp_dir, gltf_files[0])
+        main_file = os.path.join(temp_dir, gltf_files[0])
+        return MainThreadStep(self._import_sketchfab_model, temp_dir, main_file, normalize_size, target_size)
 
+    def _import_sketchfab_model(self, temp_dir, main_file, normalize_size, target_size):
+        """Main thread phase of download_sketchfab_model: import, measure and optionally normalize"""
+        try:
             # Import the model
             bpy.ops.import_scene.gltf(filepath=main_file)
-
-            # Get the imported objects
-            imported_objects = list(bpy.context.selected_objects)
-            imported_object_names = [obj.name for obj in imported_objects]
-
+        except Exception as e:
+            traceback.print_exc()
+            return {"error": f"Failed to download model: {str(e)}"}
+        finally:
             # Clean up temporary files
             with suppress(Exception):
                 shutil.rmtree(temp_dir)
 
-            # Find root objects (objects without parents in the imported set)
-            root_objects = [obj for obj in imported_objects if obj.parent is None]
-
-            # Helper function to recursively get all mesh children
-            def get_all_mesh_children(obj):
-                """Recursively collect all mesh objects in the hierarchy"""
-                meshes = []
-                if obj.type == 'MESH':
-                    meshes.append(obj)
-                for child in obj.children:
-                    meshes.extend(get_all_mesh_children(child))
-                return meshes
-
-            # Collect ALL meshes from the entire hierarchy (starting from roots)
-            all_meshes = []
-            for obj in root_objects:
-                all_meshes.extend(get_all_mesh_children(obj))
+        # Get the imported objects
+        imported_objects = list(bpy.context.selected_objects)
+        imported_object_names = [obj.name for obj in imported_objects]
+
+        # Find root objects (objects without parents in the imported set)
+        root_objects = [obj for obj in imported_objects if obj.parent is None]
+
+        # Helper function to recursively get all mesh children
+        def get_all_mesh_children(obj):
+            """Recursively collect all mesh objects in the hierarchy"""
+            meshes = []
+            if obj.type == 'MESH':
+                meshes.append(obj)
+            for child in obj.children:
+                meshes.extend(get_all_mesh_children(child))
+            return meshes
+
+        # Collect ALL meshes from the entire hierarchy (starting from roots)
+        all_meshes = []
+        for obj in root_objects:
+            all_meshes.extend(get_all_mesh_children(obj))
+        
+        if all_meshes:
+            # Calculate combined world bounding box for all meshes
+            all_min = mathutils.Vector((float('inf'), float('inf'), float('inf')))
+            all_max = mathutils.Vector((float('-inf'), float('-inf'), float('-inf')))
+            
+            for mesh_obj in all_meshes:
+                # Get world-space bounding box corners
+                for corner in mesh_obj.bound_box:
+                    world_corner = mesh_obj.matrix_world @ mathutils.Vector(corner)
+                    all_min.x = min(all_min.x, world_corner.x)
+                    all_min.y = min(all_min.y, world_corner.y)
+                    all_min.z = min(all_min.z, world_corner.z)
+                    all_max.x = max(all_max.x, world_corner.x)
+                    all_max.y = max(all_max.y, world_corner.y)
+                    all_max.z = max(all_max.z, world_corner.z)
+            
+            # Calculate dimensions
+            dimensions = [
+                all_max.x - all_min.x,
+                all_max.y - all_min.y,
+                all_max.z - all_min.z
+            ]
+            max_dimension = max(dimensions)
             
-            if all_meshes:
-                # Calculate combined world bounding box for all meshes
+            # Apply normalization if requested
+            scale_applied = 1.0
+            if normalize_size and max_dimension > 0:
+                scale_factor = target_size / max_dimension
+                scale_applied = scale_factor
+                
+                # ✅ Only apply scale to ROOT objects (not children!)
+                # Child objects inherit parent's scale through matrix_world
+                for root in root_objects:
+                    root.scale = (
+                        root.scale.x * scale_factor,
+                        root.scale.y * scale_factor,
+                        root.scale.z * scale_factor
+                    )
+                
+                # Update the scene to recalculate matrix_world for all objects
+                bpy.context.view_layer.update()
+                
+                # Recalculate bounding box after scaling
                 all_min = mathutils.Vector((float('inf'), float('inf'), float('inf')))
                 all_max = mathutils.Vector((float('-inf'), float('-inf'), float('-inf')))
                 
                 for mesh_obj in all_meshes:
-                    # Get world-space bounding box corners
                     for corner in mesh_obj.bound_box:
                         world_corner = mesh_obj.matrix_world @ mathutils.Vector(corner)
                         all_min.x = min(all_min.x, world_corner.x)
@@ -1837,82 +3294,34 @@ class BlenderMCPServer:
                         all_max.y = max(all_max.y, world_corner.y)
                         all_max.z = max(all_max.z, world_corner.z)
                 
-                # Calculate dimensions
                 dimensions = [
                     all_max.x - all_min.x,
                     all_max.y - all_min.y,
                     all_max.z - all_min.z
                 ]
-                max_dimension = max(dimensions)
-                
-                # Apply normalization if requested
-                scale_applied = 1.0
-                if normalize_size and max_dimension > 0:
-                    scale_factor = target_size / max_dimension
-                    scale_applied = scale_factor
-                    
-                    # ✅ Only apply scale to ROOT objects (not children!)
-                    # Child objects inherit parent's scale through matrix_world
-                    for root in root_objects:
-                        root.scale = (
-                            root.scale.x * scale_factor,
-                            root.scale.y * scale_factor,
-                            root.scale.z * scale_factor
-                        )
-                    
-                    # Update the scene to recalculate matrix_world for all objects
-                    bpy.context.view_layer.update()
-                    
-                    # Recalculate bounding box after scaling
-                    all_min = mathutils.Vector((float('inf'), float('inf'), float('inf')))
-                    all_max = mathutils.Vector((float('-inf'), float('-inf'), float('-inf')))
-                    
-                    for mesh_obj in all_meshes:
-                        for corner in mesh_obj.bound_box:
-                            world_corner = mesh_obj.matrix_world @ mathutils.Vector(corner)
-                            all_min.x = min(all_min.x, world_corner.x)
-                            all_min.y = min(all_min.y, world_corner.y)
-                            all_min.z = min(all_min.z, world_corner.z)
-                            all_max.x = max(all_max.x, world_corner.x)
-                            all_max.y = max(all_max.y, world_corner.y)
-                            all_max.z = max(all_max.z, world_corner.z)
-                    
-                    dimensions = [
-                        all_max.x - all_min.x,
-                        all_max.y - all_min.y,
-                        all_max.z - all_min.z
-                    ]
-                
-                world_bounding_box = [[all_min.x, all_min.y, all_min.z], [all_max.x, all_max.y, all_max.z]]
-            else:
-                world_bounding_box = None
-                dimensions = None
-                scale_applied = 1.0
-
-            result = {
-                "success": True,
-                "message": "Model imported successfully",
-                "imported_objects": imported_object_names
-            }
-            
-            if world_bounding_box:
-                result["world_bounding_box"] = world_bounding_box
-            if dimensions:
-                result["dimensions"] = [round(d, 4) for d in dimensions]
-            if normalize_size:
-                result["scale_applied"] = round(scale_applied, 6)
-                result["normalized"] = True
             
-            return result
+            world_bounding_box = [[all_min.x, all_min.y, all_min.z], [all_max.x, all_max.y, all_max.z]]
+        else:
+            world_bounding_box = None
+            dimensions = None
+            scale_applied = 1.0
+
+        result = {
+            "success": True,
+            "message": "Model imported successfully",
+            "imported_objects": imported_object_names
+        }
+        
+        if world_bounding_box:
+            result["world_bounding_box"] = world_bounding_box
+        if dimensions:
+            result["dimensions"] = [round(d, 4) for d in dimensions]
+        if normalize_size:
+            result["scale_applied"] = round(scale_applied, 6)
+            result["normalized"] = True
+        
+        return result
 
-        except requests.exceptions.Timeout:
-            return {"error": "Request timed out. Check your internet connection and try again with a simpler model."}
-        except json.JSONDecodeError as e:
-            return {"error": f"Invalid JSON response from Sketchfab API: {str(e)}"}
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return {"error": f"Failed to download model: {str(e)}"}
     #endregion
 
     #region Hunyuan3D
@@ -2057,149 +3466,157 @@ class BlenderMCPServer:
         text_prompt: str = None,
         image: str = None
     ):
-        try:
-            secret_id = bpy.context.scene.blendermcp_hunyuan3d_secret_id
-            secret_key = bpy.context.scene.blendermcp_hunyuan3d_secret_key
-
-            if not secret_id or not secret_key:
-                return {"error": "SecretId or SecretKey is not given"}
-
-            # Parameter verification
-            if not text_prompt and not image:
-                return {"error": "Prompt or Image is required"}
-            if text_prompt and image:
-                return {"error": "Prompt and Image cannot be provided simultaneously"}
-            # Fixed parameter configuration
-            service = "hunyuan"
-            action = "SubmitHunyuanTo3DJob"
-            version = "2023-09-01"
-            region = "ap-guangzhou"
-
-            headParams={
-                "Action": action,
-                "Version": version,
-                "Region": region,
-            }
+        secret_id = bpy.context.scene.blendermcp_hunyuan3d_secret_id
+        secret_key = bpy.context.scene.blendermcp_hunyuan3d_secret_key
 
-            # Constructing request parameters
-            data = {
-                "Num": 1  # The current API limit is only 1
-            }
+        if not secret_id or not secret_key:
+            return {"error": "SecretId or SecretKey is not given"}
 
-            # Handling text prompts
-            if text_prompt:
-                if len(text_prompt) > 200:
-                    return {"error": "Prompt exceeds 200 characters limit"}
-                data["Prompt"] = text_prompt
+        # Parameter verification
+        if not text_prompt and not image:
+            return {"error": "Prompt or Image is required"}
+        if text_prompt and image:
+            return {"error": "Prompt and Image cannot be provided simultaneously"}
 
-            # Handling image
-            if image:
-                if re.match(r'^https?://', image, re.IGNORECASE) is not None:
-                    data["ImageUrl"] = image
-                else:
-                    try:
-                        # Convert to Base64 format
-                        with open(image, "rb") as f:
-                            image_base64 = base64.b64encode(f.read()).decode("ascii")
-                        data["ImageBase64"] = image_base64
-                    except Exception as e:
-                        return {"error": f"Image encoding failed: {str(e)}"}
-            
-            # Get signed headers
-            headers, endpoint = self.get_tencent_cloud_sign_headers("POST", "/", headParams, data, service, region, secret_id, secret_key)
+        def fetch(progress):
+            try:
+                # Fixed parameter configuration
+                service = "hunyuan"
+                action = "SubmitHunyuanTo3DJob"
+                version = "2023-09-01"
+                region = "ap-guangzhou"
+
+                headParams={
+                    "Action": action,
+                    "Version": version,
+                    "Region": region,
+                }
 
-            response = requests.post(
-                endpoint,
-                headers = headers,
-                data = json.dumps(data)
-            )
+                # Constructing request parameters
+                data = {
+                    "Num": 1  # The current API limit is only 1
+                }
 
-            if response.status_code == 200:
-                return response.json()
-            return {
-                "error": f"API request failed with status {response.status_code}: {response}"
-            }
-        except Exception as e:
-            return {"error": str(e)}
+                # Handling text prompts
+                if text_prompt:
+                    if len(text_prompt) > 200:
+                        return {"error": "Prompt exceeds 200 characters limit"}
+                    data["Prompt"] = text_prompt
+
+                # Handling image
+                if image:
+                    if re.match(r'^https?://', image, re.IGNORECASE) is not None:
+                        data["ImageUrl"] = image
+                    else:
+                        try:
+                            # Convert to Base64 format
+                            with open(image, "rb") as f:
+                                image_base64 = base64.b64encode(f.read()).decode("ascii")
+                            data["ImageBase64"] = image_base64
+                        except Exception as e:
+                            return {"error": f"Image encoding failed: {str(e)}"}
+                
+                # Get signed headers
+                headers, endpoint = self.get_tencent_cloud_sign_headers("POST", "/", headParams, data, service, region, secret_id, secret_key)
+
+                response = requests.post(
+                    endpoint,
+                    headers = headers,
+                    data = json.dumps(data)
+                )
+
+                if response.status_code == 200:
+                    return response.json()
+                return {
+                    "error": f"API request failed with status {response.status_code}: {response}"
+                }
+            except Exception as e:
+                return {"error": str(e)}
+
+        return BackgroundTask(fetch)
 
     def create_hunyuan_job_local_site(
         self,
         text_prompt: str = None,
         image: str = None):
-        try:
-            base_url = bpy.context.scene.blendermcp_hunyuan3d_api_url.rstrip('/')
-            octree_resolution = bpy.context.scene.blendermcp_hunyuan3d_octree_resolution
-            num_inference_steps = bpy.context.scene.blendermcp_hunyuan3d_num_inference_steps
-            guidance_scale = bpy.context.scene.blendermcp_hunyuan3d_guidance_scale
-            texture = bpy.context.scene.blendermcp_hunyuan3d_texture
-
-            if not base_url:
-                return {"error": "API URL is not given"}
-            # Parameter verification
-            if not text_prompt and not image:
-                return {"error": "Prompt or Image is required"}
-
-            # Constructing request parameters
-            data = {
-                "octree_resolution": octree_resolution,
-                "num_inference_steps": num_inference_steps,
-                "guidance_scale": guidance_scale,
-                "texture": texture,
-            }
+        base_url = bpy.context.scene.blendermcp_hunyuan3d_api_url.rstrip('/')
+        octree_resolution = bpy.context.scene.blendermcp_hunyuan3d_octree_resolution
+        num_inference_steps = bpy.context.scene.blendermcp_hunyuan3d_num_inference_steps
+        guidance_scale = bpy.context.scene.blendermcp_hunyuan3d_guidance_scale
+        texture = bpy.context.scene.blendermcp_hunyuan3d_texture
+
+        if not base_url:
+            return {"error": "API URL is not given"}
+        # Parameter verification
+        if not text_prompt and not image:
+            return {"error": "Prompt or Image is required"}
+
+        def fetch(progress):
+            try:
+                # Constructing request parameters
+                data = {
+                    "octree_resolution": octree_resolution,
+                    "num_inference_steps": num_inference_steps,
+                    "guidance_scale": guidance_scale,
+                    "texture": texture,
+                }
 
-            # Handling text prompts
-            if text_prompt:
-                data["text"] = text_prompt
+                # Handling text prompts
+                if text_prompt:
+                    data["text"] = text_prompt
 
-            # Handling image
-            if image:
-                if re.match(r'^https?://', image, re.IGNORECASE) is not None:
-                    try:
-                        resImg = requests.get(image)
-                        resImg.raise_for_status()
-                        image_base64 = base64.b64encode(resImg.content).decode("ascii")
-                        data["image"] = image_base64
-                    except Exception as e:
-                        return {"error": f"Failed to download or encode image: {str(e)}"} 
-                else:
-                    try:
-                        # Convert to Base64 format
-                        with open(image, "rb") as f:
-                            image_base64 = base64.b64encode(f.read()).decode("ascii")
-                        data["image"] = image_base64
-                    except Exception as e:
-                        return {"error": f"Image encoding failed: {str(e)}"}
+                # Handling image
+                if image:
+                    if re.match(r'^https?://', image, re.IGNORECASE) is not None:
+                        try:
+                            resImg = requests.get(image)
+                            resImg.raise_for_status()
+                            image_base64 = base64.b64encode(resImg.content).decode("ascii")
+                            data["image"] = image_base64
+                        except Exception as e:
+                            return {"error": f"Failed to download or encode image: {str(e)}"} 
+                    else:
+                        try:
+                            # Convert to Base64 format
+                            with open(image, "rb") as f:
+                                image_base64 = base64.b64encode(f.read()).decode("ascii")
+                            data["image"] = image_base64
+                        except Exception as e:
+                            return {"error": f"Image encoding failed: {str(e)}"}
+
+                progress("Generating model")
+                response = requests.post(
+                    f"{base_url}/generate",
+                    json = data,
+                )
 
-            response = requests.post(
-                f"{base_url}/generate",
-                json = data,
-            )
+                if response.status_code != 200:
+                    return {
+                        "error": f"Generation failed: {response.text}"
+                    }
+            
+                # Decode base64 and save to temporary file
+                with tempfile.NamedTemporaryFile(delete=False, suffix=".glb") as temp_file:
+                    temp_file.write(response.content)
+                    temp_file_name = temp_file.name
+            except Exception as e:
+                print(f"An error occurred: {e}")
+                return {"error": str(e)}
 
-            if response.status_code != 200:
+            # Import the GLB file in the main thread
+            def import_handler():
+                try:
+                    bpy.ops.import_scene.gltf(filepath=temp_file_name)
+                finally:
+                    os.unlink(temp_file_name)
                 return {
-                    "error": f"Generation failed: {response.text}"
+                    "status": "DONE",
+                    "message": "Generation and Import glb succeeded"
                 }
-        
-            # Decode base64 and save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".glb") as temp_file:
-                temp_file.write(response.content)
-                temp_file_name = temp_file.name
 
-            # Import the GLB file in the main thread
-            def import_handler():
-                bpy.ops.import_scene.gltf(filepath=temp_file_name)
-                os.unlink(temp_file.name)
-                return None
-            
-            bpy.app.timers.register(import_handler)
+            return MainThreadStep(import_handler)
 
-            return {
-                "status": "DONE",
-                "message": "Generation and Import glb succeeded"
-            }
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            return {"error": str(e)}
+        return BackgroundTask(fetch)
         
     
     def poll_hunyuan_job_status(self, *args, **kwargs):
@@ -2208,46 +3625,49 @@ class BlenderMCPServer:
     def poll_hunyuan_job_status_ai(self, job_id: str):
         """Call the job status API to get the job status"""
         print(job_id)
-        try:
-            secret_id = bpy.context.scene.blendermcp_hunyuan3d_secret_id
-            secret_key = bpy.context.scene.blendermcp_hunyuan3d_secret_key
+        secret_id = bpy.context.scene.blendermcp_hunyuan3d_secret_id
+        secret_key = bpy.context.scene.blendermcp_hunyuan3d_secret_key
 
-            if not secret_id or not secret_key:
-                return {"error": "SecretId or SecretKey is not given"}
-            if not job_id:
-                return {"error": "JobId is required"}
-            
-            service = "hunyuan"
-            action = "QueryHunyuanTo3DJob"
-            version = "2023-09-01"
-            region = "ap-guangzhou"
-
-            headParams={
-                "Action": action,
-                "Version": version,
-                "Region": region,
-            }
+        if not secret_id or not secret_key:
+            return {"error": "SecretId or SecretKey is not given"}
+        if not job_id:
+            return {"error": "JobId is required"}
 
-            clean_job_id = job_id.removeprefix("job_")
-            data = {
-                "JobId": clean_job_id
-            }
+        def fetch(progress):
+            try:
+                service = "hunyuan"
+                action = "QueryHunyuanTo3DJob"
+                version = "2023-09-01"
+                region = "ap-guangzhou"
+
+                headParams={
+                    "Action": action,
+                    "Version": version,
+                    "Region": region,
+                }
 
-            headers, endpoint = self.get_tencent_cloud_sign_headers("POST", "/", headParams, data, service, region, secret_id, secret_key)
+                clean_job_id = job_id.removeprefix("job_")
+                data = {
+                    "JobId": clean_job_id
+                }
 
-            response = requests.post(
-                endpoint,
-                headers=headers,
-                data=json.dumps(data)
-            )
+                headers, endpoint = self.get_tencent_cloud_sign_headers("POST", "/", headParams, data, service, region, secret_id, secret_key)
 
-            if response.status_code == 200:
-                return response.json()
-            return {
-                "error": f"API request failed with status {response.status_code}: {response}"
-            }
-        except Exception as e:
-            return {"error": str(e)}
+                response = requests.post(
+                    endpoint,
+                    headers=headers,
+                    data=json.dumps(data)
+                )
+
+                if response.status_code == 200:
+                    return response.json()
+                return {
+                    "error": f"API request failed with status {response.status_code}: {response}"
+                }
+            except Exception as e:
+                return {"error": str(e)}
+
+        return BackgroundTask(fetch)
 
     def import_generated_asset_hunyuan(self, *args, **kwargs):
         return self.import_generated_asset_hunyuan_ai(*args, **kwargs)
@@ -2259,33 +3679,58 @@ class BlenderMCPServer:
         # Validate URL
         if not re.match(r'^https?://', zip_file_url, re.IGNORECASE):
             return {"error": "Invalid URL format. Must start with http:// or https://"}
-        
-        # Create a temporary directory
-        temp_dir = tempfile.mkdtemp(prefix="tencent_obj_")
-        zip_file_path = osp.join(temp_dir, "model.zip")
-        obj_file_path = osp.join(temp_dir, "model.obj")
-        mtl_file_path = osp.join(temp_dir, "model.mtl")
 
-        try:
-            # Download ZIP file
-            zip_response = requests.get(zip_file_url, stream=True)
-            zip_response.raise_for_status()
-            with open(zip_file_path, "wb") as f:
-                for chunk in zip_response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            # Unzip the ZIP
-            with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
-                zip_ref.extractall(temp_dir)
+        # Result URLs are signed; the path without the query identifies the asset
+        url_path = zip_file_url.split("?", 1)[0]
+        cache = self._get_asset_cache()
+        cache_key = AssetCache.make_key("hunyuan", hashlib.sha1(url_path.encode("utf-8")).hexdigest(), None, "zip")
+        offline = bpy.context.scene.blendermcp_offline
+
+        def fetch(progress):
+            hit = self._cache_lookup(cache, cache_key, progress)
+            if hit is None and offline:
+                return {"succeed": False, "error": self._offline_miss(f"Hunyuan3D asset {url_path}")}
+
+            # Create a temporary directory
+            if hit:
+                temp_dir, paths, _ = hit
+                zip_file_path = paths["model.zip"]
+            else:
+                temp_dir = tempfile.mkdtemp(prefix="tencent_obj_")
+                zip_file_path = osp.join(temp_dir, "model.zip")
+            obj_file_path = osp.join(temp_dir, "model.obj")
+
+            try:
+                # Download ZIP file
+                if not hit:
+                    status = stream_download(zip_file_url, zip_file_path, progress, "model.zip")
+                    if status != 200:
+                        raise requests.HTTPError(f"{status} Error for url: {zip_file_url}")
+                    self._cache_store(cache, cache_key, {"model.zip": zip_file_path})
+
+                # Unzip the ZIP
+                with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
+                    zip_ref.extractall(temp_dir)
+
+                # Find the .obj file (there may be multiple, assuming the main file is model.obj)
+                for file in os.listdir(temp_dir):
+                    if file.endswith(".obj"):
+                        obj_file_path = osp.join(temp_dir, file)
+
+                if not osp.exists(obj_file_path):
+                    self._cleanup_hunyuan_files(temp_dir, zip_file_path, obj_file_path)
+                    return {"succeed": False, "error": "OBJ file not found after extraction"}
+            except Exception as e:
+                self._cleanup_hunyuan_files(temp_dir, zip_file_path, obj_file_path)
+                return {"succeed": False, "error": str(e)}
 
-            # Find the .obj file (there may be multiple, assuming the main file is model.obj)
-            for file in os.listdir(temp_dir):
-                if file.endswith(".obj"):
-                    obj_file_path = osp.join(temp_dir, file)
+            return MainThreadStep(self._import_hunyuan_obj, name, temp_dir, zip_file_path, obj_file_path)
 
-            if not osp.exists(obj_file_path):
-                return {"succeed": False, "error": "OBJ file not found after extraction"}
+        return BackgroundTask(fetch)
 
+    def _import_hunyuan_obj(self, name, temp_dir, zip_file_path, obj_file_path):
+        """Main thread phase of import_generated_asset_hunyuan_ai"""
+        try:
             # Import obj file
             if bpy.app.version>=(4, 0, 0):
                 bpy.ops.wm.obj_import(filepath=obj_file_path)
@@ -2316,14 +3761,18 @@ class BlenderMCPServer:
         except Exception as e:
             return {"succeed": False, "error": str(e)}
         finally:
-            #  Clean up temporary zip and obj, save texture and mtl
-            try:
-                if os.path.exists(zip_file_path):
-                    os.remove(zip_file_path) 
-                if os.path.exists(obj_file_path):
-                    os.remove(obj_file_path)
-            except Exception as e:
-                print(f"Failed to clean up temporary directory {temp_dir}: {e}")
+            self._cleanup_hunyuan_files(temp_dir, zip_file_path, obj_file_path)
+
+    @staticmethod
+    def _cleanup_hunyuan_files(temp_dir, zip_file_path, obj_file_path):
+        #  Clean up temporary zip and obj, save texture and mtl
+        try:
+            if os.path.exists(zip_file_path):
+                os.remove(zip_file_path) 
+            if os.path.exists(obj_file_path):
+                os.remove(obj_file_path)
+        except Exception as e:
+            print(f"Failed to clean up temporary directory {temp_dir}: {e}")
     #endregion
 
 # Blender Addon Preferences
@@ -2393,6 +3842,12 @@ class BLENDERMCP_PT_Panel(bpy.types.Panel):
                 layout.prop(scene, "blendermcp_hunyuan3d_num_inference_steps", text="Number of Inference Steps")
                 layout.prop(scene, "blendermcp_hunyuan3d_guidance_scale", text="Guidance Scale")
                 layout.prop(scene, "blendermcp_hunyuan3d_texture", text="Generate Texture")
+
+        layout.prop(scene, "blendermcp_use_asset_cache", text="Cache downloaded assets")
+        if scene.blendermcp_use_asset_cache:
+            layout.prop(scene, "blendermcp_cache_dir", text="Cache Folder")
+            layout.prop(scene, "blendermcp_cache_size_mb", text="Cache Size (MB)")
+            layout.prop(scene, "blendermcp_offline", text="Offline (cache only)")
         
         if not scene.blendermcp_server_running:
             layout.operator("blendermcp.start_server", text="Connect to MCP server")
@@ -2588,6 +4043,32 @@ def register():
         default=""
     )
 
+    bpy.types.Scene.blendermcp_use_asset_cache = bpy.props.BoolProperty(
+        name="Use Asset Cache",
+        description="Keep downloaded Poly Haven, Sketchfab, Rodin and Hunyuan assets in a local cache",
+        default=True
+    )
+
+    bpy.types.Scene.blendermcp_cache_dir = bpy.props.StringProperty(
+        name="Cache Folder",
+        subtype="DIR_PATH",
+        description="Folder of the asset cache (empty: ~/.blendermcp/asset_cache)",
+        default=""
+    )
+
+    bpy.types.Scene.blendermcp_cache_size_mb = bpy.props.IntProperty(
+        name="Cache Size (MB)",
+        description="Least recently used assets are evicted above this size",
+        default=4096,
+        min=64,
+    )
+
+    bpy.types.Scene.blendermcp_offline = bpy.props.BoolProperty(
+        name="Offline",
+        description="Serve asset imports only from the cache and refuse remote API calls",
+        default=False
+    )
+
     # Register preferences class
     bpy.utils.register_class(BLENDERMCP_AddonPreferences)
 
@@ -2641,6 +4122,10 @@ def unregister():
     del bpy.types.Scene.blendermcp_hunyuan3d_num_inference_steps
     del bpy.types.Scene.blendermcp_hunyuan3d_guidance_scale
     del bpy.types.Scene.blendermcp_hunyuan3d_texture
+    del bpy.types.Scene.blendermcp_use_asset_cache
+    del bpy.types.Scene.blendermcp_cache_dir
+    del bpy.types.Scene.blendermcp_cache_size_mb
+    del bpy.types.Scene.blendermcp_offline
 
     print("BlenderMCP addon unregistered")
 
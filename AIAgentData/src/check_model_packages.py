@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import glob
+import struct
+import zipfile
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# Library-wide replacement for deep_check_paths.py: every models/*.zip is
+# opened once, its members are indexed into a set and every URL-bearing field
+# of agent.json (including sub-agents) is resolved against that index.
+# GLB headers and PNG signatures are read straight from the archive, nothing
+# is extracted to disk.
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+ROOT_URL_FIELDS = [
+    "modelUrlSlim",
+    "modelUrlMedium",
+    "modelUrlFat",
+    "modelUrlPAK",
+    "thumbnail"
+]
+
+MODEL_URL_FIELDS = ["thumbnail", "mapIconUrl"]
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+GLB_MAGIC = b"glTF"
+JPEG_MAGIC = b"\xff\xd8\xff"
+
+
+def iter_agent_refs(agent, prefix=""):
+    """Yield (field_path, url) for every file reference inside one agent dict."""
+    for field in ROOT_URL_FIELDS:
+        val = agent.get(field)
+        if isinstance(val, str) and val:
+            yield f"{prefix}{field}", val
+
+    for idx, sym in enumerate(agent.get("modelUrlSymbols") or []):
+        if not isinstance(sym, dict):
+            continue
+        for key in ("symbolName", "thumbnail"):
+            val = sym.get(key)
+            if val:
+                yield f"{prefix}modelUrlSymbols[{idx}].{key}", val
+
+    model = agent.get("model")
+    if isinstance(model, dict):
+        for field in MODEL_URL_FIELDS:
+            entry = model.get(field)
+            if isinstance(entry, dict) and entry.get("url"):
+                yield f"{prefix}model.{field}.url", entry["url"]
+        for idx, dim in enumerate(model.get("dimModelUrls") or []):
+            if isinstance(dim, dict) and dim.get("url"):
+                yield f"{prefix}model.dimModelUrls[{idx}].url", dim["url"]
+
+    for idx, sub in enumerate(agent.get("subagents") or []):
+        if isinstance(sub, dict):
+            yield from iter_agent_refs(sub, f"{prefix}subagents[{idx}].")
+
+
+def check_member_header(z, info):
+    """Validate the magic bytes of a GLB/PNG member. Returns an error string or None."""
+    name = info.filename.lower()
+    if name.endswith(".glb"):
+        with z.open(info) as f:
+            header = f.read(12)
+        if len(header) < 12 or header[:4] != GLB_MAGIC:
+            return "invalid GLB magic"
+        version, length = struct.unpack("<II", header[4:12])
+        if version != 2:
+            return f"unsupported GLB version {version}"
+        if length != info.file_size:
+            return f"GLB header length {length} != member size {info.file_size}"
+    elif name.endswith(".png"):
+        with z.open(info) as f:
+            header = f.read(8)
+        if header != PNG_SIGNATURE:
+            if header.startswith(JPEG_MAGIC):
+                return "invalid PNG signature (JPEG data, see check_and_convert_images.py)"
+            return "invalid PNG signature"
+    return None
+
+
+def check_package(zip_path):
+    """Check one model package and return a JSON-serialisable report dict."""
+    report = {
+        "package": os.path.basename(zip_path),
+        "ok": True,
+        "errors": [],
+        "warnings": [],
+        "references": 0
+    }
+
+    def fail(msg):
+        report["ok"] = False
+        report["errors"].append(msg)
+
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as z:
+            infos = {info.filename: info for info in z.infolist() if not info.is_dir()}
+            members = set(infos)
+
+            if "agent.json" not in members:
+                fail("agent.json missing")
+                return report
+
+            data = json.loads(z.read("agent.json").decode('utf-8'))
+            if isinstance(data, dict):
+                report["warnings"].append("agent.json root is not a list")
+                agents = [data]
+            elif isinstance(data, list):
+                agents = [a for a in data if isinstance(a, dict)]
+            else:
+                fail(f"agent.json root has unexpected type {type(data).__name__}")
+                return report
+
+            referenced = set()
+            for a_idx, agent in enumerate(agents):
+                for field, url in iter_agent_refs(agent, f"[{a_idx}]."):
+                    report["references"] += 1
+                    if url not in members:
+                        fail(f"{field}: '{url}' not found in zip")
+                    else:
+                        referenced.add(url)
+
+            # Every referenced asset gets its header checked once, no matter
+            # how many fields point at it.
+            for name in sorted(referenced):
+                err = check_member_header(z, infos[name])
+                if err:
+                    fail(f"{name}: {err}")
+
+            for name in sorted(members - referenced - {"agent.json"}):
+                report["warnings"].append(f"unreferenced member '{name}'")
+
+    except zipfile.BadZipFile as e:
+        fail(f"bad zip: {e}")
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        fail(f"invalid agent.json: {e}")
+    except Exception as e:
+        fail(f"exception: {e}")
+
+    return report
+
+
+def check_library(models_dir, workers=None):
+    """Check every *.zip under models_dir in parallel and return the summary dict."""
+    zip_paths = sorted(glob.glob(os.path.join(models_dir, "*.zip")))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        reports = list(pool.map(check_package, zip_paths))
+
+    failed = [r["package"] for r in reports if not r["ok"]]
+    return {
+        "models_dir": os.path.abspath(models_dir),
+        "total": len(reports),
+        "passed": len(reports) - len(failed),
+        "failed": failed,
+        "packages": reports
+    }
+
+
+if __name__ == "__main__":
+    default_models = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+    parser = argparse.ArgumentParser(description="Check integrity of every model package ZIP without extracting it.")
+    parser.add_argument("--models-dir", default=default_models, help="Directory containing the *.zip packages")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parallel workers")
+    parser.add_argument("--report", default=None, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--strict", action="store_true", help="Treat warnings as failures")
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.models_dir):
+        print(f"Error: Directory not found: {args.models_dir}", file=sys.stderr)
+        sys.exit(EXIT_USAGE)
+
+    summary = check_library(args.models_dir, args.workers)
+    if summary["total"] == 0:
+        print(f"Error: No packages found in {args.models_dir}", file=sys.stderr)
+        sys.exit(EXIT_USAGE)
+
+    if args.strict:
+        for r in summary["packages"]:
+            if r["ok"] and r["warnings"]:
+                r["ok"] = False
+                summary["failed"].append(r["package"])
+        summary["passed"] = summary["total"] - len(summary["failed"])
+
+    report_json = json.dumps(summary, indent=2, ensure_ascii=False)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            f.write(report_json)
+    else:
+        print(report_json)
+
+    print(f"{summary['passed']}/{summary['total']} packages passed", file=sys.stderr)
+    sys.exit(EXIT_FAILED if summary["failed"] else EXIT_OK)
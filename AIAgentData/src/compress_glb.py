@@ -0,0 +1,485 @@
+import os
+import io
+import sys
+import json
+import math
+import glob
+import struct
+import hashlib
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageChops, ImageStat
+
+# GLB size-reduction stage, working directly on the GLB container (JSON chunk
+# + BIN chunk) so nothing is lost in a scene-graph round-trip:
+#   1. Embedded textures are resized to a max dimension and re-encoded as
+#      JPEG (or WebP via EXT_texture_webp) when they have no alpha. A PSNR gate
+#      against the resized source keeps the PNG when the lossy copy drifts.
+#      Textures that are already JPEG/WebP within the max dimension are kept
+#      as they are, so running the stage again does not re-encode them.
+#   2. Opt-in (--quantize): POSITION / NORMAL / TEXCOORD are quantized to
+#      normalized integer types (KHR_mesh_quantization). Positions are stored
+#      relative to the mesh bounds; the dequantization transform lives on a new
+#      child node. trimesh ignores "normalized", so the repo's own tools
+#      (gen_lod_models, check_model_packages, the rotation fixes) would read
+#      such files at x32767 scale; only quantize final delivery copies.
+#   3. Byte-identical buffer views are deduplicated and the BIN chunk repacked.
+
+GLB_MAGIC = 0x46546C67
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+COMPONENT_DTYPES = {
+    5120: np.int8,
+    5121: np.uint8,
+    5122: np.int16,
+    5123: np.uint16,
+    5125: np.uint32,
+    5126: np.float32
+}
+TYPE_SIZES = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+
+ARRAY_BUFFER = 34962
+
+DEFAULT_MAX_TEXTURE = 2048
+DEFAULT_JPEG_QUALITY = 85
+DEFAULT_MIN_PSNR = 35.0
+# Already lossy: re-encoding only adds generation loss
+LOSSY_FORMATS = {"JPEG", "WEBP"}
+
+
+# ---------------------------------------------------------------------------
+# GLB container
+# ---------------------------------------------------------------------------
+
+def read_glb(path):
+    """Return (gltf_json, [bufferView payload bytes]) for a single-buffer GLB."""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    magic, version, length = struct.unpack_from("<III", data, 0)
+    if magic != GLB_MAGIC or version != 2:
+        raise ValueError(f"Not a glTF 2.0 binary: {path}")
+
+    gltf, bin_chunk = None, b""
+    offset = 12
+    while offset < length:
+        chunk_len, chunk_type = struct.unpack_from("<II", data, offset)
+        chunk = data[offset + 8: offset + 8 + chunk_len]
+        if chunk_type == CHUNK_JSON:
+            gltf = json.loads(chunk.decode('utf-8'))
+        elif chunk_type == CHUNK_BIN:
+            bin_chunk = chunk
+        offset += 8 + chunk_len
+
+    buffers = gltf.get("buffers", [])
+    if len(buffers) > 1 or any("uri" in b for b in buffers):
+        raise ValueError("Only self-contained single-buffer GLBs are supported")
+
+    views = []
+    for bv in gltf.get("bufferViews", []):
+        start = bv.get("byteOffset", 0)
+        views.append(bytes(bin_chunk[start: start + bv["byteLength"]]))
+    return gltf, views
+
+
+def _pad4(b, fill=b"\x00"):
+    return b + fill * ((4 - len(b) % 4) % 4)
+
+
+def pack_glb(gltf, views):
+    """Drop unreferenced views, repack the BIN chunk and return the GLB bytes."""
+    used = set()
+    for acc in gltf.get("accessors", []):
+        if "bufferView" in acc:
+            used.add(acc["bufferView"])
+        sparse = acc.get("sparse")
+        if sparse:
+            used.add(sparse["indices"]["bufferView"])
+            used.add(sparse["values"]["bufferView"])
+    for img in gltf.get("images", []):
+        if "bufferView" in img:
+            used.add(img["bufferView"])
+
+    remap, new_views, blob = {}, [], bytearray()
+    for idx, bv in enumerate(gltf.get("bufferViews", [])):
+        if idx not in used:
+            continue
+        payload = views[idx]
+        blob += b"\x00" * ((4 - len(blob) % 4) % 4)
+        bv = dict(bv, buffer=0, byteOffset=len(blob), byteLength=len(payload))
+        remap[idx] = len(new_views)
+        new_views.append(bv)
+        blob += payload
+
+    _remap_buffer_views(gltf, remap)
+    gltf["bufferViews"] = new_views
+    if blob:
+        gltf["buffers"] = [{"byteLength": len(blob)}]
+    else:
+        gltf.pop("buffers", None)
+
+    json_chunk = _pad4(json.dumps(gltf, separators=(",", ":"), ensure_ascii=False).encode('utf-8'), b" ")
+    bin_chunk = _pad4(bytes(blob))
+
+    out = io.BytesIO()
+    total = 12 + 8 + len(json_chunk) + (8 + len(bin_chunk) if bin_chunk else 0)
+    out.write(struct.pack("<III", GLB_MAGIC, 2, total))
+    out.write(struct.pack("<II", len(json_chunk), CHUNK_JSON))
+    out.write(json_chunk)
+    if bin_chunk:
+        out.write(struct.pack("<II", len(bin_chunk), CHUNK_BIN))
+        out.write(bin_chunk)
+    return out.getvalue()
+
+
+def _remap_buffer_views(gltf, remap):
+    for acc in gltf.get("accessors", []):
+        if "bufferView" in acc:
+            acc["bufferView"] = remap[acc["bufferView"]]
+        sparse = acc.get("sparse")
+        if sparse:
+            sparse["indices"]["bufferView"] = remap[sparse["indices"]["bufferView"]]
+            sparse["values"]["bufferView"] = remap[sparse["values"]["bufferView"]]
+    for img in gltf.get("images", []):
+        if "bufferView" in img:
+            img["bufferView"] = remap[img["bufferView"]]
+
+
+def add_view(gltf, views, payload, byte_stride=None, target=None):
+    bv = {"buffer": 0, "byteOffset": 0, "byteLength": len(payload)}
+    if byte_stride:
+        bv["byteStride"] = byte_stride
+    if target:
+        bv["target"] = target
+    gltf.setdefault("bufferViews", []).append(bv)
+    views.append(payload)
+    return len(views) - 1
+
+
+def _use_extension(gltf, name, required=True):
+    used = gltf.setdefault("extensionsUsed", [])
+    if name not in used:
+        used.append(name)
+    if required:
+        req = gltf.setdefault("extensionsRequired", [])
+        if name not in req:
+            req.append(name)
+
+
+# ---------------------------------------------------------------------------
+# Accessors
+# ---------------------------------------------------------------------------
+
+def read_accessor(gltf, views, idx):
+    """Return accessor data as a float32 (count, ncomp) array, honouring byteStride and normalization."""
+    acc = gltf["accessors"][idx]
+    if "bufferView" not in acc or "sparse" in acc:
+        raise ValueError(f"Accessor {idx} is sparse or has no bufferView")
+
+    bv = gltf["bufferViews"][acc["bufferView"]]
+    dtype = np.dtype(COMPONENT_DTYPES[acc["componentType"]]).newbyteorder("<")
+    ncomp = TYPE_SIZES[acc["type"]]
+    stride = bv.get("byteStride", dtype.itemsize * ncomp)
+    arr = np.ndarray(shape=(acc["count"], ncomp), dtype=dtype, buffer=views[acc["bufferView"]],
+                     offset=acc.get("byteOffset", 0), strides=(stride, dtype.itemsize))
+    out = arr.astype(np.float32)
+    if acc.get("normalized") and acc["componentType"] != 5126:
+        info = np.iinfo(dtype)
+        out = out / info.max
+        if info.min < 0:
+            out = np.maximum(out, -1.0)
+    return out
+
+
+def _write_quantized(gltf, views, acc_idx, q, component_type, normalized=True):
+    """Store an integer (count, ncomp) array as the new data of accessor acc_idx."""
+    acc = gltf["accessors"][acc_idx]
+    count, ncomp = q.shape
+    elem = q.dtype.itemsize * ncomp
+    stride = elem + (4 - elem % 4) % 4
+    padded = np.zeros((count, stride // q.dtype.itemsize), dtype=q.dtype)
+    padded[:, :ncomp] = q
+
+    acc["bufferView"] = add_view(gltf, views, padded.tobytes(), byte_stride=stride, target=ARRAY_BUFFER)
+    acc["byteOffset"] = 0
+    acc["componentType"] = component_type
+    acc["normalized"] = normalized
+    acc["min"] = q.min(axis=0).tolist()
+    acc["max"] = q.max(axis=0).tolist()
+
+
+# ---------------------------------------------------------------------------
+# Textures
+# ---------------------------------------------------------------------------
+
+def _has_alpha(img):
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        return img.convert("RGBA").getchannel("A").getextrema()[0] < 255
+    return False
+
+
+def psnr(a, b):
+    """Peak signal-to-noise ratio between two equally sized images, in dB."""
+    diff = ImageChops.difference(a.convert("RGB"), b.convert("RGB"))
+    mse = sum(ImageStat.Stat(diff).sum2) / (3.0 * a.width * a.height)
+    if mse == 0:
+        return float("inf")
+    return 10.0 * math.log10(255.0 ** 2 / mse)
+
+
+def compress_textures(gltf, views, max_dim=DEFAULT_MAX_TEXTURE, fmt="jpeg", quality=DEFAULT_JPEG_QUALITY,
+                      min_psnr=DEFAULT_MIN_PSNR):
+    """Resize and re-encode embedded images in place. Returns a list of per-image stats."""
+    stats = []
+    webp_images = set()
+    for img_idx, image in enumerate(gltf.get("images", [])):
+        if "bufferView" not in image:
+            continue
+        bv_idx = image["bufferView"]
+        src_bytes = views[bv_idx]
+        img = Image.open(io.BytesIO(src_bytes))
+        if img.format in LOSSY_FORMATS and max(img.size) <= max_dim:
+            stats.append({"image": img_idx, "kept": True, "bytes": len(src_bytes)})
+            continue
+        img.load()
+
+        resized = img
+        if max(img.size) > max_dim:
+            resized = img.copy()
+            resized.thumbnail((max_dim, max_dim), Image.LANCZOS)
+
+        alpha = _has_alpha(resized)
+        candidates = []
+        if not alpha:
+            rgb = resized.convert("RGB")
+            buf = io.BytesIO()
+            if fmt == "webp":
+                rgb.save(buf, "WEBP", quality=quality, method=6)
+                candidates.append(("image/webp", buf.getvalue()))
+            else:
+                rgb.save(buf, "JPEG", quality=quality, optimize=True, progressive=False)
+                candidates.append(("image/jpeg", buf.getvalue()))
+        buf = io.BytesIO()
+        resized.save(buf, "PNG", optimize=True)
+        candidates.append(("image/png", buf.getvalue()))
+
+        chosen_mime, chosen_bytes, quality_db = None, None, None
+        for mime, data in candidates:
+            if mime != "image/png":
+                quality_db = psnr(resized, Image.open(io.BytesIO(data)))
+                if quality_db < min_psnr:
+                    continue
+            chosen_mime, chosen_bytes = mime, data
+            break
+
+        # Never make a texture bigger than it was
+        if len(chosen_bytes) >= len(src_bytes) and resized is img:
+            stats.append({"image": img_idx, "kept": True, "bytes": len(src_bytes)})
+            continue
+
+        views[bv_idx] = chosen_bytes
+        image["mimeType"] = chosen_mime
+        if chosen_mime == "image/webp":
+            webp_images.add(img_idx)
+        stats.append({
+            "image": img_idx,
+            "kept": False,
+            "size": list(resized.size),
+            "mimeType": chosen_mime,
+            "psnr": None if quality_db is None or chosen_mime == "image/png" else round(quality_db, 2),
+            "bytes_before": len(src_bytes),
+            "bytes_after": len(chosen_bytes)
+        })
+
+    if webp_images:
+        for tex in gltf.get("textures", []):
+            if tex.get("source") in webp_images:
+                tex.setdefault("extensions", {})["EXT_texture_webp"] = {"source": tex.pop("source")}
+        _use_extension(gltf, "EXT_texture_webp")
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Quantization
+# ---------------------------------------------------------------------------
+
+def quantize_meshes(gltf, views):
+    """Quantize vertex attributes of static meshes in place. Returns the max relative position error."""
+    meshes = gltf.get("meshes", [])
+    nodes = gltf.get("nodes", [])
+
+    skinned = {n["mesh"] for n in nodes if "mesh" in n and "skin" in n}
+    position_owner = {}
+    for m_idx, mesh in enumerate(meshes):
+        for prim in mesh.get("primitives", []):
+            pos = prim.get("attributes", {}).get("POSITION")
+            if pos is not None:
+                position_owner.setdefault(pos, set()).add(m_idx)
+
+    max_error = 0.0
+    done = set()
+    quantized_meshes = {}
+    for m_idx, mesh in enumerate(meshes):
+        prims = mesh.get("primitives", [])
+        if m_idx in skinned or any(p.get("targets") for p in prims):
+            continue
+        pos_ids = [p["attributes"]["POSITION"] for p in prims if "POSITION" in p.get("attributes", {})]
+        if not pos_ids or any(len(position_owner[a]) > 1 for a in pos_ids):
+            continue
+        if any(gltf["accessors"][a]["componentType"] != 5126 or "sparse" in gltf["accessors"][a] for a in pos_ids):
+            continue
+
+        positions = {a: read_accessor(gltf, views, a) for a in set(pos_ids)}
+        stacked = np.concatenate(list(positions.values()))
+        lo, hi = stacked.min(axis=0), stacked.max(axis=0)
+        center = (lo + hi) / 2.0
+        # Uniform scale keeps normals valid under the dequantization transform
+        scale = float(max((hi - lo).max() / 2.0, 1e-8))
+        diag = float(np.linalg.norm(hi - lo)) or 1.0
+
+        for a, p in positions.items():
+            q = np.clip(np.round((p - center) / scale * 32767.0), -32767, 32767).astype(np.int16)
+            err = np.abs(q.astype(np.float64) / 32767.0 * scale + center - p).max()
+            max_error = max(max_error, float(err) / diag)
+            _write_quantized(gltf, views, a, q, 5122)
+            done.add(a)
+        quantized_meshes[m_idx] = (center.tolist(), scale)
+
+        for prim in prims:
+            attrs = prim.get("attributes", {})
+            for name, a in attrs.items():
+                acc = gltf["accessors"][a]
+                if a in done or acc["componentType"] != 5126 or "sparse" in acc:
+                    continue
+                if name == "NORMAL":
+                    n = read_accessor(gltf, views, a)
+                    _write_quantized(gltf, views, a, np.round(np.clip(n, -1, 1) * 127.0).astype(np.int8), 5120)
+                    done.add(a)
+                elif name.startswith("TEXCOORD_"):
+                    uv = read_accessor(gltf, views, a)
+                    if uv.size and uv.min() >= 0.0 and uv.max() <= 1.0:
+                        _write_quantized(gltf, views, a, np.round(uv * 65535.0).astype(np.uint16), 5123)
+                        done.add(a)
+
+    if not quantized_meshes:
+        return 0.0
+
+    # Move each quantized mesh onto a child node carrying its dequantization
+    # transform so the parent's own transform and children are untouched.
+    for node in list(nodes):
+        m_idx = node.get("mesh")
+        if m_idx not in quantized_meshes:
+            continue
+        center, scale = quantized_meshes[m_idx]
+        child = {"mesh": node.pop("mesh"), "translation": center, "scale": [scale, scale, scale]}
+        if "name" in node:
+            child["name"] = f"{node['name']}_dequant"
+        nodes.append(child)
+        node.setdefault("children", []).append(len(nodes) - 1)
+
+    _use_extension(gltf, "KHR_mesh_quantization")
+    return max_error
+
+
+# ---------------------------------------------------------------------------
+# Deduplication
+# ---------------------------------------------------------------------------
+
+def dedupe_views(gltf, views):
+    """Point byte-identical buffer views at a single copy. Returns the number of views merged."""
+    seen, remap, merged = {}, {}, 0
+    for idx, bv in enumerate(gltf.get("bufferViews", [])):
+        key = (hashlib.sha1(views[idx]).digest(), bv.get("byteStride"), bv.get("target"))
+        if key in seen:
+            remap[idx] = seen[key]
+            merged += 1
+        else:
+            seen[key] = idx
+            remap[idx] = idx
+    if merged:
+        _remap_buffer_views(gltf, remap)
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def compress_glb(src_path, dst_path=None, max_dim=DEFAULT_MAX_TEXTURE, fmt="jpeg", quality=DEFAULT_JPEG_QUALITY,
+                 min_psnr=DEFAULT_MIN_PSNR, quantize=False):
+    """Compress one GLB (in place when dst_path is None). Returns a report dict."""
+    dst_path = dst_path or src_path
+    report = {"path": src_path, "error": None}
+    try:
+        before = os.path.getsize(src_path)
+        gltf, views = read_glb(src_path)
+
+        report["textures"] = compress_textures(gltf, views, max_dim, fmt, quality, min_psnr)
+        report["max_position_error"] = quantize_meshes(gltf, views) if quantize else 0.0
+        report["deduplicated_views"] = dedupe_views(gltf, views)
+        data = pack_glb(gltf, views)
+
+        report["bytes_before"] = before
+        report["bytes_after"] = len(data)
+
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".glb", dir=os.path.dirname(os.path.abspath(dst_path)))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, dst_path)
+    except Exception as e:
+        report["error"] = str(e)
+    return report
+
+
+def _compress_job(job):
+    path, kwargs = job
+    return compress_glb(path, **kwargs)
+
+
+if __name__ == "__main__":
+    default_models = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+    parser = argparse.ArgumentParser(description="Compress textures and quantize meshes of model package GLBs.")
+    parser.add_argument("inputs", nargs="*", help="GLB files (default: every *_AI_Rodin*.glb under --models-dir)")
+    parser.add_argument("--models-dir", default=default_models, help="Directory containing the model package folders")
+    parser.add_argument("--max-texture", type=int, default=DEFAULT_MAX_TEXTURE, help="Max texture dimension in pixels")
+    parser.add_argument("--format", choices=["jpeg", "webp"], default="jpeg", help="Lossy format for opaque textures")
+    parser.add_argument("--quality", type=int, default=DEFAULT_JPEG_QUALITY, help="Lossy encoder quality (1-100)")
+    parser.add_argument("--min-psnr", type=float, default=DEFAULT_MIN_PSNR, help="Keep PNG when the lossy copy is below this PSNR (dB)")
+    parser.add_argument("--quantize", action="store_true",
+                        help="Also apply KHR_mesh_quantization (trimesh-based tools cannot read the result correctly)")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+
+    args = parser.parse_args()
+
+    inputs = args.inputs or sorted(glob.glob(os.path.join(args.models_dir, "*", "*", "*_AI_Rodin*.glb")))
+    kwargs = {
+        "max_dim": args.max_texture,
+        "fmt": args.format,
+        "quality": args.quality,
+        "min_psnr": args.min_psnr,
+        "quantize": args.quantize
+    }
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        reports = list(pool.map(_compress_job, [(p, kwargs) for p in inputs]))
+
+    failed, total_before, total_after = 0, 0, 0
+    for r in reports:
+        if r["error"]:
+            failed += 1
+            print(f"ERROR {r['path']}: {r['error']}")
+            continue
+        total_before += r["bytes_before"]
+        total_after += r["bytes_after"]
+        print(f"{os.path.basename(r['path'])}: {r['bytes_before'] / 1e6:.2f} MB -> {r['bytes_after'] / 1e6:.2f} MB "
+              f"(max pos err {r['max_position_error']:.2e}, {r['deduplicated_views']} views deduped)")
+
+    if total_before:
+        print(f"Total: {total_before / 1e6:.2f} MB -> {total_after / 1e6:.2f} MB "
+              f"({100.0 * (1 - total_after / total_before):.1f}% saved)")
+    sys.exit(1 if failed else 0)
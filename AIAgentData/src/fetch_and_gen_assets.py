@@ -4,10 +4,8 @@ import requests
 from bs4 import BeautifulSoup
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
-import trimesh
-import numpy as np
-import random
-import math
+
+from placeholder_glb import write_placeholder_glb
 
 # Proxy Configuration
 PROXY_URL = "http://127.0.0.1:7897"
@@ -212,115 +210,8 @@ def generate_placeholder_image(text):
 
 def generate_drone_glb(filename, drone_type="multicopter"):
     print(f"Generating {drone_type} GLB model: {filename}")
-    
-    # Colors
-    dark_grey = [40, 40, 40, 255]
-    black = [10, 10, 10, 255]
-    light_grey = [150, 150, 150, 255] 
-    white = [220, 220, 220, 255]
-    
-    parts = []
-    
-    # 1. Main Body (Fuselage)
-    body = trimesh.creation.box(extents=[0.5, 0.25, 0.2])
-    body.visual.face_colors = white
-    parts.append(body)
-    
-    if drone_type == "fixed_wing_vtol":
-        # Wings
-        wing_span = 2.0
-        wing_chord = 0.3
-        wing_thickness = 0.05
-        wing = trimesh.creation.box(extents=[wing_chord, wing_span, wing_thickness])
-        wing.apply_translation([0, 0, 0.1]) # On top of body
-        wing.visual.face_colors = white
-        parts.append(wing)
-        
-        # Tail boom (Twin boom for many VTOLs like CW-15/CarryAll)
-        boom_length = 1.2
-        boom_radius = 0.03
-        boom_offset = 0.5 # Distance from center
-        
-        for side in [-1, 1]:
-            boom = trimesh.creation.cylinder(radius=boom_radius, height=boom_length)
-            boom.apply_transform(trimesh.transformations.rotation_matrix(math.pi/2, [0, 1, 0])) # Horizontal
-            boom.apply_translation([0, side * boom_offset, 0])
-            boom.visual.face_colors = dark_grey
-            parts.append(boom)
-            
-            # VTOL Motors on booms (Front and Back)
-            for end in [-1, 1]:
-                motor_x = end * (boom_length/2 - 0.1)
-                motor = trimesh.creation.cylinder(radius=0.04, height=0.1)
-                motor.apply_translation([motor_x, side * boom_offset, 0.05])
-                motor.visual.face_colors = black
-                parts.append(motor)
-                
-                prop = trimesh.creation.cylinder(radius=0.25, height=0.01)
-                prop.apply_translation([motor_x, side * boom_offset, 0.1])
-                prop.visual.face_colors = light_grey
-                parts.append(prop)
-                
-        # Tail stabilizer
-        tail = trimesh.creation.box(extents=[0.2, 1.2, 0.02])
-        tail.apply_translation([-boom_length/2, 0, 0.1])
-        tail.visual.face_colors = white
-        parts.append(tail)
-        
-    else: # multicopter (EH216 style - Coaxial 8 arms, 16 props, actually 8 arms with 2 motors each)
-        # EH216 has 8 arms radiating from bottom
-        arm_length = 0.6
-        arm_thickness = 0.05
-        
-        for i in range(8):
-            angle = i * (360/8)
-            rad = math.radians(angle)
-            
-            # Arm
-            arm = trimesh.creation.box(extents=[arm_length, arm_thickness, arm_thickness])
-            rotation = trimesh.transformations.rotation_matrix(rad, [0, 0, 1])
-            arm.apply_transform(rotation)
-            arm.apply_translation([math.cos(rad)*(arm_length/2+0.2), math.sin(rad)*(arm_length/2+0.2), -0.1])
-            arm.visual.face_colors = white
-            parts.append(arm)
-            
-            # Motor/Prop Stack (Coaxial - Top and Bottom)
-            end_x = math.cos(rad) * (arm_length + 0.2)
-            end_y = math.sin(rad) * (arm_length + 0.2)
-            
-            for z_offset in [0.05, -0.05]:
-                motor = trimesh.creation.cylinder(radius=0.05, height=0.05)
-                motor.apply_translation([end_x, end_y, -0.1 + z_offset])
-                motor.visual.face_colors = black
-                parts.append(motor)
-                
-                prop = trimesh.creation.cylinder(radius=0.2, height=0.01)
-                prop.apply_translation([end_x, end_y, -0.1 + z_offset * 1.5])
-                prop.visual.face_colors = light_grey
-                parts.append(prop)
-
-    # Landing Gear (Skids)
-    leg_height = 0.3
-    skid_length = 0.5
-    skid_offset_y = 0.2
-    
-    for side in [-1, 1]:
-        leg = trimesh.creation.box(extents=[0.02, 0.02, leg_height])
-        leg.apply_translation([0, side * skid_offset_y, -leg_height/2 - 0.1])
-        leg.visual.face_colors = black
-        parts.append(leg)
-        
-        skid = trimesh.creation.box(extents=[skid_length, 0.03, 0.03])
-        skid.apply_translation([0, side * skid_offset_y, -leg_height - 0.1])
-        skid.visual.face_colors = black
-        parts.append(skid)
-    
-    # Combine all parts
-    mesh = trimesh.util.concatenate(parts)
-    
     path = os.path.join(ASSETS_DIR, filename)
-    mesh.export(path)
-    return path
+    return write_placeholder_glb(path, drone_type)
 
 def process_drone(json_filename, config):
     print(f"\nProcessing {config['name']}...")
@@ -4,10 +4,8 @@ import requests
 from bs4 import BeautifulSoup
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
-import trimesh
-import numpy as np
-import random
-import math
+
+from placeholder_glb import write_placeholder_glb, DARK_GREY
 
 # Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -15,6 +13,27 @@ MODELS_DIR = os.path.join(BASE_DIR, "..", "models")
 ASSETS_DIR = os.path.join(MODELS_DIR, "assets")
 AGENT_FILE = "大疆Matrice 300RTK无人机.json"
 AGENT_PATH = os.path.join(MODELS_DIR, AGENT_FILE)
+# M300 layout for the multicopter placeholder template: X-config quad with
+# inverted props hanging below the arms
+M300_PARAMS = {
+    "arms": 4,
+    "angle_offset": 45.0,
+    "arm_length": 0.4,
+    "arm_thickness": 0.04,
+    "hub_offset": 0.1,
+    "arm_z": 0.0,
+    "body_extents": (0.3, 0.2, 0.15),
+    "body_color": DARK_GREY,
+    "arm_color": DARK_GREY,
+    "motor_radius": 0.04,
+    "motor_height": 0.08,
+    "prop_radius": 0.25,
+    "rotor_stack": ((-0.05, -0.1),),
+    "leg_height": 0.25,
+    "skid_length": 0.4,
+    "skid_offset_y": 0.15,
+    "gear_z": 0.0
+}
 # List of URLs to search for images (Third-party retailers/reviews, avoiding official site search)
 TARGET_URLS = [
     "https://www.genpacdrones.com/product/dji-matrice-300-rtk-drone/",
@@ -168,84 +187,8 @@ def generate_placeholder_image(text):
 
 def generate_drone_glb(filename):
     print("Generating M300-style drone GLB model...")
-    
-    # Colors
-    dark_grey = [40, 40, 40, 255]
-    black = [10, 10, 10, 255]
-    light_grey = [150, 150, 150, 255] # Props
-    
-    parts = []
-    
-    # 1. Main Body (Central Hub) - slightly elongated box
-    body = trimesh.creation.box(extents=[0.3, 0.2, 0.15])
-    body.visual.face_colors = dark_grey
-    parts.append(body)
-    
-    # 2. Arms (M300 has inverted props, arms go slightly up then down or straight)
-    # We'll do 4 arms extending from corners
-    arm_length = 0.4
-    arm_thickness = 0.04
-    
-    # Angles for 4 arms (X config)
-    angles = [45, 135, 225, 315]
-    
-    for angle in angles:
-        rad = math.radians(angle)
-        x = math.cos(rad) * (arm_length / 2 + 0.1) # Offset from center
-        y = math.sin(rad) * (arm_length / 2 + 0.1)
-        
-        # Arm strut
-        arm = trimesh.creation.box(extents=[arm_length, arm_thickness, arm_thickness])
-        # Rotate arm to match angle
-        rotation = trimesh.transformations.rotation_matrix(rad, [0, 0, 1])
-        arm.apply_transform(rotation)
-        # Translate to position
-        arm.apply_translation([x, y, 0])
-        arm.visual.face_colors = dark_grey
-        parts.append(arm)
-        
-        # Motor housing (at end of arm)
-        end_x = math.cos(rad) * (arm_length + 0.1)
-        end_y = math.sin(rad) * (arm_length + 0.1)
-        
-        motor = trimesh.creation.cylinder(radius=0.04, height=0.08)
-        # M300 motors face DOWN usually, but let's put them standard for simplicity or check M300 ref.
-        # M300 props are inverted (below the arm).
-        motor.apply_translation([end_x, end_y, -0.05])
-        motor.visual.face_colors = black
-        parts.append(motor)
-        
-        # Propeller (below motor)
-        prop = trimesh.creation.cylinder(radius=0.25, height=0.01)
-        prop.apply_translation([end_x, end_y, -0.1])
-        prop.visual.face_colors = light_grey
-        parts.append(prop)
-
-    # 3. Landing Gear (Skids)
-    # Two legs going down, then horizontal skids
-    leg_height = 0.25
-    skid_length = 0.4
-    skid_offset_y = 0.15 # Distance from center line
-    
-    for side in [-1, 1]: # Left and Right
-        # Vertical Leg
-        leg = trimesh.creation.box(extents=[0.02, 0.02, leg_height])
-        leg.apply_translation([0, side * skid_offset_y, -leg_height/2])
-        leg.visual.face_colors = black
-        parts.append(leg)
-        
-        # Horizontal Skid
-        skid = trimesh.creation.box(extents=[skid_length, 0.03, 0.03])
-        skid.apply_translation([0, side * skid_offset_y, -leg_height])
-        skid.visual.face_colors = black
-        parts.append(skid)
-    
-    # Combine all parts
-    mesh = trimesh.util.concatenate(parts)
-    
     path = os.path.join(ASSETS_DIR, filename)
-    mesh.export(path)
-    return path
+    return write_placeholder_glb(path, "multicopter", **M300_PARAMS)
 
 def main():
     ensure_dir(ASSETS_DIR)
@@ -1,9 +1,11 @@
 import os
-import json
 import subprocess
 import trimesh
 import numpy as np
 
+from agent_json_rewriter import rewrite_library, DEFAULT_RULES
+from gen_lod_models import check_lod_urls
+
 def rotate_m1083():
     target_file = r"d:\AIProduct\GaeainCloud\LaViCDocs\AIAgentData\models\M1083_A1P2_Truck\M1083_A1P2_Truck\M1083_A1P2_Truck_AI_Rodin.glb"
     if os.path.exists(target_file):
@@ -30,107 +32,29 @@ def rotate_m1083():
     else:
         print(f"Target file for rotation not found: {target_file}")
 
-def fix_agent_json(models_dir):
-    try:
-        items = os.listdir(models_dir)
-    except FileNotFoundError:
+def fix_agent_json(models_dir, dry_run=False):
+    # Field patching is driven by the declarative rules in agent_json_rewriter;
+    # files are only rewritten (atomically) when a rule actually changes them.
+    if not os.path.isdir(models_dir):
         print(f"Error: Directory not found: {models_dir}")
         return
 
-    dirs = [d for d in items if os.path.isdir(os.path.join(models_dir, d)) and d != "assets"]
-
-    print(f"Found directories to process: {dirs}")
-
-    for drone_name in dirs:
-        folder_path = os.path.join(models_dir, drone_name)
-        json_path = os.path.join(folder_path, "agent.json")
-        
-        if not os.path.exists(json_path):
-            print(f"Warning: {json_path} not found. Skipping.")
-            continue
-            
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            updated = False
-            
-            # Helper function to update a single agent dict
-            def update_agent_dict(agent_dict, d_name):
-                is_updated = False
-                
-                # 1. Update 'model' object fields
-                if 'model' in agent_dict:
-                    agent_dict['model']['modelName'] = d_name
-                    # Thumbnail
-                    if 'thumbnail' in agent_dict['model']:
-                        thumb_filename = f"{d_name}.png"
-                        agent_dict['model']['thumbnail']['url'] = f"{d_name}/{thumb_filename}"
-                        agent_dict['model']['thumbnail']['ossSig'] = thumb_filename
-                    
-                    # Map Icon (Military Symbol)
-                    if 'mapIconUrl' in agent_dict['model']:
-                        mil_filename = f"{d_name}_mil.png"
-                        agent_dict['model']['mapIconUrl']['url'] = f"{d_name}/{mil_filename}"
-                        agent_dict['model']['mapIconUrl']['ossSig'] = mil_filename
+    results = rewrite_library(models_dir, DEFAULT_RULES, dry_run=dry_run)
+    print(f"Processed {len(results)} agent.json files")
 
-                    # Dim Model Urls (GLB)
-                    if 'dimModelUrls' in agent_dict['model'] and isinstance(agent_dict['model']['dimModelUrls'], list):
-                         for dim_model in agent_dict['model']['dimModelUrls']:
-                             # We assume we update all of them or just the first one?
-                             # Let's update all to point to the new rodin model
-                             glb_filename = f"{d_name}_AI_Rodin.glb"
-                             dim_model['url'] = f"{d_name}/{glb_filename}"
-                             dim_model['ossSig'] = glb_filename
-                    
-                    is_updated = True
-                    
-                # 2. Update root-level GLB paths
-                glb_filename = f"{d_name}_AI_Rodin.glb"
-                glb_path = f"{d_name}/{glb_filename}"
-                
-                if 'modelUrlSlim' in agent_dict:
-                    agent_dict['modelUrlSlim'] = glb_path
-                    is_updated = True
-                if 'modelUrlFat' in agent_dict:
-                    agent_dict['modelUrlFat'] = glb_path
-                    is_updated = True
-                    
-                # 3. Update root-level Symbols
-                if 'modelUrlSymbols' in agent_dict and isinstance(agent_dict['modelUrlSymbols'], list):
-                    for symbol in agent_dict['modelUrlSymbols']:
-                        if symbol.get('symbolSeries') == 1:
-                            symbol_filename = f"{d_name}.png"
-                            symbol_path = f"{d_name}/{symbol_filename}"
-                            symbol['symbolName'] = symbol_path
-                            symbol['thumbnail'] = symbol_path
-                            is_updated = True
-                        elif symbol.get('symbolSeries') == 2:
-                            mil_filename = f"{d_name}_mil.png"
-                            mil_path = f"{d_name}/{mil_filename}"
-                            symbol['symbolName'] = mil_path
-                            symbol['thumbnail'] = mil_path
-                            is_updated = True
-                            
-                return is_updated
+    for r in results:
+        if r["error"]:
+            print(f"Failed to process {r['path']}: {r['error']}")
+        elif r["changed"]:
+            print(f"Updated fields for {os.path.basename(os.path.dirname(r['path']))} ({len(r['changes'])} changes)")
+            if r["diff"]:
+                print(r["diff"])
+        else:
+            print(f"No updates needed for {r['path']}")
 
-            if isinstance(data, list):
-                for item in data:
-                    if update_agent_dict(item, drone_name):
-                        updated = True
-            elif isinstance(data, dict):
-                if update_agent_dict(data, drone_name):
-                    updated = True
-                    
-            if updated:
-                print(f"Updated fields for {drone_name}")
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-            else:
-                print(f"No updates needed for {json_path}")
-                
-        except Exception as e:
-            print(f"Failed to process {json_path}: {e}")
+    # LOD URLs written by gen_lod_models.py must survive the rewrite
+    for name, field, expected, actual in check_lod_urls(models_dir):
+        print(f"[ERROR] {name}: {field} is {actual!r}, expected LOD {expected!r}")
 
 if __name__ == "__main__":
     # Rotate M1083 model first
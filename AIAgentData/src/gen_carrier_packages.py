@@ -14,6 +14,8 @@ from reportlab.graphics import renderPM
 import trimesh
 import numpy as np
 
+from placeholder_glb import write_placeholder_glb
+
 # --- Configuration ---
 # Use raw strings for paths
 BASE_DIR = r"d:\AIProduct\GaeainCloud\LaViCDocs\AIAgentData"
@@ -422,7 +424,9 @@ def create_package(row):
         shutil.copy(saved_glb, glb_dst)
         process_glb_rotation_strict(glb_dst)
     else:
-        print(f"  [MISSING] Failed to generate GLB for {en_name}")
+        # Ship a small valid placeholder so the package still loads in LaViC
+        print(f"  [MISSING] Failed to generate GLB for {en_name}, using placeholder.")
+        write_placeholder_glb(glb_dst, "fixed_wing_vtol", vtol=False, skids=False)
         
     # 3. Zip
     zip_path = os.path.join(MODELS_DIR, f"{en_name}.zip")
@@ -0,0 +1,189 @@
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import trimesh
+
+from agent_json_rewriter import compile_rules, rewrite_file, find_agent_jsons
+
+# LOD stage: decimates each package's {name}_AI_Rodin.glb to slim / medium /
+# fat triangle budgets with quadric edge collapse and points modelUrlSlim,
+# modelUrlMedium and modelUrlFat at the results.
+#
+# fast_simplification (the backend behind trimesh's simplify_quadric_decimation)
+# is used directly so the collapse mapping can be replayed to carry UVs over;
+# without it we fall back to trimesh, which drops texture coordinates.
+try:
+    import fast_simplification
+except ImportError:
+    fast_simplification = None
+
+# Target triangle budgets per LOD level. A level is skipped (the source GLB is
+# used) when the model is already under budget.
+LOD_BUDGETS = {
+    "slim": 5000,
+    "medium": 20000,
+    "fat": 80000
+}
+
+LOD_FIELDS = {
+    "slim": "modelUrlSlim",
+    "medium": "modelUrlMedium",
+    "fat": "modelUrlFat"
+}
+
+
+def count_faces(scene):
+    return sum(len(g.faces) for g in scene.geometry.values() if isinstance(g, trimesh.Trimesh))
+
+
+def decimate_mesh(mesh, target_faces):
+    """Quadric-decimate one mesh to roughly target_faces, keeping UVs and material when possible."""
+    n_faces = len(mesh.faces)
+    if target_faces >= n_faces:
+        return mesh.copy()
+    target_faces = max(target_faces, 4)
+
+    if fast_simplification is None:
+        return mesh.simplify_quadric_decimation(face_count=target_faces)
+
+    points = np.asarray(mesh.vertices, dtype=np.float32)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    _, _, collapses = fast_simplification.simplify(
+        points, faces, target_reduction=1.0 - target_faces / n_faces, return_collapses=True)
+    new_points, new_faces, mapping = fast_simplification.replay_simplification(points, faces, collapses)
+
+    visual = None
+    uv = getattr(mesh.visual, "uv", None)
+    if uv is not None and len(uv) == len(points):
+        # Each surviving vertex takes the UV of one of the source vertices collapsed into it
+        new_uv = np.zeros((len(new_points), 2), dtype=np.float64)
+        new_uv[mapping] = uv
+        visual = trimesh.visual.TextureVisuals(uv=new_uv, material=mesh.visual.material)
+
+    return trimesh.Trimesh(vertices=new_points, faces=new_faces, visual=visual, process=False)
+
+
+def decimate_scene(scene, budget):
+    """Return a copy of scene whose meshes share the triangle budget in proportion to their size."""
+    total = count_faces(scene)
+    out = scene.copy()
+    if total <= budget:
+        return out, total
+
+    ratio = budget / float(total)
+    for name, geom in list(out.geometry.items()):
+        if isinstance(geom, trimesh.Trimesh):
+            out.geometry[name] = decimate_mesh(geom, int(len(geom.faces) * ratio))
+    return out, count_faces(out)
+
+
+def generate_lods(package_dir, budgets=None, dry_run=False):
+    """Build LOD GLBs for one package folder and update its agent.json. Returns a report dict."""
+    budgets = budgets or LOD_BUDGETS
+    name = os.path.basename(os.path.normpath(package_dir))
+    report = {"package": name, "levels": {}, "error": None}
+
+    src_rel = f"{name}/{name}_AI_Rodin.glb"
+    src_path = os.path.join(package_dir, name, f"{name}_AI_Rodin.glb")
+    if not os.path.exists(src_path):
+        report["error"] = f"File not found: {src_path}"
+        return report
+
+    try:
+        scene = trimesh.load(src_path, force='scene')
+        source_faces = count_faces(scene)
+        report["source_faces"] = source_faces
+
+        rules = []
+        for level, budget in budgets.items():
+            if source_faces <= budget:
+                rel = src_rel
+                faces = source_faces
+            else:
+                rel = f"{name}/{name}_AI_Rodin_{level}.glb"
+                lod_scene, faces = decimate_scene(scene, budget)
+                if not dry_run:
+                    lod_scene.export(os.path.join(package_dir, rel))
+            report["levels"][level] = {"url": rel, "faces": faces}
+            rules.append({"path": LOD_FIELDS[level], "value": rel, "create": True})
+
+        result = rewrite_file(os.path.join(package_dir, "agent.json"), compile_rules(rules), {"name": name}, dry_run)
+        report["agent_json_changed"] = result["changed"]
+        if result["error"]:
+            report["error"] = result["error"]
+    except Exception as e:
+        report["error"] = str(e)
+
+    return report
+
+
+def check_lod_urls(models_dir):
+    """[(package, field, expected, actual)] for LOD GLBs on disk that agent.json does not point at,
+    and for model URLs that point outside the package"""
+    mismatches = []
+    for json_path, name in find_agent_jsons(models_dir):
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        agents = [a for a in (data if isinstance(data, list) else [data]) if isinstance(a, dict)]
+        for level, field in LOD_FIELDS.items():
+            rel = f"{name}/{name}_AI_Rodin_{level}.glb"
+            has_lod = os.path.exists(os.path.join(models_dir, name, rel))
+            for agent in agents:
+                url = agent.get(field)
+                if has_lod and url != rel:
+                    mismatches.append((name, field, rel, url))
+                elif url and not url.startswith(f"{name}/"):
+                    mismatches.append((name, field, f"{name}/{name}_AI_Rodin.glb", url))
+    return mismatches
+
+
+def _lod_job(job):
+    package_dir, budgets, dry_run = job
+    return generate_lods(package_dir, budgets, dry_run)
+
+
+if __name__ == "__main__":
+    default_models = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+    parser = argparse.ArgumentParser(description="Generate slim/medium/fat LOD GLBs for model packages.")
+    parser.add_argument("--models-dir", default=default_models, help="Directory containing the model package folders")
+    parser.add_argument("--packages", nargs="*", default=None, help="Package folder names (default: all)")
+    parser.add_argument("--slim", type=int, default=LOD_BUDGETS["slim"], help="Triangle budget for modelUrlSlim")
+    parser.add_argument("--medium", type=int, default=LOD_BUDGETS["medium"], help="Triangle budget for modelUrlMedium")
+    parser.add_argument("--fat", type=int, default=LOD_BUDGETS["fat"], help="Triangle budget for modelUrlFat")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--dry-run", action="store_true", help="Report face counts without writing files")
+
+    args = parser.parse_args()
+
+    if fast_simplification is None:
+        print("Warning: 'fast_simplification' not found, UVs will be dropped. Please run: pip install fast-simplification")
+
+    packages = args.packages or [
+        d for d in sorted(os.listdir(args.models_dir))
+        if d != "assets" and os.path.isfile(os.path.join(args.models_dir, d, "agent.json"))
+    ]
+    budgets = {"slim": args.slim, "medium": args.medium, "fat": args.fat}
+    jobs = [(os.path.join(args.models_dir, p), budgets, args.dry_run) for p in packages]
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        reports = list(pool.map(_lod_job, jobs))
+
+    failed = 0
+    for r in reports:
+        if r["error"]:
+            failed += 1
+            print(f"[{r['package']}] ERROR: {r['error']}")
+            continue
+        levels = ", ".join(f"{lvl}={info['faces']}" for lvl, info in r["levels"].items())
+        print(f"[{r['package']}] source={r['source_faces']} -> {levels}")
+
+    print(f"{len(reports) - failed}/{len(reports)} packages processed")
+    sys.exit(1 if failed else 0)
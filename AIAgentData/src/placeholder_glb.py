@@ -0,0 +1,223 @@
+import os
+import math
+import argparse
+from functools import lru_cache
+
+import numpy as np
+import trimesh
+
+# Parametric placeholder GLB generator.
+#
+# Every template is described as a list of parts (primitive, color, 4x4
+# transform). Unit primitives are built once per (kind, color) and shared: each
+# part becomes a scene node pointing at the cached geometry, so the exported
+# GLB holds one mesh per primitive/color and instances it through node
+# transforms instead of concatenating duplicated geometry.
+
+WHITE = (220, 220, 220, 255)
+LIGHT_GREY = (150, 150, 150, 255)
+DARK_GREY = (40, 40, 40, 255)
+BLACK = (10, 10, 10, 255)
+OLIVE = (85, 95, 55, 255)
+NAVY_GREY = (110, 120, 130, 255)
+
+CYLINDER_SECTIONS = 24
+
+
+@lru_cache(maxsize=None)
+def unit_primitive(kind, color):
+    """Unit box (1x1x1), cylinder or cone (radius 1, height 1 along Z) with a flat color."""
+    if kind == "box":
+        mesh = trimesh.creation.box(extents=[1.0, 1.0, 1.0])
+    elif kind == "cylinder":
+        mesh = trimesh.creation.cylinder(radius=1.0, height=1.0, sections=CYLINDER_SECTIONS)
+    elif kind == "cone":
+        mesh = trimesh.creation.cone(radius=1.0, height=1.0, sections=CYLINDER_SECTIONS)
+    else:
+        raise ValueError(f"Unknown primitive: {kind}")
+    # One flat PBR material per color keeps the GLB small (no per-vertex colors)
+    material = trimesh.visual.material.PBRMaterial(baseColorFactor=color, metallicFactor=0.0, roughnessFactor=0.8)
+    mesh.visual = trimesh.visual.TextureVisuals(material=material)
+    return mesh
+
+
+def _matrix(translate=(0, 0, 0), size=(1, 1, 1), rotation=None):
+    """T @ R @ S for a unit primitive."""
+    m = np.diag([size[0], size[1], size[2], 1.0])
+    if rotation is not None:
+        m = rotation @ m
+    m[:3, 3] = translate
+    return m
+
+
+def box(color, extents, translate=(0, 0, 0), rotation=None):
+    return ("box", color, _matrix(translate, extents, rotation))
+
+
+def cylinder(color, radius, height, translate=(0, 0, 0), rotation=None):
+    return ("cylinder", color, _matrix(translate, (radius, radius, height), rotation))
+
+
+def cone(color, radius, height, translate=(0, 0, 0), rotation=None):
+    return ("cone", color, _matrix(translate, (radius, radius, height), rotation))
+
+
+def _rot(angle, axis):
+    return trimesh.transformations.rotation_matrix(angle, axis)
+
+
+# ---------------------------------------------------------------------------
+# Templates
+# ---------------------------------------------------------------------------
+
+def _landing_skids(leg_height=0.3, skid_length=0.5, skid_offset_y=0.2, gear_z=-0.1):
+    parts = []
+    for side in [-1, 1]:
+        parts.append(box(BLACK, [0.02, 0.02, leg_height], [0, side * skid_offset_y, -leg_height / 2 + gear_z]))
+        parts.append(box(BLACK, [skid_length, 0.03, 0.03], [0, side * skid_offset_y, -leg_height + gear_z]))
+    return parts
+
+
+def multicopter(arms=8, angle_offset=0.0, arm_length=0.6, arm_thickness=0.05, hub_offset=0.2, arm_z=-0.1,
+                body_extents=(0.5, 0.25, 0.2), body_color=WHITE, arm_color=WHITE,
+                motor_radius=0.05, motor_height=0.05, prop_radius=0.2,
+                rotor_stack=((0.05, 0.075), (-0.05, -0.075)),
+                leg_height=0.3, skid_length=0.5, skid_offset_y=0.2, gear_z=-0.1):
+    """Radial-arm multicopter. rotor_stack lists (motor_dz, prop_dz) per rotor on each arm (two = coaxial)."""
+    parts = [box(body_color, body_extents)]
+    for i in range(arms):
+        rad = math.radians(angle_offset + i * 360.0 / arms)
+        c, s = math.cos(rad), math.sin(rad)
+        parts.append(box(arm_color, [arm_length, arm_thickness, arm_thickness],
+                         [c * (arm_length / 2 + hub_offset), s * (arm_length / 2 + hub_offset), arm_z],
+                         _rot(rad, [0, 0, 1])))
+        end_x, end_y = c * (arm_length + hub_offset), s * (arm_length + hub_offset)
+        for motor_dz, prop_dz in rotor_stack:
+            parts.append(cylinder(BLACK, motor_radius, motor_height, [end_x, end_y, arm_z + motor_dz]))
+            parts.append(cylinder(LIGHT_GREY, prop_radius, 0.01, [end_x, end_y, arm_z + prop_dz]))
+    parts += _landing_skids(leg_height, skid_length, skid_offset_y, gear_z)
+    return parts
+
+
+def fixed_wing_vtol(wing_span=2.0, wing_chord=0.3, wing_thickness=0.05, boom_length=1.2, boom_radius=0.03,
+                    boom_offset=0.5, prop_radius=0.25, tail_span=1.2, vtol=True, skids=True):
+    """Twin-boom lift+cruise VTOL (CW-15 / CarryAll style). vtol=False gives a plain fixed wing."""
+    parts = [
+        box(WHITE, [0.5, 0.25, 0.2]),
+        box(WHITE, [wing_chord, wing_span, wing_thickness], [0, 0, 0.1]),
+        box(WHITE, [0.2, tail_span, 0.02], [-boom_length / 2, 0, 0.1])
+    ]
+    if vtol:
+        horizontal = _rot(math.pi / 2, [0, 1, 0])
+        for side in [-1, 1]:
+            parts.append(cylinder(DARK_GREY, boom_radius, boom_length, [0, side * boom_offset, 0], horizontal))
+            for end in [-1, 1]:
+                motor_x = end * (boom_length / 2 - 0.1)
+                parts.append(cylinder(BLACK, 0.04, 0.1, [motor_x, side * boom_offset, 0.05]))
+                parts.append(cylinder(LIGHT_GREY, prop_radius, 0.01, [motor_x, side * boom_offset, 0.1]))
+    if skids:
+        parts += _landing_skids()
+    return parts
+
+
+def vehicle(length=4.0, width=2.0, height=1.0, wheel_radius=0.45, wheel_width=0.3, axles=2, color=OLIVE):
+    """Wheeled ground vehicle: hull, cab and axles x 2 wheels."""
+    parts = [
+        box(color, [length, width, height], [0, 0, wheel_radius + height / 2]),
+        box(color, [length * 0.3, width * 0.95, height * 0.8], [length * 0.35, 0, wheel_radius + height * 1.4])
+    ]
+    lateral = _rot(math.pi / 2, [1, 0, 0])
+    xs = np.linspace(length * 0.35, -length * 0.35, axles)
+    for x in xs:
+        for side in [-1, 1]:
+            parts.append(cylinder(BLACK, wheel_radius, wheel_width, [x, side * width / 2, wheel_radius], lateral))
+    return parts
+
+
+def ship(length=12.0, beam=2.0, draft=1.0, color=NAVY_GREY):
+    """Surface ship: hull with pointed bow, superstructure and mast."""
+    bow = _rot(math.pi / 2, [0, 1, 0])
+    return [
+        box(color, [length * 0.8, beam, draft], [-length * 0.1, 0, draft / 2]),
+        cone(color, beam / 2, length * 0.2, [length * 0.3, 0, draft / 2], bow),
+        box(color, [length * 0.25, beam * 0.7, draft * 1.2], [-length * 0.05, 0, draft * 1.6]),
+        cylinder(DARK_GREY, 0.06, draft * 2.5, [-length * 0.05, 0, draft * 2.2 + draft * 1.25])
+    ]
+
+
+def missile(length=2.0, radius=0.1, nose_length=0.35, fin_span=0.18, fins=4, color=WHITE):
+    """Cylindrical missile along +X with ogive-ish nose cone and cruciform tail fins."""
+    along_x = _rot(math.pi / 2, [0, 1, 0])
+    body_length = length - nose_length
+    parts = [
+        cylinder(color, radius, body_length, [-nose_length / 2, 0, 0], along_x),
+        cone(color, radius, nose_length, [body_length / 2 - nose_length / 2, 0, 0], along_x)
+    ]
+    tail_x = -length / 2 + 0.1
+    for i in range(fins):
+        # Fin is placed above the body, then rolled about the missile axis
+        roll = _rot(i * 2 * math.pi / fins, [1, 0, 0])
+        parts.append(("box", DARK_GREY, roll @ _matrix([tail_x, 0, radius + fin_span / 2], [0.2, 0.01, fin_span])))
+    return parts
+
+
+TEMPLATES = {
+    "multicopter": multicopter,
+    "fixed_wing_vtol": fixed_wing_vtol,
+    "vehicle": vehicle,
+    "ship": ship,
+    "missile": missile
+}
+
+
+# ---------------------------------------------------------------------------
+# Scene assembly / export
+# ---------------------------------------------------------------------------
+
+def build_scene(parts):
+    """Assemble parts into a Scene where every (kind, color) geometry is added once and instanced."""
+    scene = trimesh.Scene()
+    for idx, (kind, color, matrix) in enumerate(parts):
+        geom_name = f"{kind}_{'%02x%02x%02x%02x' % tuple(color)}"
+        node_name = f"{kind}_{idx}"
+        if geom_name not in scene.geometry:
+            scene.add_geometry(unit_primitive(kind, tuple(color)), geom_name=geom_name, node_name=node_name,
+                               transform=matrix)
+        else:
+            scene.graph.update(frame_from=scene.graph.base_frame, frame_to=node_name, matrix=matrix,
+                               geometry=geom_name)
+    return scene
+
+
+@lru_cache(maxsize=64)
+def _placeholder_bytes(template, params):
+    return build_scene(TEMPLATES[template](**dict(params))).export(file_type="glb")
+
+
+def placeholder_glb_bytes(template="multicopter", **params):
+    """GLB bytes for a template; identical (template, params) requests are served from memory."""
+    if template not in TEMPLATES:
+        raise ValueError(f"Unknown template '{template}'. Available: {', '.join(TEMPLATES)}")
+    key = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in params.items()))
+    return _placeholder_bytes(template, key)
+
+
+def write_placeholder_glb(path, template="multicopter", **params):
+    """Write a placeholder GLB to path and return the path."""
+    data = placeholder_glb_bytes(template, **params)
+    dir_name = os.path.dirname(path)
+    if dir_name and not os.path.exists(dir_name):
+        os.makedirs(dir_name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a placeholder GLB from a parametric template.")
+    parser.add_argument("template", choices=sorted(TEMPLATES), help="Template name")
+    parser.add_argument("output", help="Output .glb path")
+    args = parser.parse_args()
+
+    write_placeholder_glb(args.output, args.template)
+    print(f"Saved {args.template} placeholder to {args.output} ({os.path.getsize(args.output)} bytes)")
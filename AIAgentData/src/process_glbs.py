@@ -1,10 +1,15 @@
-import bpy
 import os
-import math
+import sys
+import argparse
+
+from blender_glb_worker import run_manifest
+
+# Rotate the drone GLBs from lying down (Z-up) to Y-up and bake the rotation.
+# Runs with plain Python; the work is done by background Blender processes
+# (see blender_glb_worker.py), e.g.
+#   python process_glbs.py --blender "C:/Program Files/Blender Foundation/Blender 4.2/blender.exe"
 
 # Define the models to process
-# Using absolute paths to be safe
-base_dir = r"d:\AIProduct\GaeainCloud\LaViCDocs\AIAgentData\models"
 models = [
     "大疆Matrice 300RTK无人机",
     "纵横CW-15无人机",
@@ -13,71 +18,30 @@ models = [
     "峰飞CarrayAll无人机"
 ]
 
-def process_model(drone_name):
-    # Construct path: models/{name}/{name}/{name}_AI_Rodin.glb
-    glb_path = os.path.join(base_dir, drone_name, drone_name, f"{drone_name}_AI_Rodin.glb")
-    
-    if not os.path.exists(glb_path):
-        print(f"File not found: {glb_path}")
-        return
-
-    print(f"Processing {glb_path}...")
-    
-    # 1. Clear Scene
-    # Ensure in Object Mode
-    if bpy.ops.object.mode_set.poll():
-        bpy.ops.object.mode_set(mode='OBJECT')
-        
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete()
-    
-    # Purge orphan data to ensure clean slate
-    for block in bpy.data.meshes:
-        if block.users == 0: bpy.data.meshes.remove(block)
-    for block in bpy.data.materials:
-        if block.users == 0: bpy.data.materials.remove(block)
-    for block in bpy.data.textures:
-        if block.users == 0: bpy.data.textures.remove(block)
-    for block in bpy.data.images:
-        if block.users == 0: bpy.data.images.remove(block)
+# Rotate -90 degrees around X axis (Global), apply rotation only, re-export in place
+operations = [
+    {"op": "rotate", "axis": "X", "degrees": -90},
+    {"op": "apply_transforms", "location": False, "rotation": True, "scale": False},
+    {"op": "export"}
+]
 
-    # 2. Import GLB
-    try:
-        bpy.ops.import_scene.gltf(filepath=glb_path)
-    except Exception as e:
-        print(f"Error importing {glb_path}: {e}")
-        return
+if __name__ == "__main__":
+    default_models = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
 
-    # 3. Rotate
-    # Select all objects
-    bpy.ops.object.select_all(action='SELECT')
-    
-    # Check if we have objects
-    selected = bpy.context.selected_objects
-    if not selected:
-        # Fallback if context is weird
-        selected = [o for o in bpy.data.objects if o.users > 0]
-        for o in selected:
-            o.select_set(True)
-    
-    if not selected:
-        print(f"No objects found in {glb_path}")
-        return
+    parser = argparse.ArgumentParser(description="Rotate drone GLBs to Y-up with background Blender workers.")
+    parser.add_argument("--models-dir", default=default_models, help="Directory containing the model package folders")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    parser.add_argument("--workers", type=int, default=None, help="Number of Blender processes")
+    args = parser.parse_args()
 
-    # Rotate -90 degrees around X axis (Global)
-    # This transforms Z-up (Blender) to Y-up (Target) manually if needed, 
-    # OR corrects an orientation that is "lying down".
-    # User asked for "Y-axis up".
-    bpy.ops.transform.rotate(value=math.radians(-90), orient_axis='X', orient_type='GLOBAL')
-    
-    # 4. Apply Rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
-    
-    # 5. Export
-    # Export with Y-up (default)
-    bpy.ops.export_scene.gltf(filepath=glb_path, export_format='GLB', use_selection=True)
-    print(f"Successfully modified and exported {glb_path}")
+    manifest = {"models_dir": args.models_dir, "operations": operations, "models": models}
+    reports = run_manifest(manifest, os.getcwd(), args.blender, args.workers)
 
-# Run for all models
-for model in models:
-    process_model(model)
+    failed = 0
+    for r in reports:
+        if r["ok"]:
+            print(f"Successfully modified and exported {r['output']}")
+        else:
+            failed += 1
+            print(f"Error processing {r['input']}: {r['error']}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,68 @@
+import os
+import sys
+import argparse
+
+from blender_glb_worker import VIEWS, default_models_dir, run_manifest
+
+# Render consistent studio thumbnails for model packages from their
+# {name}_AI_Rodin.glb instead of relying on scraped images. Each model is
+# auto-framed from its bounds and rendered on a studio-grey background by
+# background Blender workers (see blender_glb_worker.py):
+#   {name}/{name}/{name}.png         3/4 view (the package thumbnail)
+#   {name}/{name}/{name}_side.png    optional extra views (_front, _side, _top)
+#
+#   python render_thumbnails.py --views iso side --blender "C:/Program Files/Blender Foundation/Blender 4.2/blender.exe"
+
+
+def find_packages(models_dir):
+    """Package folder names that have an _AI_Rodin.glb"""
+    return [
+        d for d in sorted(os.listdir(models_dir))
+        if d != "assets" and os.path.isfile(os.path.join(models_dir, d, d, f"{d}_AI_Rodin.glb"))
+    ]
+
+
+def build_manifest(models_dir, packages, views=("iso",), resolution=1024, engine="workbench", transparent=False,
+                   skip_existing=False):
+    """Manifest with one read-only thumbnail operation per package"""
+    if skip_existing:
+        packages = [p for p in packages if not all(
+            os.path.exists(os.path.join(models_dir, p, p, f"{p}{VIEWS[v][2]}.png")) for v in views)]
+    operation = {"op": "thumbnail", "views": list(views), "resolution": resolution, "engine": engine,
+                 "transparent": transparent}
+    return {"models_dir": models_dir, "operations": [operation], "models": packages}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render auto-framed studio thumbnails for model packages with background Blender.")
+    parser.add_argument("--models-dir", default=default_models_dir(), help="Directory containing the model package folders")
+    parser.add_argument("--packages", nargs="*", default=None, help="Package folder names (default: all with a GLB)")
+    parser.add_argument("--views", nargs="+", default=["iso"], choices=sorted(VIEWS), help="Views to render (iso is {name}.png)")
+    parser.add_argument("--resolution", type=int, default=1024, help="Square image size in pixels")
+    parser.add_argument("--engine", default="workbench", choices=["workbench", "eevee"], help="Render engine")
+    parser.add_argument("--transparent", action="store_true", help="Transparent background instead of studio grey")
+    parser.add_argument("--skip-existing", action="store_true", help="Skip packages that already have every requested image")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    parser.add_argument("--workers", type=int, default=None, help="Number of Blender processes")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds before a worker is killed")
+    args = parser.parse_args()
+
+    packages = args.packages or find_packages(args.models_dir)
+    manifest = build_manifest(args.models_dir, packages, args.views, args.resolution, args.engine,
+                              args.transparent, args.skip_existing)
+    if not manifest["models"]:
+        print("Nothing to render")
+        sys.exit(0)
+
+    reports = run_manifest(manifest, os.getcwd(), args.blender, args.workers, args.timeout)
+
+    failed = 0
+    for r in reports:
+        if r["ok"]:
+            print(f"[OK] {', '.join(r['thumbnails'])} ({r['seconds']}s)")
+        else:
+            failed += 1
+            print(f"[ERROR] {r['input']}: {r['error']}")
+
+    print(f"{len(reports) - failed}/{len(reports)} packages rendered")
+    sys.exit(1 if failed else 0)
@@ -41,8 +41,54 @@ def test_connection():
         print(f"❌ Connection failed: {e}")
         return False
 
+def send_framed(sock, command):
+    payload = json.dumps(command).encode('utf-8')
+    sock.sendall(len(payload).to_bytes(4, "big") + payload)
+
+def recv_framed(sock):
+    def recv_exact(n):
+        data = b''
+        while len(data) < n:
+            chunk = sock.recv(n - len(data))
+            if not chunk:
+                raise ConnectionError("Connection closed")
+            data += chunk
+        return data
+    length = int.from_bytes(recv_exact(4), "big")
+    return json.loads(recv_exact(length).decode('utf-8'))
+
+def test_framed_pipeline():
+    HOST = '127.0.0.1'
+    PORT = 9876
+
+    print(f"Testing framed protocol pipelining at {HOST}:{PORT}...")
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(10)
+            s.connect((HOST, PORT))
+
+            # Send several commands back-to-back before reading anything
+            commands = [
+                {"id": 1, "type": "get_scene_info", "params": {}},
+                {"id": 2, "type": "execute_code", "params": {"code": "print(len(bpy.data.objects))"}},
+                {"id": 3, "type": "get_polyhaven_status", "params": {}}
+            ]
+            for cmd in commands:
+                send_framed(s, cmd)
+
+            pending = {cmd["id"] for cmd in commands}
+            while pending:
+                response = recv_framed(s)
+                print(f"✅ Response id={response.get('id')} status={response.get('status')}")
+                pending.discard(response.get("id"))
+            return True
+    except Exception as e:
+        print(f"❌ Framed test failed: {e}")
+        return False
+
 if __name__ == "__main__":
-    test_connection()
+    if test_connection():
+        test_framed_pipeline()
 import socket
 
 def check_port(port):
@@ -0,0 +1,294 @@
+import os
+import sys
+import json
+import time
+import glob
+import zipfile
+import argparse
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Any, Callable, Iterator
+from dotenv import load_dotenv
+
+# Bulk import of model packages and scenario exports into LaViC.
+#
+# Inputs are files or directories of:
+#   *.zip   model packages (agent.json + assets)  -> /inputAndCreateAgent, one upload each
+#   *.json  scenario exports [{"simulation", ...}] -> /inputSimulation, one upload each;
+#           their "models" records are sent through /saveBatchModel in batches of at
+#           most --max-batch-bytes of JSON
+# Uploads run on a thread pool. Connection errors, timeouts and HTTP 429/5xx are
+# retried with exponential backoff; any other answer is final. The create
+# endpoints are not idempotent, so they are only retried when the request
+# cannot have been processed: connection failures and HTTP 429/502/503/504
+# (a read timeout or a 500 may have created the agent or scenario). An item succeeds
+# when the response has "code": 200 (the batch model endpoint answers with a list).
+# Model packages and model batches go first, scenarios after them, since
+# scenarios reference both.
+#
+#   python bulk_import.py ../../AIAgentData/models --skip-existing
+#   python bulk_import.py ../../AIAgentData/docs/LaViC想定案例 --workers 2 --report import_report.json
+#   python bulk_import.py ../../AIAgentData/models --dry-run
+
+load_dotenv()
+
+API_BASE_URL = os.getenv("LAVIC_API_BASE_URL", "http://192.168.31.218:7980/api/v1/lavic-core")
+DEFAULT_USER_ID = os.getenv("LAVIC_USER_ID", "1")
+API_TOKEN = os.getenv("LAVIC_API_TOKEN", "")
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Endpoints that create a new agent, scenario or instance on every call
+CREATE_ENDPOINTS = {"/inputAndCreateAgent", "/inputSimulation", "/saveBatchInst"}
+CREATE_RETRY_STATUS = {429, 502, 503, 504}
+DEFAULT_MAX_BATCH_BYTES = 4 * 1024 * 1024
+
+
+class TransientError(Exception):
+    pass
+
+
+class Uploader:
+    """Posts to the LaViC core API with retries; one requests session per worker thread"""
+    def __init__(self, base_url: str = API_BASE_URL, user_id: str = DEFAULT_USER_ID, token: str = API_TOKEN,
+                 retries: int = 3, backoff: float = 2.0, timeout: float = 600):
+        self.base_url = base_url
+        self.user_id = user_id
+        self.token = token
+        self.retries = max(1, retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def post(self, endpoint: str, params: dict = None, json_data: Any = None, file_path: str = None,
+             file_field: str = "file") -> tuple:
+        """(response body or error dict, attempts used)"""
+        url = f"{self.base_url}{endpoint}"
+        headers = {"X-UserId": self.user_id, "Authorization": f"admin-Token={self.token}"}
+        create = endpoint in CREATE_ENDPOINTS
+        retry_status = CREATE_RETRY_STATUS if create else RETRY_STATUS
+        last_error = None
+        for attempt in range(1, self.retries + 1):
+            try:
+                if file_path:
+                    with open(file_path, "rb") as f:
+                        files = {file_field: (os.path.basename(file_path), f)}
+                        response = self._session().post(url, params=params, files=files, headers=headers,
+                                                        timeout=self.timeout)
+                else:
+                    response = self._session().post(url, params=params, json=json_data, headers=headers,
+                                                    timeout=self.timeout)
+                if response.status_code in retry_status:
+                    raise TransientError(f"HTTP {response.status_code}")
+                response.raise_for_status()
+                try:
+                    return response.json(), attempt
+                except ValueError:
+                    return {"message": response.text}, attempt
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, TransientError) as e:
+                # ConnectTimeout is also a ConnectionError; a read timeout is not
+                if create and not isinstance(e, (requests.exceptions.ConnectionError, TransientError)):
+                    return {"error": f"{e} (not retried, the server may still complete it)"}, attempt
+                last_error = e
+                if attempt < self.retries:
+                    time.sleep(self.backoff * 2 ** (attempt - 1))
+            except requests.exceptions.RequestException as e:
+                status_code = getattr(e.response, "status_code", None)
+                return {"error": str(e), "status_code": status_code}, attempt
+        return {"error": str(last_error)}, self.retries
+
+
+def is_success(result: Any) -> bool:
+    return isinstance(result, list) or (isinstance(result, dict) and result.get("code") == 200)
+
+
+def _message(result: Any) -> str:
+    if isinstance(result, list):
+        return f"{len(result)} saved"
+    if isinstance(result, dict):
+        return str(result.get("message") or result.get("msg") or result.get("error") or "")
+    return str(result)
+
+
+def read_package(path: str) -> Optional[dict]:
+    """agent.json of a model package, or None if the ZIP has none"""
+    try:
+        with zipfile.ZipFile(path) as z:
+            if "agent.json" not in z.namelist():
+                return None
+            agent = json.loads(z.read("agent.json").decode("utf-8-sig"))
+    except (zipfile.BadZipFile, ValueError):
+        return None
+    return agent[0] if isinstance(agent, list) and agent else agent
+
+
+def read_export(path: str) -> Optional[list]:
+    """The element list of a scenario export, or None for other JSON files"""
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if isinstance(data, dict):
+        data = [data]
+    if isinstance(data, list) and data and all(isinstance(e, dict) and "simulation" in e for e in data):
+        return data
+    return None
+
+
+def collect(paths: List[str]) -> Dict[str, list]:
+    """{"packages": [(path, agent)], "exports": [(path, elements)], "ignored": [path]}"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.zip")) + glob.glob(os.path.join(path, "*.json"))))
+        else:
+            files.append(path)
+    found = {"packages": [], "exports": [], "ignored": []}
+    for path in files:
+        if path.lower().endswith(".zip"):
+            agent = read_package(path)
+            if agent is not None:
+                found["packages"].append((path, agent))
+                continue
+        else:
+            elements = read_export(path)
+            if elements is not None:
+                found["exports"].append((path, elements))
+                continue
+        found["ignored"].append(path)
+    return found
+
+
+def batches_by_bytes(records: list, max_bytes: int) -> Iterator[list]:
+    """Consecutive records whose JSON adds up to at most max_bytes (a larger record goes alone)"""
+    batch, size = [], 0
+    for record in records:
+        n = len(json.dumps(record, ensure_ascii=False).encode("utf-8")) + 1
+        if batch and size + n > max_bytes:
+            yield batch
+            batch, size = [], 0
+        batch.append(record)
+        size += n
+    if batch:
+        yield batch
+
+
+def plan(found: Dict[str, list], max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES) -> List[List[dict]]:
+    """Upload tasks in two phases: packages and model batches, then scenarios"""
+    first, second = [], []
+    for path, agent in found["packages"]:
+        first.append({"kind": "agent", "item": path, "name": agent.get("agentName"),
+                      "endpoint": "/inputAndCreateAgent", "file": path})
+    for path, elements in found["exports"]:
+        models = [m for element in elements for m in element.get("models") or []]
+        done = 0
+        for batch in batches_by_bytes(models, max_batch_bytes):
+            first.append({"kind": "models", "item": f"{path}#models[{done}:{done + len(batch)}]",
+                          "name": f"{len(batch)} models", "endpoint": "/saveBatchModel", "records": batch})
+            done += len(batch)
+        second.append({"kind": "simulation", "item": path,
+                       "name": (elements[0].get("simulation") or {}).get("simulationName"),
+                       "endpoint": "/inputSimulation", "file": path})
+    return [first, second]
+
+
+def run_task(uploader: Uploader, task: dict, skip_existing: bool = False, instances: int = 0) -> dict:
+    """Upload one task and return its status entry"""
+    status = {"kind": task["kind"], "item": task["item"], "name": task["name"], "endpoint": task["endpoint"]}
+    if task["kind"] == "agent" and skip_existing:
+        result, _ = uploader.post("/isAgentExist", file_path=task["file"])
+        if isinstance(result, dict) and is_success(result) and result.get("data"):
+            status.update(status="skipped", attempts=0, message="agent already exists")
+            return status
+    if "file" in task:
+        result, attempts = uploader.post(task["endpoint"], file_path=task["file"])
+    else:
+        payload = {"models": task["records"], "userId": uploader.user_id}
+        result, attempts = uploader.post(task["endpoint"], json_data=payload)
+    status.update(status="ok" if is_success(result) else "failed", attempts=attempts, message=_message(result))
+    if status["status"] == "ok" and task["kind"] == "agent":
+        data = result.get("data")
+        agent_key = data.get("agentKey") if isinstance(data, dict) else data if isinstance(data, str) else None
+        status["agentKey"] = agent_key
+        if instances > 0 and agent_key:
+            inst, _ = uploader.post("/saveBatchInst", params={"agentKey": agent_key, "num": instances})
+            status["instances"] = instances if is_success(inst) else 0
+            if not is_success(inst):
+                status.update(status="failed", message=f"agent created, instances failed: {_message(inst)}")
+    return status
+
+
+def bulk_import(paths: List[str], uploader: Uploader = None, workers: int = 4,
+                max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES, skip_existing: bool = False, instances: int = 0,
+                dry_run: bool = False, on_status: Callable[[dict], None] = None) -> List[dict]:
+    """Import everything under paths; returns one status entry per uploaded item or batch"""
+    uploader = uploader or Uploader()
+    found = collect(paths)
+    statuses = [{"kind": "ignored", "item": path, "name": None, "endpoint": None, "status": "skipped",
+                 "attempts": 0, "message": "not a model package or scenario export"} for path in found["ignored"]]
+    for status in statuses:
+        if on_status:
+            on_status(status)
+    for phase in plan(found, max_batch_bytes):
+        if dry_run:
+            for task in phase:
+                status = {"kind": task["kind"], "item": task["item"], "name": task["name"],
+                          "endpoint": task["endpoint"], "status": "planned", "attempts": 0, "message": ""}
+                statuses.append(status)
+                if on_status:
+                    on_status(status)
+            continue
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [pool.submit(run_task, uploader, task, skip_existing, instances) for task in phase]
+            for future in as_completed(futures):
+                status = future.result()
+                statuses.append(status)
+                if on_status:
+                    on_status(status)
+    return statuses
+
+
+def summarize(statuses: List[dict]) -> Dict[str, int]:
+    counts = {}
+    for status in statuses:
+        counts[status["status"]] = counts.get(status["status"], 0) + 1
+    return counts
+
+
+def print_status(status: dict):
+    tag = {"ok": "[OK]", "failed": "[ERROR]", "skipped": "[SKIP]", "planned": "[PLAN]"}[status["status"]]
+    detail = f" {status['endpoint']}" if status["endpoint"] else ""
+    attempts = f" after {status['attempts']} attempts" if status["attempts"] > 1 else ""
+    message = f": {status['message']}" if status["message"] else ""
+    print(f"{tag}{detail} {status['item']} ({status['name']}){attempts}{message}", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import model packages (*.zip) and scenario exports (*.json) into LaViC.")
+    parser.add_argument("paths", nargs="+", help="Files or directories to import")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent uploads (default 4)")
+    parser.add_argument("--retries", type=int, default=3, help="Attempts per request for transient errors (default 3)")
+    parser.add_argument("--max-batch-bytes", type=int, default=DEFAULT_MAX_BATCH_BYTES, help="JSON payload limit of one /saveBatchModel request")
+    parser.add_argument("--skip-existing", action="store_true", help="Ask /isAgentExist first and skip packages already imported")
+    parser.add_argument("--instances", type=int, default=0, help="Create this many instances of each new agent (/saveBatchInst)")
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would be uploaded")
+    parser.add_argument("--report", default=None, help="Write the per-item statuses to this JSON file")
+    parser.add_argument("--user-id", default=DEFAULT_USER_ID, help="X-UserId (default: LAVIC_USER_ID)")
+    args = parser.parse_args()
+
+    uploader = Uploader(user_id=args.user_id, retries=args.retries)
+    statuses = bulk_import(args.paths, uploader, args.workers, args.max_batch_bytes, args.skip_existing,
+                           args.instances, args.dry_run, on_status=print_status)
+    counts = summarize(statuses)
+    print(", ".join(f"{n} {state}" for state, n in sorted(counts.items())) or "Nothing to import")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(statuses, f, ensure_ascii=False, indent=2)
+        print(f"Report written to {args.report}")
+    sys.exit(1 if counts.get("failed") else 0)
@@ -7,6 +7,8 @@ import requests
 from typing import Optional, List, Dict, Any
 from dotenv import load_dotenv
 
+from bulk_import import Uploader, bulk_import, summarize, DEFAULT_MAX_BATCH_BYTES
+
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
@@ -173,6 +175,23 @@ async def list_tools() -> List[Tool]:
                 "required": ["record_id"]
             },
         ),
+        Tool(
+            name="bulk_import",
+            description="Import a directory (or files) of model packages (*.zip) and scenario exports (*.json) in one go. Uploads run concurrently with retries; returns a status per item. Use dry_run=True to see what would be uploaded.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "paths": {"type": "array", "items": {"type": "string"}, "description": "Files or directories to import"},
+                    "workers": {"type": "integer", "default": 4, "description": "Concurrent uploads (default 4)"},
+                    "skip_existing": {"type": "boolean", "default": False, "description": "Skip model packages whose agent already exists"},
+                    "instances": {"type": "integer", "default": 0, "description": "Create this many instances of each new agent"},
+                    "max_batch_bytes": {"type": "integer", "default": DEFAULT_MAX_BATCH_BYTES, "description": "JSON payload limit of one batch model request"},
+                    "dry_run": {"type": "boolean", "default": False, "description": "Only list what would be uploaded"},
+                    "user_id": {"type": "string", "description": "Optional User ID override"}
+                },
+                "required": ["paths"]
+            },
+        ),
     ]
 
 @app.call_tool()
@@ -363,6 +382,26 @@ async def call_tool(name: str, arguments: Any) -> List[TextContent]:
                 "error": str(e)
             }, ensure_ascii=False, indent=2))]
 
+    elif name == "bulk_import":
+        uploader = Uploader(API_BASE_URL, arguments.get("user_id") or DEFAULT_USER_ID, API_TOKEN)
+        # Uploads can take minutes; keep the event loop free while they run
+        statuses = await asyncio.to_thread(
+            bulk_import,
+            arguments.get("paths") or [],
+            uploader,
+            arguments.get("workers", 4),
+            arguments.get("max_batch_bytes", DEFAULT_MAX_BATCH_BYTES),
+            arguments.get("skip_existing", False),
+            arguments.get("instances", 0),
+            arguments.get("dry_run", False),
+        )
+        counts = summarize(statuses)
+        return [TextContent(type="text", text=json.dumps({
+            "success": not counts.get("failed"),
+            "counts": counts,
+            "items": statuses
+        }, ensure_ascii=False, indent=2))]
+
     else:
         raise ValueError(f"Unknown tool: {name}")
 